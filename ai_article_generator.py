@@ -11,14 +11,17 @@ import random
 import datetime
 import time
 import logging
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Iterator
 
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
-    import torch
-except ImportError:
-    print("ERRORE: Installa le dipendenze con: pip install -r requirements.txt")
-    exit(1)
+from article_ids import new_article_id
+from etf_taxonomy import get_taxonomy
+from content_analysis import analyze_content
+from blog_stats import BlogStats, count_generated, stats_path_for
+from blog_store import read_articles
+from generation_metrics import get_metrics, timed
+
+# transformers e torch vengono importati solo in load_model: l'import del modulo resta veloce
 
 # Configurazione logging
 logging.basicConfig(
@@ -31,11 +34,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Motori di generazione disponibili ("template" non usa modelli né torch)
+ENGINES = ("pipeline", "int8", "onnx", "template")
+
+# Seed delle generazioni di test: le esecuzioni ripetute riusano i testi della cache
+TEST_SEED = 42
+
 class ETFArticleGenerator:
-    def __init__(self):
+    def __init__(self, batch_size: int = 1, engine: str = None, workers: int = 1, threads_per_worker: int = None,
+                 cache_dir: str = "generation_cache", check_duplicates: bool = False):
         """Inizializza il generatore di articoli ETF"""
         self.model_name = "microsoft/DialoGPT-medium"  # Modello gratuito e leggero
         self.generator = None
+        # Motore scelto dal parametro o dalla variabile d'ambiente ETF_GENERATOR_ENGINE
+        self.engine = engine or os.environ.get("ETF_GENERATOR_ENGINE", "pipeline")
+        if self.engine not in ENGINES:
+            raise ValueError(f"Motore non supportato: {self.engine} (disponibili: {', '.join(ENGINES)})")
+        # Numero di articoli generati con una singola chiamata al modello
+        self.batch_size = max(1, batch_size)
+        # Processi del pool di generazione e thread torch assegnati a ciascuno
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker
+        self.pool = None
+        self.pool_workers = 0
+        # Modello esportato in ONNX (creato al primo avvio del motore "onnx")
+        self.onnx_dir = os.path.join("onnx_models", "gpt2")
+        # Snapshot safetensors mappato in memoria: caricamento rapido e pesi condivisi tra processi
+        self.snapshot_dir = os.path.join("model_snapshots", "gpt2")
         self.topics = [
             "ETF azionari europei",
             "ETF obbligazionari", 
@@ -57,16 +82,72 @@ class ETFArticleGenerator:
             "strategia": "Strategie di Investimento con {topic} nel {year}"
         }
         
+        self.prompt_templates = [
+            "Scrivi un articolo professionale su: {title}. L'articolo deve essere informativo e utile per investitori italiani interessati agli ETF.",
+            "Articolo finanziario: {title}. Includi analisi di mercato, vantaggi, rischi e consigli pratici per investitori.",
+            "Guida agli investimenti: {title}. Spiega in modo chiaro e professionale le opportunità di investimento."
+        ]
+        
+        # KV-cache dei prefissi fissi dei prompt, valida solo per prefix_cache_model
+        self.prefix_cache = {}
+        self.prefix_cache_model = None
+        
+        # Parametri di campionamento (fanno parte della chiave della cache dei testi)
+        self.generation_params = {"max_length": 400, "temperature": 0.7, "do_sample": True}
+        
+        # Tempo massimo di decodifica per articolo (secondi); la degenerazione ferma prima la generazione
+        self.max_generation_seconds = 60
+        # Soglie di DegenerationStoppingCriteria (cambiano dove si ferma il testo: fanno parte della chiave della cache)
+        self.stopping_settings = {"ngram_size": 4, "max_repeats": 3, "window": 64, "min_unique_ratio": 0.3}
+        # (token del prompt, token generati, secondi) per riga dell'ultima chiamata a generate
+        self.generation_stats = []
+        
+        # Cache su disco dei testi generati con seed (None per disattivarla)
+        self.cache_dir = cache_dir
+        self.cache = None
+        
+        # Scarta prima del salvataggio gli articoli quasi identici a quelli già indicizzati
+        self.check_duplicates = check_duplicates
+        self.dedup_index = None
+        
     def load_model(self):
+        """Carica il modello registrando il tempo di caricamento nelle metriche"""
+        event = {"type": "load", "engine": self.engine}
+        with timed(event, "load_model"):
+            event["loaded"] = self.load_engine()
+        get_metrics().record(event)
+        return event["loaded"]
+    
+    def load_engine(self):
         """Carica il modello di generazione testo"""
+        # La KV-cache dei prefissi appartiene al modello precedente
+        self.prefix_cache = {}
+        self.prefix_cache_model = None
+        
+        if self.engine == "template":
+            # Modalità solo template: nessun modello da caricare
+            self.generator = "template"
+            logger.info("Modalità template attiva: nessun modello caricato")
+            return True
+        
+        if self.engine == "int8":
+            return self.load_quantized_model()
+        
+        if self.engine == "onnx":
+            return self.load_onnx_model()
+        
         try:
             logger.info(f"Caricamento modello: {self.model_name}")
             
+            from transformers import pipeline
+            
+            model, tokenizer = self.load_snapshot_model()
+            
             # Usa un modello più semplice e gratuito per iniziare
             self.generator = pipeline(
                 "text-generation",
-                model="gpt2",  # Modello completamente gratuito
-                tokenizer="gpt2",
+                model=model if model is not None else "gpt2",  # Modello completamente gratuito
+                tokenizer=tokenizer if tokenizer is not None else "gpt2",
                 device=-1,  # CPU (cambia a 0 per GPU)
                 max_length=512,
                 framework="pt",  # Specifica PyTorch
@@ -93,10 +174,92 @@ class ETFArticleGenerator:
                 logger.error(f"Errore anche con configurazione semplificata: {e2}")
                 return False
     
-    def generate_article_title(self) -> str:
+    def load_snapshot_model(self):
+        """Modello e tokenizer dallo snapshot locale (creato al primo caricamento); (None, None) se non disponibile"""
+        try:
+            from model_snapshot import snapshot_exists, build_snapshot, load_snapshot
+            
+            if not snapshot_exists(self.snapshot_dir):
+                logger.info(f"Creazione dello snapshot del modello in {self.snapshot_dir}")
+                build_snapshot(self.snapshot_dir)
+            
+            return load_snapshot(self.snapshot_dir)
+            
+        except Exception as e:
+            logger.warning(f"Snapshot del modello non disponibile, uso from_pretrained: {e}")
+            return None, None
+    
+    def load_quantized_model(self):
+        """Carica GPT-2 con quantizzazione dinamica int8 dei layer lineari (solo CPU)"""
+        try:
+            logger.info("Caricamento modello quantizzato int8: gpt2")
+            
+            import torch
+            from transformers import pipeline, GPT2LMHeadModel, GPT2Tokenizer
+            
+            model = GPT2LMHeadModel.from_pretrained('gpt2')
+            model.eval()
+            
+            # GPT-2 usa Conv1D al posto di nn.Linear: senza conversione verrebbe quantizzata solo la testa
+            self.convert_conv1d_to_linear(model)
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            
+            self.generator = pipeline(
+                "text-generation",
+                model=model,
+                tokenizer=GPT2Tokenizer.from_pretrained('gpt2'),
+                device=-1,
+                framework="pt"
+            )
+            
+            logger.info("Modello quantizzato caricato con successo")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Errore nel caricamento del modello quantizzato: {e}")
+            return False
+    
+    def load_onnx_model(self):
+        """Carica GPT-2 esportato in ONNX ed eseguito con ONNX Runtime (solo CPU)"""
+        try:
+            logger.info("Caricamento modello ONNX: gpt2")
+            
+            import torch
+            from onnx_engine import load_onnx_generator
+            
+            # ONNX Runtime usa gli stessi thread assegnati a torch (anche nei worker del pool)
+            self.generator = load_onnx_generator(self.onnx_dir, torch.get_num_threads())
+            
+            logger.info("Modello ONNX caricato con successo")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Errore nel caricamento del modello ONNX: {e}")
+            return False
+    
+    def convert_conv1d_to_linear(self, model):
+        """Sostituisce i layer Conv1D di GPT-2 con nn.Linear equivalenti"""
+        import torch
+        from transformers.pytorch_utils import Conv1D
+        
+        for parent in list(model.modules()):
+            for name, child in list(parent.named_children()):
+                if not isinstance(child, Conv1D):
+                    continue
+                
+                # Conv1D salva i pesi come (in, out), nn.Linear come (out, in)
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features)
+                linear.weight.data = child.weight.data.t().contiguous()
+                linear.bias.data = child.bias.data
+                setattr(parent, name, linear)
+    
+    def generate_article_title(self, seed: int = None) -> str:
         """Genera un titolo per l'articolo"""
-        topic = random.choice(self.topics)
-        template_type = random.choice(list(self.article_templates.keys()))
+        # Con un seed il titolo (e quindi il prompt) si ripete: il testo può arrivare dalla cache
+        rng = random.Random(seed) if seed is not None else random
+        topic = rng.choice(self.topics)
+        template_type = rng.choice(list(self.article_templates.keys()))
         template = self.article_templates[template_type]
         
         current_year = datetime.datetime.now().year
@@ -104,60 +267,108 @@ class ETFArticleGenerator:
         
         return title
     
-    def create_article_prompt(self, title: str) -> str:
+    def create_article_prompt(self, title: str, seed: int = None) -> str:
         """Crea il prompt per la generazione dell'articolo"""
-        prompts = [
-            f"Scrivi un articolo professionale su: {title}. L'articolo deve essere informativo e utile per investitori italiani interessati agli ETF.",
-            f"Articolo finanziario: {title}. Includi analisi di mercato, vantaggi, rischi e consigli pratici per investitori.",
-            f"Guida agli investimenti: {title}. Spiega in modo chiaro e professionale le opportunità di investimento."
-        ]
+        # Con un seed anche la scelta del template è riproducibile
+        rng = random.Random(seed) if seed is not None else random
+        return rng.choice(self.prompt_templates).format(title=title)
+    
+    def get_cache(self):
+        """Restituisce la cache dei testi generati (creata al primo uso)"""
+        if self.cache is None and self.cache_dir:
+            from generation_cache import GenerationCache
+            self.cache = GenerationCache(self.cache_dir)
+        return self.cache
+    
+    def get_cache_key(self, prompt: str, seed: int) -> str:
+        """Chiave della cache: solo le generazioni con seed sono riproducibili"""
+        if seed is None or not self.get_cache():
+            return None
+        from generation_cache import GenerationCache
+        # Anche scadenza e criteri di arresto decidono dove finisce il testo
+        params = {**self.generation_params, "max_time": self.max_generation_seconds, "stopping": self.stopping_settings}
+        return GenerationCache.make_key(f"{self.engine}/gpt2", prompt, params, seed)
+    
+    def get_prompt_prefix(self, prompt: str) -> str:
+        """Restituisce il prefisso fisso (precedente al titolo) del template usato dal prompt"""
+        for template in self.prompt_templates:
+            # Lo spazio prima del titolo resta al titolo: GPT-2 lo codifica nel token successivo
+            prefix = template.split("{title}")[0].rstrip()
+            if prompt.startswith(prefix):
+                return prefix
+        return None
+    
+    def encode_with_prefix_cache(self, model, tokenizer, prompt: str):
+        """Tokenizza il prompt e restituisce la KV-cache del suo prefisso fisso (se esiste)"""
+        import copy
+        import torch
+        
+        if self.prefix_cache_model is not model:
+            self.prefix_cache = {}
+            self.prefix_cache_model = model
+        
+        prefix = self.get_prompt_prefix(prompt)
+        if prefix is None:
+            return tokenizer.encode(prompt, return_tensors='pt'), None
+        
+        if prefix not in self.prefix_cache:
+            prefix_ids = tokenizer.encode(prefix, return_tensors='pt')
+            with torch.no_grad():
+                past_key_values = model(prefix_ids, use_cache=True).past_key_values
+            self.prefix_cache[prefix] = (prefix_ids, past_key_values)
+            logger.info(f"KV-cache calcolata per il prefisso: {prefix}")
         
-        return random.choice(prompts)
+        prefix_ids, past_key_values = self.prefix_cache[prefix]
+        title_ids = tokenizer.encode(prompt[len(prefix):], return_tensors='pt')
+        
+        # generate estende la cache in place: ogni articolo parte da una copia
+        return torch.cat([prefix_ids, title_ids], dim=1), copy.deepcopy(past_key_values)
     
-    def generate_article_content(self, title: str) -> Dict[str, Any]:
+    def generate_article_content(self, title: str, seed: int = None) -> Dict[str, Any]:
         """Genera il contenuto completo dell'articolo"""
-        if not self.generator:
+        if self.engine == "template":
+            if not self.generator:
+                self.load_model()
+            return self.create_fallback_article(title)
+        
+        event = {"type": "article", "engine": self.engine}
+        
+        # Crea il prompt
+        with timed(event, "prompt"):
+            prompt = self.create_article_prompt(title, seed)
+        
+        # Con un seed il testo può essere già in cache: il modello non serve
+        cache_key = self.get_cache_key(prompt, seed)
+        content = self.cache.get(cache_key) if cache_key else None
+        
+        if content is None and not self.generator:
             if not self.load_model():
                 return None
         
         try:
-            # Crea il prompt
-            prompt = self.create_article_prompt(title)
-            
-            # Genera il contenuto
-            logger.info(f"Generazione articolo: {title}")
-            
-            if self.generator == "manual":
-                # Generazione manuale con modello semplificato
-                content = self.generate_with_manual_model(prompt)
+            if content is None:
+                # Genera il contenuto
+                logger.info(f"Generazione articolo: {title}")
+                self.generation_stats = []
+                
+                with timed(event, "generate"):
+                    if self.generator == "manual":
+                        # Generazione manuale con modello semplificato
+                        content = self.generate_with_manual_model(prompt, seed)
+                    else:
+                        # Generazione con il modello della pipeline, riusando la KV-cache del prefisso
+                        content = self.generate_with_model(self.generator.model, self.generator.tokenizer, prompt, seed)
+                self.add_token_metrics(event)
             else:
-                # Generazione con pipeline
-                result = self.generator(
-                    prompt,
-                    max_length=400,
-                    num_return_sequences=1,
-                    temperature=0.7,
-                    do_sample=True,
-                    pad_token_id=self.generator.tokenizer.eos_token_id
-                )
-                content = result[0]['generated_text']
+                event["cached"] = True
             
             # Pulisci e formatta il contenuto
-            content = self.clean_content(content, prompt)
+            with timed(event, "clean_content"):
+                content = self.clean_content(content, prompt)
             
             # Crea l'articolo strutturato
-            article = {
-                "id": self.generate_article_id(title),
-                "title": title,
-                "content": content,
-                "excerpt": content[:200] + "...",
-                "author": "ETF Italia AI",
-                "date": datetime.datetime.now().isoformat(),
-                "category": self.get_category_from_title(title),
-                "tags": self.generate_tags(title),
-                "featured": False,
-                "published": True
-            }
+            article = self.build_article(title, content)
+            get_metrics().record(event)
             
             logger.info(f"Articolo generato con successo: {title}")
             return article
@@ -167,33 +378,363 @@ class ETFArticleGenerator:
             # Fallback: crea articolo con contenuto predefinito
             return self.create_fallback_article(title)
     
-    def generate_with_manual_model(self, prompt: str) -> str:
+    def add_token_metrics(self, event: Dict[str, Any], row: int = 0):
+        """Aggiunge all'evento conteggi di token e throughput della riga generata"""
+        if row >= len(self.generation_stats):
+            return
+        prompt_tokens, output_tokens, elapsed = self.generation_stats[row]
+        event["prompt_tokens"] = prompt_tokens
+        event["output_tokens"] = output_tokens
+        if elapsed > 0:
+            event["tokens_per_sec"] = round(output_tokens / elapsed, 2)
+    
+    def build_article(self, title: str, content: str) -> Dict[str, Any]:
+        """Crea il dizionario strutturato dell'articolo"""
+        return {
+            "id": self.generate_article_id(title),
+            "title": title,
+            "content": content,
+            "excerpt": analyze_content(content)["excerpt"],
+            "author": "ETF Italia AI",
+            "date": datetime.datetime.now().isoformat(),
+            "category": self.get_category_from_title(title, content),
+            "tags": self.generate_tags(title, content),
+            "featured": False,
+            "published": True
+        }
+    
+    def generate_articles_batch(self, titles: List[str]) -> List[Dict[str, Any]]:
+        """Genera più articoli con una singola chiamata al modello"""
+        if not self.generator:
+            if not self.load_model():
+                return []
+        
+        if self.generator == "template":
+            articles = [self.create_fallback_article(title) for title in titles]
+            return [article for article in articles if article]
+        
+        batch_event = {"type": "article", "engine": self.engine, "batch_size": len(titles)}
+        with timed(batch_event, "prompt"):
+            prompts = [self.create_article_prompt(title) for title in titles]
+        
+        try:
+            logger.info(f"Generazione batch di {len(titles)} articoli")
+            self.generation_stats = []
+            
+            with timed(batch_event, "generate"):
+                contents = self.generate_batch_contents(prompts)
+            
+            articles = []
+            for row, (title, prompt, content) in enumerate(zip(titles, prompts, contents)):
+                # Prompt e generate sono condivisi dal batch: ogni articolo ne riporta la latenza
+                event = dict(batch_event)
+                self.add_token_metrics(event, row)
+                with timed(event, "clean_content"):
+                    content = self.clean_content(content, prompt)
+                articles.append(self.build_article(title, content))
+                get_metrics().record(event)
+            
+            logger.info(f"Batch generato con successo: {len(articles)} articoli")
+            return articles
+            
+        except Exception as e:
+            logger.error(f"Errore nella generazione batch: {e}")
+            # Fallback: articoli con contenuto predefinito
+            articles = [self.create_fallback_article(title) for title in titles]
+            return [article for article in articles if article]
+    
+    def generate_batch_contents(self, prompts: List[str]) -> List[str]:
+        """Testi generati per i prompt con una singola chiamata al modello"""
+        if self.generator == "manual":
+            return self.generate_batch_with_manual_model(prompts)
+        
+        if self.engine == "onnx":
+            # Nessuna pipeline per il modello ONNX: stessa generazione batch del modello manuale
+            return self.generate_batch_with_manual_model(prompts, self.generator.model, self.generator.tokenizer)
+        
+        # Padding a sinistra: GPT-2 continua il testo dall'ultimo token
+        tokenizer = self.generator.tokenizer
+        tokenizer.pad_token = tokenizer.eos_token
+        tokenizer.padding_side = "left"
+        
+        prompt_length = tokenizer(prompts, padding=True, return_tensors='pt')['input_ids'].shape[1]
+        criteria, stopping_params = self.get_stopping_params(prompt_length, len(prompts))
+        
+        start = time.time()
+        results = self.generator(
+            prompts,
+            batch_size=len(prompts),
+            num_return_sequences=1,
+            **self.generation_params,
+            **stopping_params,
+            pad_token_id=tokenizer.eos_token_id
+        )
+        elapsed = time.time() - start
+        contents = [result[0]['generated_text'] for result in results]
+        
+        # La pipeline restituisce solo testo: la lunghezza si ricava ritokenizzando
+        for row, (prompt, content) in enumerate(zip(prompts, contents)):
+            generated = len(tokenizer(content)['input_ids']) - len(tokenizer(prompt)['input_ids'])
+            self.record_generation(criteria.reasons.get(row), prompt_length + generated, prompt_length, elapsed,
+                                   stopping_params["max_time"])
+        
+        return contents
+    
+    def get_stopping_params(self, prompt_length: int, rows: int = 1):
+        """Criterio di degenerazione e parametri di arresto per model.generate. max_time vale per l'intera
+        chiamata: in un batch di rows articoli la scadenza è max_generation_seconds per articolo"""
+        from transformers import StoppingCriteriaList
+        from stopping_criteria import DegenerationStoppingCriteria
+        
+        criteria = DegenerationStoppingCriteria(prompt_length, **self.stopping_settings)
+        params = {"stopping_criteria": StoppingCriteriaList([criteria]), "max_time": self.max_generation_seconds * rows}
+        return criteria, params
+    
+    def record_generation(self, reason: str, output_length: int, prompt_length: int, elapsed: float,
+                          max_time: float = None):
+        """Conserva i conteggi di token della riga e registra token e secondi risparmiati rispetto a max_length
+        (max_time: scadenza della chiamata che ha generato la riga)"""
+        self.generation_stats.append((prompt_length, output_length - prompt_length, elapsed))
+        
+        generated = max(output_length - prompt_length, 1)
+        saved_tokens = max(self.generation_params["max_length"] - output_length, 0)
+        if not saved_tokens:
+            return
+        
+        if not reason:
+            reason = "scadenza" if elapsed >= (max_time or self.max_generation_seconds) else "fine del testo"
+        
+        # Stima: i token non generati avrebbero avuto il costo medio di quelli prodotti
+        saved_seconds = saved_tokens * elapsed / generated
+        logger.info(f"Generazione interrotta ({reason}) dopo {generated} token: "
+                    f"risparmiati {saved_tokens} token, ~{saved_seconds:.1f}s")
+    
+    def generate_with_model(self, model, tokenizer, prompt: str, seed: int = None) -> str:
+        """Genera il testo del prompt partendo dalla KV-cache del prefisso"""
+        import torch
+        
+        input_ids, past_key_values = self.encode_with_prefix_cache(model, tokenizer, prompt)
+        
+        if seed is not None:
+            torch.manual_seed(seed)
+        
+        prompt_length = input_ids.shape[1]
+        criteria, stopping_params = self.get_stopping_params(prompt_length)
+        
+        start = time.time()
+        with torch.no_grad():
+            outputs = model.generate(
+                input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                past_key_values=past_key_values,
+                num_return_sequences=1,
+                **self.generation_params,
+                **stopping_params,
+                pad_token_id=tokenizer.eos_token_id
+            )
+        self.record_generation(criteria.reasons.get(0), outputs.shape[1], prompt_length, time.time() - start)
+        
+        # Decodifica il risultato
+        generated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
+        
+        # Solo i testi riproducibili (con seed) vanno in cache
+        cache_key = self.get_cache_key(prompt, seed)
+        if cache_key:
+            self.cache.put(cache_key, generated_text)
+        
+        return generated_text
+    
+    def generate_with_manual_model(self, prompt: str, seed: int = None) -> str:
         """Genera contenuto usando il modello manuale"""
+        try:
+            return self.generate_with_model(self.model, self.tokenizer, prompt, seed)
+            
+        except Exception as e:
+            logger.error(f"Errore nella generazione manuale: {e}")
+            # Fallback estremo: usa template predefinito
+            return self.get_template_content(prompt)
+    
+    def stream_article_content(self, title: str, seed: int = None) -> Iterator[Dict[str, Any]]:
+        """Genera l'articolo in streaming: produce i frammenti di testo e infine l'articolo completo"""
+        if not self.generator:
+            if not self.load_model():
+                return
+        
+        article_id = self.generate_article_id(title)
+        
+        if self.generator == "template":
+            article = self.create_fallback_article(title)
+            if article:
+                yield {"type": "token", "text": article["content"]}
+                # Duplicato scartato o salvataggio fallito: nessun evento "article"
+                if self.save_article(article):
+                    yield {"type": "article", "article": article}
+            return
+        
+        event = {"type": "article", "engine": self.engine, "streamed": True}
+        with timed(event, "prompt"):
+            prompt = self.create_article_prompt(title, seed)
+        draft_path = os.path.join("generated_articles", "drafts", f"draft_{article_id}.json")
+        text = ""
+        
+        # Testo già generato con lo stesso seed: arriva tutto in un frammento
+        cache_key = self.get_cache_key(prompt, seed)
+        cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            event["cached"] = True
+            text = cached.replace(prompt, "", 1)
+            yield {"type": "token", "text": text}
+            article = self.build_article(title, self.clean_content(text, prompt))
+            article["id"] = article_id
+            get_metrics().record(event)
+            if self.save_article(article):
+                yield {"type": "article", "article": article}
+            return
+        
+        try:
+            from transformers import TextIteratorStreamer
+            
+            if self.generator == "manual":
+                model, tokenizer = self.model, self.tokenizer
+            else:
+                model, tokenizer = self.generator.model, self.generator.tokenizer
+            
+            start = time.perf_counter()
+            self.generation_stats = []
+            input_ids, past_key_values = self.encode_with_prefix_cache(model, tokenizer, prompt)
+            streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=120)
+            
+            # La generazione gira in un thread, i token arrivano dallo streamer
+            thread = threading.Thread(
+                target=self.generate_into_streamer,
+                args=(model, tokenizer, input_ids, past_key_values, streamer, seed)
+            )
+            thread.daemon = True
+            thread.start()
+            
+            logger.info(f"Generazione in streaming: {title}")
+            last_draft = 0
+            for chunk in streamer:
+                if not text:
+                    event["first_token_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                text += chunk
+                yield {"type": "token", "text": chunk}
+                
+                # Bozza parziale su disco al massimo due volte al secondo
+                if time.time() - last_draft >= 0.5:
+                    self.save_draft(draft_path, article_id, title, text)
+                    last_draft = time.time()
+            
+            thread.join()
+            event["generate_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            self.add_token_metrics(event)
+            if cache_key:
+                self.cache.put(cache_key, prompt + text)
+            
+            with timed(event, "clean_content"):
+                content = self.clean_content(text, prompt)
+            article = self.build_article(title, content)
+            article["id"] = article_id
+            get_metrics().record(event)
+            
+        except Exception as e:
+            logger.error(f"Errore nella generazione in streaming: {e}")
+            article = self.create_fallback_article(title)
+        
+        if os.path.exists(draft_path):
+            os.remove(draft_path)
+        
+        if article and self.save_article(article):
+            yield {"type": "article", "article": article}
+    
+    def generate_into_streamer(self, model, tokenizer, input_ids, past_key_values, streamer, seed: int = None):
+        """Esegue model.generate inviando i token allo streamer"""
+        import torch
+        
+        try:
+            if seed is not None:
+                torch.manual_seed(seed)
+            prompt_length = input_ids.shape[1]
+            criteria, stopping_params = self.get_stopping_params(prompt_length)
+            
+            start = time.time()
+            with torch.no_grad():
+                outputs = model.generate(
+                    input_ids,
+                    attention_mask=torch.ones_like(input_ids),
+                    past_key_values=past_key_values,
+                    num_return_sequences=1,
+                    **self.generation_params,
+                    **stopping_params,
+                    pad_token_id=tokenizer.eos_token_id,
+                    streamer=streamer
+                )
+            self.record_generation(criteria.reasons.get(0), outputs.shape[1], prompt_length, time.time() - start)
+        except Exception as e:
+            logger.error(f"Errore nel thread di generazione: {e}")
+            # Sblocca il consumatore dello streamer
+            streamer.end()
+    
+    def save_draft(self, draft_path: str, article_id: str, title: str, text: str):
+        """Scrive la bozza parziale dell'articolo (sostituzione atomica del file)"""
+        os.makedirs(os.path.dirname(draft_path), exist_ok=True)
+        
+        draft = {
+            "id": article_id,
+            "title": title,
+            "content": text,
+            "complete": False,
+            "updated": datetime.datetime.now().isoformat()
+        }
+        
+        tmp_path = draft_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(draft, f, ensure_ascii=False)
+        os.replace(tmp_path, draft_path)
+    
+    def generate_batch_with_manual_model(self, prompts: List[str], model=None, tokenizer=None) -> List[str]:
+        """Genera più contenuti in un'unica chiamata usando il modello manuale (o quello indicato)"""
+        model = model or self.model
+        tokenizer = tokenizer or self.tokenizer
+        
         try:
             import torch
             
-            # Tokenizza il prompt
-            inputs = self.tokenizer.encode(prompt, return_tensors='pt')
+            # Tokenizza i prompt con padding a sinistra
+            tokenizer.pad_token = tokenizer.eos_token
+            tokenizer.padding_side = "left"
+            inputs = tokenizer(prompts, return_tensors='pt', padding=True)
+            prompt_length = inputs['input_ids'].shape[1]
+            criteria, stopping_params = self.get_stopping_params(prompt_length, len(prompts))
             
-            # Genera il testo
+            # Genera tutti i testi insieme
+            start = time.time()
             with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs,
-                    max_length=400,
+                outputs = model.generate(
+                    inputs['input_ids'],
+                    attention_mask=inputs['attention_mask'],
                     num_return_sequences=1,
-                    temperature=0.7,
-                    do_sample=True,
-                    pad_token_id=self.tokenizer.eos_token_id
+                    **self.generation_params,
+                    **stopping_params,
+                    pad_token_id=tokenizer.eos_token_id
                 )
+            elapsed = time.time() - start
             
-            # Decodifica il risultato
-            generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return generated_text
+            # Le righe terminate prima delle altre sono completate con token di padding (eos)
+            for row, output in enumerate(outputs):
+                generated = output[prompt_length:].tolist()
+                if tokenizer.eos_token_id in generated:
+                    generated = generated[:generated.index(tokenizer.eos_token_id)]
+                self.record_generation(criteria.reasons.get(row), prompt_length + len(generated), prompt_length, elapsed,
+                                       stopping_params["max_time"])
+            
+            # Decodifica i risultati
+            return [tokenizer.decode(output, skip_special_tokens=True) for output in outputs]
             
         except Exception as e:
-            logger.error(f"Errore nella generazione manuale: {e}")
-            # Fallback estremo: usa template predefinito
-            return self.get_template_content(prompt)
+            logger.error(f"Errore nella generazione manuale batch: {e}")
+            # Fallback estremo: usa template predefiniti
+            return [self.get_template_content(prompt) for prompt in prompts]
     
     def get_template_content(self, prompt: str) -> str:
         """Genera contenuto usando template predefiniti"""
@@ -225,18 +766,7 @@ class ETFArticleGenerator:
             # Espandi il contenuto
             content += "\n\nQuesto articolo fornisce informazioni generali sugli ETF e non costituisce consulenza finanziaria. È sempre consigliabile consultare un consulente finanziario qualificato prima di prendere decisioni di investimento."
             
-            article = {
-                "id": self.generate_article_id(title),
-                "title": title,
-                "content": content,
-                "excerpt": content[:200] + "...",
-                "author": "ETF Italia AI",
-                "date": datetime.datetime.now().isoformat(),
-                "category": self.get_category_from_title(title),
-                "tags": self.generate_tags(title),
-                "featured": False,
-                "published": True
-            }
+            article = self.build_article(title, content)
             
             logger.info(f"Articolo di fallback creato: {title}")
             return article
@@ -278,58 +808,16 @@ class ETFArticleGenerator:
         return random.choice(fallback_contents)
     
     def generate_article_id(self, title: str) -> str:
-        """Genera un ID univoco per l'articolo"""
-        # Converti il titolo in slug
-        slug = title.lower()
-        slug = slug.replace(" ", "-")
-        slug = slug.replace(":", "")
-        slug = slug.replace(",", "")
-        slug = slug.replace(".", "")
-        
-        # Aggiungi timestamp per unicità
-        timestamp = int(time.time())
-        
-        return f"{slug}-{timestamp}"
-    
-    def get_category_from_title(self, title: str) -> str:
-        """Determina la categoria dall'titolo"""
-        title_lower = title.lower()
-        
-        if "analisi" in title_lower:
-            return "Analisi di Mercato"
-        elif "guida" in title_lower:
-            return "Guide agli Investimenti"
-        elif "confronto" in title_lower:
-            return "Confronti ETF"
-        elif "trend" in title_lower or "previsioni" in title_lower:
-            return "Trend e Previsioni"
-        elif "strategia" in title_lower or "strategie" in title_lower:
-            return "Strategie di Investimento"
-        else:
-            return "ETF News"
-    
-    def generate_tags(self, title: str) -> List[str]:
-        """Genera tag basati sul titolo"""
-        base_tags = ["ETF", "Investimenti", "Finanza"]
-        
-        title_lower = title.lower()
-        
-        if "azionari" in title_lower or "azioni" in title_lower:
-            base_tags.append("ETF Azionari")
-        if "obbligazionari" in title_lower or "obbligazioni" in title_lower:
-            base_tags.append("ETF Obbligazionari")
-        if "europei" in title_lower or "europa" in title_lower:
-            base_tags.append("Mercati Europei")
-        if "emergenti" in title_lower:
-            base_tags.append("Mercati Emergenti")
-        if "esg" in title_lower or "sostenibili" in title_lower:
-            base_tags.append("ESG")
-        if "tecnologia" in title_lower or "tech" in title_lower:
-            base_tags.append("Tecnologia")
-        if "dividend" in title_lower or "dividendi" in title_lower:
-            base_tags.append("Dividendi")
-        
-        return base_tags
+        """Genera un ID univoco per l'articolo (ordinato nel tempo, sicuro tra thread e processi)"""
+        return new_article_id(title)
+    
+    def get_category_from_title(self, title: str, content: str = None) -> str:
+        """Determina la categoria dal titolo (e dal corpo, se il titolo non basta)"""
+        return get_taxonomy().category(title, content)
+    
+    def generate_tags(self, title: str, content: str = None) -> List[str]:
+        """Genera tag basati su titolo e corpo dell'articolo"""
+        return get_taxonomy().tags(title, content)
     
     def save_article(self, article: Dict[str, Any], filename: str = None) -> str:
         """Salva l'articolo in formato JSON"""
@@ -341,9 +829,32 @@ class ETFArticleGenerator:
         # Crea la directory se non esiste
         os.makedirs("generated_articles", exist_ok=True)
         
+        if self.check_duplicates and self.is_near_duplicate(article):
+            return None
+        
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(article, f, ensure_ascii=False, indent=2)
+            event = {"type": "save", "engine": self.engine}
+            with timed(event, "save_article"):
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(article, f, ensure_ascii=False, indent=2)
+            get_metrics().record(event)
+            
+            # Indicizzato solo a file scritto: i quasi-duplicati della stessa esecuzione vengono scartati,
+            # un salvataggio fallito non lascia nell'indice un articolo inesistente
+            if self.check_duplicates:
+                try:
+                    self.dedup_index.add(article['id'], article['content'])
+                except Exception as e:
+                    # L'integrazione lo indicizza comunque all'importazione
+                    logger.warning(f"Articolo non aggiunto all'indice dei duplicati: {e}")
+            
+            # Backlog di /api/status senza rileggere la directory dei generati (l'articolo è già salvato)
+            try:
+                BlogStats(stats_path_for("js/blog-data.js"),
+                          seeds={"generated": lambda: count_generated("generated_articles")},
+                          corpus=lambda: read_articles("js/blog-data.js")).increment("generated")
+            except OSError as e:
+                logger.warning(f"Contatore dei generati non aggiornato: {e}")
             
             logger.info(f"Articolo salvato: {filepath}")
             return filepath
@@ -352,19 +863,49 @@ class ETFArticleGenerator:
             logger.error(f"Errore nel salvataggio dell'articolo: {e}")
             return None
     
-    def generate_daily_articles(self, num_articles: int = 2) -> List[Dict[str, Any]]:
-        """Genera il numero specificato di articoli giornalieri"""
+    def is_near_duplicate(self, article: Dict[str, Any]) -> bool:
+        """Verifica l'articolo sull'indice dei quasi-duplicati condiviso con l'integrazione (save_article lo aggiunge)"""
+        if self.dedup_index is None:
+            from dedup_index import DuplicateIndex
+            os.makedirs("processed_articles", exist_ok=True)
+            self.dedup_index = DuplicateIndex(os.path.join("processed_articles", "dedup_index.sqlite"))
+        
+        duplicate = self.dedup_index.find_duplicate(article['content'], exclude_id=article['id'])
+        if duplicate:
+            logger.warning(f"Articolo scartato, quasi-duplicato di {duplicate[0]} ({duplicate[1]:.2f}): {article['title']}")
+            return True
+        return False
+    
+    def generate_daily_articles(self, num_articles: int = 2, batch_size: int = None, workers: int = None,
+                                seed: int = None) -> List[Dict[str, Any]]:
+        """Genera il numero specificato di articoli giornalieri; con seed l'articolo i usa seed + i
+        (titolo, prompt e campionamento riproducibili, quindi serviti dalla cache dei testi)"""
+        batch_size = max(1, batch_size or self.batch_size)
+        workers = max(1, workers or self.workers)
+        
+        # In un batch il campionamento di ogni riga dipende dalle altre: con seed si genera un articolo alla volta
+        if seed is not None:
+            batch_size = workers = 1
+        
+        if workers > 1:
+            return self.generate_daily_articles_parallel(num_articles, workers, batch_size)
+        
+        if batch_size > 1:
+            return self.generate_daily_articles_batched(num_articles, batch_size)
+        
         articles = []
         
         logger.info(f"Inizio generazione di {num_articles} articoli")
         
         for i in range(num_articles):
             try:
+                article_seed = seed + i if seed is not None else None
+                
                 # Genera titolo
-                title = self.generate_article_title()
+                title = self.generate_article_title(article_seed)
                 
                 # Genera articolo
-                article = self.generate_article_content(title)
+                article = self.generate_article_content(title, article_seed)
                 
                 if article:
                     # Salva articolo
@@ -372,9 +913,6 @@ class ETFArticleGenerator:
                     if filepath:
                         articles.append(article)
                         logger.info(f"Articolo {i+1}/{num_articles} completato")
-                    
-                    # Pausa tra le generazioni
-                    time.sleep(2)
                 else:
                     logger.warning(f"Fallita generazione articolo {i+1}")
                     
@@ -383,6 +921,110 @@ class ETFArticleGenerator:
         
         logger.info(f"Generazione completata: {len(articles)} articoli creati")
         return articles
+    
+    def generate_daily_articles_batched(self, num_articles: int, batch_size: int) -> List[Dict[str, Any]]:
+        """Genera gli articoli a gruppi di batch_size, senza pause tra le generazioni"""
+        articles = []
+        
+        logger.info(f"Inizio generazione di {num_articles} articoli (batch da {batch_size})")
+        
+        for start in range(0, num_articles, batch_size):
+            count = min(batch_size, num_articles - start)
+            try:
+                titles = [self.generate_article_title() for _ in range(count)]
+                
+                for article in self.generate_articles_batch(titles):
+                    if self.save_article(article):
+                        articles.append(article)
+                
+                logger.info(f"Batch completato: {len(articles)}/{num_articles} articoli")
+                
+            except Exception as e:
+                logger.error(f"Errore nella generazione del batch {start // batch_size + 1}: {e}")
+        
+        logger.info(f"Generazione completata: {len(articles)} articoli creati")
+        return articles
+    
+    def generate_daily_articles_parallel(self, num_articles: int, workers: int, batch_size: int) -> List[Dict[str, Any]]:
+        """Distribuisce la generazione su un pool di processi e unisce i risultati in ordine"""
+        articles = []
+        
+        logger.info(f"Inizio generazione di {num_articles} articoli su {workers} processi")
+        
+        # Titoli decisi qui: ogni processo riceve un blocco contiguo
+        titles = [self.generate_article_title() for _ in range(num_articles)]
+        shard_size = -(-num_articles // workers)
+        shards = [titles[i:i + shard_size] for i in range(0, num_articles, shard_size)]
+        
+        try:
+            pool = self.get_pool(workers)
+            # map restituisce i blocchi nell'ordine di invio
+            for shard_articles in pool.map(_generate_pool_shard, shards, [batch_size] * len(shards)):
+                for article in shard_articles:
+                    if self.save_article(article):
+                        articles.append(article)
+                        
+        except Exception as e:
+            logger.error(f"Errore nel pool di generazione: {e}")
+            self.close_pool()
+        
+        logger.info(f"Generazione completata: {len(articles)} articoli creati")
+        return articles
+    
+    def get_pool(self, workers: int):
+        """Restituisce il pool di processi, creandolo se necessario (modello caricato una volta per processo)"""
+        if self.pool is not None and self.pool_workers == workers:
+            return self.pool
+        
+        self.close_pool()
+        
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Budget di thread per processo: i core vengono divisi tra i worker
+        threads = self.threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_pool_worker,
+            initargs=(self.engine, threads)
+        )
+        self.pool_workers = workers
+        logger.info(f"Pool di generazione avviato: {workers} processi, {threads} thread ciascuno")
+        return self.pool
+    
+    def close_pool(self):
+        """Chiude il pool di processi"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+            self.pool_workers = 0
+
+# Generatore del processo corrente quando è un worker del pool
+_pool_generator = None
+
+def _init_pool_worker(engine: str, num_threads: int):
+    """Inizializza un worker del pool: thread torch limitati e modello caricato una volta"""
+    global _pool_generator
+    
+    if engine != "template":
+        import torch
+        torch.set_num_threads(num_threads)
+    
+    _pool_generator = ETFArticleGenerator(engine=engine)
+    _pool_generator.load_model()
+
+def _generate_pool_shard(titles: List[str], batch_size: int) -> List[Dict[str, Any]]:
+    """Genera un blocco di articoli nel worker del pool (senza salvarli)"""
+    if batch_size > 1:
+        articles = []
+        for start in range(0, len(titles), batch_size):
+            articles.extend(_pool_generator.generate_articles_batch(titles[start:start + batch_size]))
+        return articles
+    
+    articles = [_pool_generator.generate_article_content(title) for title in titles]
+    return [article for article in articles if article]
 
 def main():
     """Funzione principale"""
@@ -6,12 +6,21 @@ Importa automaticamente gli articoli generati dall'AI nel sistema del blog
 """
 
 import os
+import sys
 import json
-import glob
+import heapq
 import logging
 import datetime
 from typing import List, Dict, Any
 
+from dedup_index import DuplicateIndex
+from blog_shards import publish_blog_shards
+from blog_store import BlogDataStore
+from blog_stats import BlogStats, count_articles, count_generated, stats_path_for
+from content_analysis import analyze_content
+from processed_ledger import ProcessedLedger
+from article_watcher import watch_directory
+
 # Configurazione logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,14 +29,40 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class AIBlogIntegration:
-    def __init__(self):
+    def __init__(self, duplicate_policy: str = "reject"):
         """Inizializza l'integrazione AI-Blog"""
         self.generated_articles_dir = "generated_articles"
         self.processed_articles_dir = "processed_articles"
         self.blog_data_file = "js/blog-data.js"
+        # Shard caricati da blog.html e article.html (indice, contenuti per mese, liste per categoria),
+        # costruiti da questo file e da blog-data.js degli editor
+        self.blog_shards_dir = "js/blog-data"
+        # Contatori materializzati, riscritti nella stessa commit del file del blog
+        self.blog_stats = BlogStats(
+            stats_path_for(self.blog_data_file),
+            # Conteggio dal file del registro: worker e watch lo scrivono entrambi, il contatore non torna indietro
+            counters=lambda: {"processed": self.ledger.refresh()},
+            seeds={"generated": lambda: count_generated(self.generated_articles_dir)},
+            corpus=lambda: self.blog_store.read()
+        )
+        # Scritture atomiche e coordinate (lock tra processi, group commit tra thread)
+        self.blog_store = BlogDataStore(
+            self.blog_data_file, self.render_blog_data, stats=self.blog_stats,
+            on_commit=lambda articles: publish_blog_shards(override=(self.blog_data_file, articles),
+                                                           directory=self.blog_shards_dir)
+        )
+        
+        # Quasi-duplicati: "reject" li scarta, "flag" li pubblica segnalandoli
+        self.duplicate_policy = duplicate_policy
         
         # Crea le directory se non esistono
         os.makedirs(self.processed_articles_dir, exist_ok=True)
+        
+        self.dedup_index = DuplicateIndex(os.path.join(self.processed_articles_dir, "dedup_index.sqlite"))
+        
+        # Registro append-only dei processati (sostituisce le copie dei file in processed_articles)
+        self.ledger = ProcessedLedger(os.path.join(self.processed_articles_dir, "processed.jsonl"))
+        self.ledger.migrate_directory(self.processed_articles_dir)
     
     def get_new_articles(self) -> List[str]:
         """Trova nuovi articoli da processare"""
@@ -35,18 +70,14 @@ class AIBlogIntegration:
             logger.warning(f"Directory {self.generated_articles_dir} non trovata")
             return []
         
-        # Trova tutti i file JSON nella directory degli articoli generati
-        pattern = os.path.join(self.generated_articles_dir, "article_*.json")
-        article_files = glob.glob(pattern)
-        
-        # Filtra solo i file non ancora processati
+        # Filtra solo i file non ancora processati (una lettura della directory, lookup in memoria)
+        self.ledger.refresh()
         new_articles = []
-        for file_path in article_files:
-            filename = os.path.basename(file_path)
-            processed_path = os.path.join(self.processed_articles_dir, filename)
-            
-            if not os.path.exists(processed_path):
-                new_articles.append(file_path)
+        with os.scandir(self.generated_articles_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("article_") and entry.name.endswith(".json") and entry.name not in self.ledger:
+                    new_articles.append(entry.path)
+        new_articles.sort()
         
         logger.info(f"Trovati {len(new_articles)} nuovi articoli da processare")
         return new_articles
@@ -63,12 +94,15 @@ class AIBlogIntegration:
     
     def format_article_for_blog(self, article: Dict[str, Any]) -> Dict[str, Any]:
         """Formatta l'articolo per il sistema del blog"""
+        # Campi derivati dal contenuto, calcolati una sola volta qui e salvati con l'articolo
+        analysis = analyze_content(article.get("content") or "")
+        
         # Converti il formato AI in formato blog
         blog_article = {
             "id": article.get("id"),
             "title": article.get("title"),
             "content": article.get("content"),
-            "excerpt": article.get("excerpt"),
+            "excerpt": analysis["excerpt"],
             "author": article.get("author", "ETF Italia AI"),
             "date": article.get("date"),
             "category": article.get("category"),
@@ -76,7 +110,11 @@ class AIBlogIntegration:
             "featured": article.get("featured", False),
             "published": article.get("published", True),
             "image": self.get_default_image(article.get("category")),
-            "readTime": self.calculate_read_time(article.get("content", "")),
+            "readTime": analysis["readTime"],
+            "wordCount": analysis["wordCount"],
+            "outline": analysis["outline"],
+            "fingerprint": analysis["fingerprint"],
+            "keywords": analysis["keywords"],
             "views": 0,
             "likes": 0,
             "aiGenerated": True  # Flag per identificare articoli AI
@@ -98,16 +136,24 @@ class AIBlogIntegration:
         return category_images.get(category, "https://images.unsplash.com/photo-1611974789855-9c2a0a7236a3?w=800")
     
     def calculate_read_time(self, content: str) -> int:
-        """Calcola il tempo di lettura stimato"""
-        # Rimuovi tag HTML per contare solo il testo
-        import re
-        text_content = re.sub(r'<[^>]+>', '', content)
-        
-        # Conta le parole (media 200 parole al minuto)
-        word_count = len(text_content.split())
-        read_time = max(1, round(word_count / 200))
-        
-        return read_time
+        """Calcola il tempo di lettura stimato (200 parole al minuto)"""
+        return analyze_content(content)["readTime"]
+    
+    def backfill_analysis(self, articles: List[Dict[str, Any]]) -> int:
+        """Aggiunge i campi derivati agli articoli salvati prima dell'analisi in ingestione"""
+        count = 0
+        for article in articles:
+            if "keywords" in article:
+                continue
+            analysis = analyze_content(article.get("content") or "")
+            # L'estratto scritto a mano resta; si sostituisce solo quello tagliato alla cieca
+            if article.get("excerpt") and not article.get("aiGenerated", False):
+                del analysis["excerpt"]
+            article.update(analysis)
+            count += 1
+        if count:
+            logger.info(f"Campi derivati aggiunti a {count} articoli esistenti")
+        return count
     
     def load_existing_blog_data(self) -> List[Dict[str, Any]]:
         """Carica i dati del blog esistenti"""
@@ -116,35 +162,7 @@ class AIBlogIntegration:
             return []
         
         try:
-            with open(self.blog_data_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Estrai il JSON dal file JavaScript
-            start_marker = "const blogArticles = "
-            end_marker = ";\n\n// Funzioni"
-            
-            start_idx = content.find(start_marker)
-            if start_idx == -1:
-                logger.warning("Marker di inizio non trovato nel file blog-data.js")
-                return []
-            
-            start_idx += len(start_marker)
-            end_idx = content.find(end_marker, start_idx)
-            
-            if end_idx == -1:
-                # Prova con un marker alternativo
-                end_idx = content.rfind("];")
-                if end_idx != -1:
-                    end_idx += 1
-                else:
-                    logger.warning("Marker di fine non trovato nel file blog-data.js")
-                    return []
-            
-            json_str = content[start_idx:end_idx].strip()
-            if json_str.endswith(';'):
-                json_str = json_str[:-1]
-            
-            articles = json.loads(json_str)
+            articles = self.blog_store.read()
             logger.info(f"Caricati {len(articles)} articoli esistenti")
             return articles
             
@@ -152,11 +170,9 @@ class AIBlogIntegration:
             logger.error(f"Errore nel caricamento dei dati del blog: {e}")
             return []
     
-    def save_blog_data(self, articles: List[Dict[str, Any]]) -> bool:
-        """Salva i dati del blog aggiornati"""
-        try:
-            # Crea il contenuto JavaScript
-            js_content = f"""// Dati degli articoli del blog - ETF Italia
+    def render_blog_data(self, articles: List[Dict[str, Any]]) -> str:
+        """Contenuto JavaScript del file blog-data.js"""
+        return f"""// Dati degli articoli del blog - ETF Italia
 // Aggiornato automaticamente: {datetime.datetime.now().isoformat()}
 
 const blogArticles = {json.dumps(articles, ensure_ascii=False, indent=2)};
@@ -198,10 +214,14 @@ if (typeof module !== 'undefined' && module.exports) {{
         getAIGeneratedArticles
     }};
 }}"""
+    
+    def save_blog_data(self, articles: List[Dict[str, Any]]) -> bool:
+        """Salva i dati del blog aggiornati"""
+        try:
+            def replace_all(current):
+                current[:] = articles
             
-            # Salva il file
-            with open(self.blog_data_file, 'w', encoding='utf-8') as f:
-                f.write(js_content)
+            self.blog_store.update(replace_all)
             
             logger.info(f"Dati del blog salvati: {len(articles)} articoli totali")
             return True
@@ -210,15 +230,13 @@ if (typeof module !== 'undefined' && module.exports) {{
             logger.error(f"Errore nel salvataggio dei dati del blog: {e}")
             return False
     
-    def mark_article_as_processed(self, file_path: str) -> bool:
+    def mark_article_as_processed(self, file_path: str, article_id: str = None) -> bool:
         """Marca un articolo come processato"""
         try:
             filename = os.path.basename(file_path)
-            processed_path = os.path.join(self.processed_articles_dir, filename)
             
-            # Copia il file nella directory dei processati
-            import shutil
-            shutil.copy2(file_path, processed_path)
+            # Una riga nel registro (nome, ID, hash del contenuto) al posto della copia del file
+            self.ledger.add(file_path, article_id)
             
             logger.info(f"Articolo marcato come processato: {filename}")
             return True
@@ -227,9 +245,13 @@ if (typeof module !== 'undefined' && module.exports) {{
             logger.error(f"Errore nel marcare l'articolo come processato: {e}")
             return False
     
-    def process_new_articles(self) -> int:
-        """Processa tutti i nuovi articoli"""
-        new_article_files = self.get_new_articles()
+    def process_new_articles(self, file_paths: List[str] = None) -> int:
+        """Processa tutti i nuovi articoli (o solo file_paths, se indicati dalla modalità watch)"""
+        if file_paths is None:
+            new_article_files = self.get_new_articles()
+        else:
+            self.ledger.refresh()
+            new_article_files = [path for path in file_paths if os.path.basename(path) not in self.ledger and os.path.exists(path)]
         
         if not new_article_files:
             logger.info("Nessun nuovo articolo da processare")
@@ -238,6 +260,15 @@ if (typeof module !== 'undefined' && module.exports) {{
         # Carica articoli esistenti
         existing_articles = self.load_existing_blog_data()
         
+        # Prima esecuzione: indicizza il corpus già pubblicato (l'indice può già contenere i generati,
+        # aggiunti dal generatore con check_duplicates)
+        if not self.dedup_index.corpus_indexed():
+            self.dedup_index.index_corpus([(art['id'], art.get('content', '')) for art in existing_articles])
+            logger.info(f"Indice duplicati creato: {len(existing_articles)} articoli")
+        
+        # Indice degli ID pubblicati: verifica di esistenza in O(1) per ogni nuovo file
+        existing_ids = {art['id'] for art in existing_articles}
+        new_articles = []
         processed_count = 0
         
         for file_path in new_article_files:
@@ -251,15 +282,32 @@ if (typeof module !== 'undefined' && module.exports) {{
                 blog_article = self.format_article_for_blog(ai_article)
                 
                 # Verifica che non esista già
-                if any(art['id'] == blog_article['id'] for art in existing_articles):
+                if blog_article['id'] in existing_ids:
                     logger.warning(f"Articolo già esistente: {blog_article['id']}")
+                    self.mark_article_as_processed(file_path, blog_article['id'])
                     continue
                 
-                # Aggiungi agli articoli esistenti
-                existing_articles.append(blog_article)
+                # Verifica che non sia un quasi-duplicato di un articolo pubblicato
+                duplicate = self.dedup_index.find_duplicate(blog_article['content'] or '', exclude_id=blog_article['id'])
+                if duplicate:
+                    duplicate_id, score = duplicate
+                    if self.duplicate_policy == "reject":
+                        logger.warning(f"Quasi-duplicato scartato: {blog_article['id']} (simile a {duplicate_id}, {score:.2f})")
+                        # Marcato come processato per non riesaminarlo alla prossima esecuzione
+                        self.mark_article_as_processed(file_path, blog_article['id'])
+                        continue
+                    
+                    logger.warning(f"Quasi-duplicato segnalato: {blog_article['id']} (simile a {duplicate_id}, {score:.2f})")
+                    blog_article['nearDuplicateOf'] = duplicate_id
+                
+                self.dedup_index.add(blog_article['id'], blog_article['content'] or '')
+                
+                # Aggiungi ai nuovi articoli (uniti al corpus alla fine)
+                existing_ids.add(blog_article['id'])
+                new_articles.append(blog_article)
                 
                 # Marca come processato
-                if self.mark_article_as_processed(file_path):
+                if self.mark_article_as_processed(file_path, blog_article['id']):
                     processed_count += 1
                     logger.info(f"Processato: {blog_article['title']}")
                 
@@ -268,41 +316,86 @@ if (typeof module !== 'undefined' && module.exports) {{
         
         # Salva i dati aggiornati
         if processed_count > 0:
-            # Ordina per data (più recenti prima)
-            existing_articles.sort(key=lambda x: x['date'], reverse=True)
-            
-            if self.save_blog_data(existing_articles):
+            if self.add_articles(new_articles):
                 logger.info(f"✅ Processati {processed_count} nuovi articoli")
             else:
                 logger.error("❌ Errore nel salvataggio dei dati del blog")
+        else:
+            # Solo duplicati o articoli già presenti: cambia il solo contatore dei processati
+            self.blog_stats.update(lambda stats: None)
         
         return processed_count
     
-    def get_statistics(self) -> Dict[str, Any]:
-        """Restituisce statistiche sugli articoli"""
-        articles = self.load_existing_blog_data()
+    def add_articles(self, new_articles: List[Dict[str, Any]]) -> bool:
+        """Unisce i nuovi articoli al file del blog rileggendolo sotto lock (nessuna modifica concorrente persa)"""
+        try:
+            def merge_into(current):
+                # Il file può essere cambiato dopo la lettura iniziale: gli ID si riverificano qui
+                current_ids = {art['id'] for art in current}
+                self.backfill_analysis(current)
+                # Ordina per data (più recenti prima)
+                current[:] = self.merge_articles(current, [art for art in new_articles if art['id'] not in current_ids])
+                return len(current)
+            
+            total = self.blog_store.update(merge_into)
+            
+            logger.info(f"Dati del blog salvati: {total} articoli totali")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Errore nel salvataggio dei dati del blog: {e}")
+            return False
+    
+    def merge_articles(self, existing_articles: List[Dict[str, Any]], new_articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Unisce i nuovi articoli al corpus (più recenti prima) con un merge lineare"""
+        def by_date(article):
+            return article['date']
         
-        ai_articles = [art for art in articles if art.get('aiGenerated', False)]
+        # Solo i nuovi articoli vanno ordinati: il corpus salvato è già in ordine
+        new_articles = sorted(new_articles, key=by_date, reverse=True)
         
-        stats = {
-            "total_articles": len(articles),
-            "ai_generated": len(ai_articles),
-            "human_written": len(articles) - len(ai_articles),
-            "categories": {},
-            "last_update": datetime.datetime.now().isoformat()
-        }
+        # Corpus modificato a mano e non più ordinato: un ordinamento completo lo ripristina
+        if any(existing_articles[i]['date'] < existing_articles[i + 1]['date'] for i in range(len(existing_articles) - 1)):
+            existing_articles = sorted(existing_articles, key=by_date, reverse=True)
         
-        # Conta per categoria
-        for article in articles:
-            category = article.get('category', 'Senza Categoria')
-            if category not in stats['categories']:
-                stats['categories'][category] = {'total': 0, 'ai': 0}
-            
-            stats['categories'][category]['total'] += 1
-            if article.get('aiGenerated', False):
-                stats['categories'][category]['ai'] += 1
+        return list(heapq.merge(existing_articles, new_articles, key=by_date, reverse=True))
+    
+    def watch(self, debounce: float = 2.0, max_delay: float = 10.0, poll_interval: float = 1.0, stop=None):
+        """Resta in ascolto su generated_articles e integra ogni lotto di nuovi file con una sola riscrittura"""
+        # Recupera gli articoli arrivati mentre l'integrazione non era attiva
+        self.process_new_articles()
         
+        def on_batch(paths):
+            try:
+                # None: eventi persi dal kernel, si torna alla scansione completa
+                processed = self.process_new_articles(paths)
+                if processed:
+                    logger.info(f"Watch: {processed} articoli pubblicati")
+            except Exception as e:
+                logger.error(f"Errore nell'integrazione del lotto: {e}")
+        
+        logger.info(f"👀 In ascolto su {self.generated_articles_dir} (lotti chiusi dopo {debounce}s di quiete)")
+        watch_directory(self.generated_articles_dir, on_batch, debounce, max_delay, poll_interval, stop)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Restituisce statistiche sugli articoli (lette dal file materializzato, senza rileggere il corpus)"""
+        stats = self.blog_stats.read()
+        if stats is None or "generated" not in stats or "total_articles" not in stats:
+            stats = self.rebuild_statistics()
         return stats
+    
+    def rebuild_statistics(self) -> Dict[str, Any]:
+        """Ricostruisce il file delle statistiche dal corpus e dalla directory dei generati (solo la prima volta)"""
+        articles = self.load_existing_blog_data()
+        
+        def rebuild(stats):
+            stats.update(count_articles(articles))
+            # Conteggio sotto il lock delle statistiche: gli incrementi del generatore non si perdono
+            stats["generated"] = count_generated(self.generated_articles_dir)
+        
+        stats = self.blog_stats.update(rebuild)
+        logger.info(f"Statistiche ricostruite: {stats['total_articles']} articoli, {stats['generated']} generati")
+        return self.blog_stats.read()
 
 def main():
     """Funzione principale"""
@@ -311,6 +404,15 @@ def main():
     
     integration = AIBlogIntegration()
     
+    if len(sys.argv) > 1 and sys.argv[1].lower() == "watch":
+        # Processo persistente: pubblica i nuovi articoli pochi secondi dopo la generazione
+        print("Premi Ctrl+C per fermare\n")
+        try:
+            integration.watch()
+        except KeyboardInterrupt:
+            print("\n⏹️ Watch fermato")
+        return
+    
     # Processa nuovi articoli
     processed = integration.process_new_articles()
     
@@ -325,6 +427,7 @@ def main():
     print(f"   Articoli totali: {stats['total_articles']}")
     print(f"   Generati da AI: {stats['ai_generated']}")
     print(f"   Scritti manualmente: {stats['human_written']}")
+    print(f"   Generati in attesa di integrazione: {stats['backlog']}")
     
     print("\n📂 Per categoria:")
     for category, data in stats['categories'].items():
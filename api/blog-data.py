@@ -3,6 +3,23 @@ import json
 import os
 from datetime import datetime
 
+from blog_shards import publish_blog_shards
+from blog_store import BlogDataStore
+from blog_stats import BlogStats, stats_path_for
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOG_DATA_PATH = os.path.join(ROOT, 'blog-data.js')
+
+# Counters (totals, per category, per day) rewritten in the same commit as blog-data.js
+blog_stats = BlogStats(stats_path_for(BLOG_DATA_PATH))
+
+# Shared by all requests of this process: concurrent updates are group-committed into one rewrite.
+# Every commit also rebuilds the shards read by blog.html (this corpus plus js/blog-data.js)
+blog_store = BlogDataStore(
+    BLOG_DATA_PATH, stats=blog_stats,
+    on_commit=lambda articles: publish_blog_shards(ROOT, override=(BLOG_DATA_PATH, articles))
+)
+
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         try:
@@ -105,16 +122,8 @@ class handler(BaseHTTPRequestHandler):
                 # Update blog-data.js with new articles
                 articles = data.get('articles', [])
                 
-                blog_data_path = os.path.join(
-                    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                    'blog-data.js'
-                )
-                
-                # Create JavaScript content
-                js_content = f"const blogArticles = {json.dumps(articles, ensure_ascii=False, indent=2)};"
-                
-                with open(blog_data_path, 'w', encoding='utf-8') as f:
-                    f.write(js_content)
+                # Atomic temp file + rename under the shared file lock
+                blog_store.replace(articles)
                 
                 response = {
                     'status': 'success',
@@ -129,31 +138,8 @@ class handler(BaseHTTPRequestHandler):
                 if not article:
                     raise ValueError('Article data is required')
                 
-                # Read existing articles
-                blog_data_path = os.path.join(
-                    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                    'blog-data.js'
-                )
-                
-                articles = []
-                if os.path.exists(blog_data_path):
-                    with open(blog_data_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        start_idx = content.find('[')
-                        end_idx = content.rfind(']') + 1
-                        
-                        if start_idx != -1 and end_idx != -1:
-                            json_content = content[start_idx:end_idx]
-                            articles = json.loads(json_content)
-                
-                # Add new article
-                articles.append(article)
-                
-                # Write back to file
-                js_content = f"const blogArticles = {json.dumps(articles, ensure_ascii=False, indent=2)};"
-                
-                with open(blog_data_path, 'w', encoding='utf-8') as f:
-                    f.write(js_content)
+                # Read existing articles, add the new one and write back under the file lock
+                blog_store.update(lambda articles: articles.append(article))
                 
                 response = {
                     'status': 'success',
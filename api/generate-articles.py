@@ -2,10 +2,11 @@ from http.server import BaseHTTPRequestHandler
 import json
 import os
 import requests
-import time
 from datetime import datetime
 import random
 
+from article_ids import new_article_id
+
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
         try:
@@ -80,7 +81,7 @@ class handler(BaseHTTPRequestHandler):
             category = random.choice(categories)
             
             article = {
-                'id': f'article_{int(time.time())}_{i}',
+                'id': new_article_id(topic),
                 'title': topic,
                 'content': self.generate_article_content(topic),
                 'author': 'AI Assistant',
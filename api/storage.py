@@ -4,6 +4,24 @@ import os
 from datetime import datetime
 from typing import List, Dict, Any
 
+from blog_shards import publish_blog_shards
+from blog_store import BlogDataStore
+from blog_stats import BlogStats, stats_path_for
+from content_analysis import analyze_content
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOG_DATA_PATH = os.path.join(ROOT, 'blog-data.js')
+
+# Counters (totals, per category, per day) rewritten in the same commit as blog-data.js
+blog_stats = BlogStats(stats_path_for(BLOG_DATA_PATH))
+
+# Shared by all requests of this process: concurrent saves are group-committed into one rewrite.
+# Every commit also rebuilds the shards read by blog.html (this corpus plus js/blog-data.js)
+blog_store = BlogDataStore(
+    BLOG_DATA_PATH, stats=blog_stats,
+    on_commit=lambda articles: publish_blog_shards(ROOT, override=(BLOG_DATA_PATH, articles))
+)
+
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         try:
@@ -34,17 +52,18 @@ class handler(BaseHTTPRequestHandler):
                 }
                 
             elif action == 'get_stats':
-                # Get storage statistics
-                articles = self._get_articles_from_storage()
-                ai_articles = [a for a in articles if a.get('aiGenerated', False)]
+                # Get storage statistics from the materialised stats file (built once if missing)
+                stats = blog_stats.read() or blog_stats.refresh(self._get_articles_from_storage())
                 
                 response = {
                     'status': 'success',
                     'stats': {
-                        'total_articles': len(articles),
-                        'ai_articles': len(ai_articles),
-                        'manual_articles': len(articles) - len(ai_articles),
-                        'last_updated': datetime.now().isoformat()
+                        'total_articles': stats['total_articles'],
+                        'ai_articles': stats['ai_generated'],
+                        'manual_articles': stats['human_written'],
+                        'categories': stats['categories'],
+                        'days': stats['days'],
+                        'last_updated': stats['last_update']
                     },
                     'timestamp': datetime.now().isoformat()
                 }
@@ -146,25 +165,8 @@ class handler(BaseHTTPRequestHandler):
     def _get_articles_from_storage(self) -> List[Dict[str, Any]]:
         """Get articles from storage (file-based for now, can be extended to database)"""
         try:
-            # Try to read from blog-data.js first
-            blog_data_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                'blog-data.js'
-            )
-            
-            if os.path.exists(blog_data_path):
-                with open(blog_data_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Extract JSON from JavaScript file
-                start_idx = content.find('[')
-                end_idx = content.rfind(']') + 1
-                
-                if start_idx != -1 and end_idx != -1:
-                    json_content = content[start_idx:end_idx]
-                    return json.loads(json_content)
-            
-            return []
+            # Read from blog-data.js
+            return blog_store.read()
             
         except Exception as e:
             print(f"Error reading articles: {str(e)}")
@@ -173,26 +175,31 @@ class handler(BaseHTTPRequestHandler):
     def _save_article_to_storage(self, article: Dict[str, Any]) -> bool:
         """Save article to storage"""
         try:
-            # Get existing articles
-            articles = self._get_articles_from_storage()
-            
-            # Check if article already exists (by ID)
-            article_id = article.get('id')
-            existing_index = -1
-            
-            for i, existing_article in enumerate(articles):
-                if existing_article.get('id') == article_id:
-                    existing_index = i
-                    break
-            
-            # Update existing or add new
-            if existing_index >= 0:
-                articles[existing_index] = article
-            else:
-                articles.append(article)
-            
-            # Save back to file
-            return self._save_articles_to_file(articles)
+            # Derived fields (word count, read time, outline, fingerprint) are computed once, on write
+            analysis = analyze_content(article.get('content') or '')
+            if article.get('excerpt'):
+                del analysis['excerpt']
+            article.update(analysis)
+            
+            def upsert(articles):
+                # Check if article already exists (by ID)
+                article_id = article.get('id')
+                existing_index = -1
+                
+                for i, existing_article in enumerate(articles):
+                    if existing_article.get('id') == article_id:
+                        existing_index = i
+                        break
+                
+                # Update existing or add new
+                if existing_index >= 0:
+                    articles[existing_index] = article
+                else:
+                    articles.append(article)
+            
+            # Read, modify and save back under the file lock
+            blog_store.update(upsert)
+            return True
             
         except Exception as e:
             print(f"Error saving article: {str(e)}")
@@ -201,15 +208,15 @@ class handler(BaseHTTPRequestHandler):
     def _delete_article_from_storage(self, article_id: str) -> bool:
         """Delete article from storage"""
         try:
-            articles = self._get_articles_from_storage()
+            def delete(articles):
+                # Filter out the article to delete
+                filtered_articles = [a for a in articles if a.get('id') != article_id]
+                deleted = len(filtered_articles) < len(articles)
+                articles[:] = filtered_articles
+                return deleted
             
-            # Filter out the article to delete
-            filtered_articles = [a for a in articles if a.get('id') != article_id]
-            
-            if len(filtered_articles) < len(articles):
-                return self._save_articles_to_file(filtered_articles)
-            
-            return False  # Article not found
+            # False if the article was not found
+            return blog_store.update(delete)
             
         except Exception as e:
             print(f"Error deleting article: {str(e)}")
@@ -218,17 +225,8 @@ class handler(BaseHTTPRequestHandler):
     def _save_articles_to_file(self, articles: List[Dict[str, Any]]) -> bool:
         """Save articles array to blog-data.js file"""
         try:
-            blog_data_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                'blog-data.js'
-            )
-            
-            # Create JavaScript content
-            js_content = f"const blogArticles = {json.dumps(articles, ensure_ascii=False, indent=2)};"
-            
-            with open(blog_data_path, 'w', encoding='utf-8') as f:
-                f.write(js_content)
-            
+            # Atomic temp file + rename under the shared file lock
+            blog_store.replace(articles)
             return True
             
         except Exception as e:
@@ -6,16 +6,23 @@ Questo server gestisce le chiamate API per la generazione di articoli AI
 """
 
 import os
-import sys
 import json
-import subprocess
+import hashlib
 import logging
 from datetime import datetime
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
 import threading
 import time
 
+from article_ids import slugify
+from generation_worker import GenerationWorker
+from generation_metrics import get_metrics
+from blog_stats import BlogStats, count_generated, stats_path_for
+from search_index import SearchIndexCache
+from blog_store import parse_articles_js, read_articles
+
 # Configurazione logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,17 +34,121 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tipi di job accettati da /api/generate-articles ('stream' passa solo da /api/generate-stream)
+GENERATION_TYPES = ('manual', 'test')
+
+# Articoli al massimo per richiesta: il worker è uno solo e serve i job in ordine
+MAX_GENERATION_COUNT = 5
+
+# Titoli di /api/generate-stream: diventano slug e nome del file dell'articolo
+MAX_TITLE_LENGTH = 200
+
+class ArticlesCache:
+    """Articoli di blog-data.js con la risposta JSON già codificata e il suo ETag, ricaricati quando
+    cambiano mtime o dimensione del file (l'integrazione lo sostituisce con un rename atomico)"""
+    
+    def __init__(self, path='js/blog-data.js'):
+        """Cache sul file path"""
+        self.path = path
+        self.version = None
+        self.articles = []
+        self.body = b''
+        self.etag = None
+        self.lock = threading.Lock()
+    
+    def get(self):
+        """(articoli, corpo della risposta, ETag) aggiornati"""
+        try:
+            stat = os.stat(self.path)
+            version = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            version = None
+        
+        with self.lock:
+            if self.etag is None or version != self.version:
+                self.load()
+            return self.articles, self.body, self.etag
+    
+    def load(self):
+        """Rilegge il file e ricodifica la risposta (chiamato sotto lock)"""
+        articles = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                # Versione del file effettivamente aperto: un rename successivo forzerà una nuova lettura
+                stat = os.fstat(f.fileno())
+                self.version = (stat.st_mtime_ns, stat.st_size)
+                modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
+                try:
+                    articles = parse_articles_js(f.read())
+                except ValueError:
+                    logger.warning("Errore nel parsing del blog-data.js")
+        except FileNotFoundError:
+            self.version = None
+            modified = None
+        
+        response = {
+            'articles': articles,
+            'count': len(articles),
+            'ai_count': len([a for a in articles if a.get('aiGenerated', False)]),
+            # Data dei dati, non della richiesta: a parità di file la risposta è identica byte per byte
+            'timestamp': modified
+        }
+        self.articles = articles
+        self.body = json.dumps(response, ensure_ascii=False).encode('utf-8')
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        logger.info(f"Articoli caricati in cache: {len(articles)} ({len(self.body)} byte)")
+
 class ETFAPIHandler(BaseHTTPRequestHandler):
     """Handler per le richieste API"""
     
+    # Keep-alive: più richieste sulla stessa connessione (ogni risposta dichiara Content-Length)
+    protocol_version = 'HTTP/1.1'
+    
+    # Secondi di inattività dopo i quali una connessione keep-alive viene chiusa e libera il worker
+    timeout = 5
+    
+    # Intestazioni e corpo sono due scritture: senza TCP_NODELAY il keep-alive attende l'ACK ritardato (~40 ms)
+    disable_nagle_algorithm = True
+    
     def do_OPTIONS(self):
         """Gestisce le richieste OPTIONS per CORS"""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
+    def send_json(self, data, status=200):
+        """Risposta JSON con Content-Length, necessario per riusare la connessione"""
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_cached_json(self, body, etag):
+        """Risposta JSON già codificata con ETag forte; 304 senza corpo se il client ha già questa versione"""
+        if_none_match = self.headers.get('If-None-Match', '')
+        # If-None-Match usa il confronto debole: si ignora un eventuale prefisso W/
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        not_modified = '*' in tags or etag in (tag[2:] if tag.startswith('W/') else tag for tag in tags)
+        
+        self.send_response(304 if not_modified else 200)
+        self.send_header('ETag', etag)
+        # Il browser deve sempre rivalidare: una 304 costa solo le intestazioni
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
     def do_POST(self):
         """Gestisce le richieste POST"""
         try:
@@ -46,6 +157,8 @@ class ETFAPIHandler(BaseHTTPRequestHandler):
             if parsed_path.path == '/api/generate-articles':
                 self.handle_generate_articles()
             else:
+                # Il corpo non letto resterebbe sulla connessione: non la si riusa
+                self.close_connection = True
                 self.send_error(404, 'Endpoint non trovato')
                 
         except Exception as e:
@@ -61,6 +174,12 @@ class ETFAPIHandler(BaseHTTPRequestHandler):
                 self.handle_status()
             elif parsed_path.path == '/api/articles':
                 self.handle_get_articles()
+            elif parsed_path.path == '/api/generate-stream':
+                self.handle_generate_stream(parse_qs(parsed_path.query))
+            elif parsed_path.path == '/api/metrics':
+                self.handle_metrics()
+            elif parsed_path.path == '/api/search':
+                self.handle_search(parse_qs(parsed_path.query))
             else:
                 self.send_error(404, 'Endpoint non trovato')
                 
@@ -74,64 +193,46 @@ class ETFAPIHandler(BaseHTTPRequestHandler):
             # Leggi i dati della richiesta
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            try:
+                data = json.loads(post_data.decode('utf-8'))
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                self.send_json({'success': False, 'error': "Il corpo della richiesta deve essere un oggetto JSON"}, 400)
+                return
             
-            count = data.get('count', 2)
             generation_type = data.get('type', 'manual')
+            if generation_type not in GENERATION_TYPES:
+                self.send_json({'success': False, 'error': f"Tipo non valido: {generation_type}"}, 400)
+                return
+            try:
+                count = max(1, min(MAX_GENERATION_COUNT, int(data.get('count', 2))))
+                # Con un seed il testo è riproducibile: una rigenerazione arriva dalla cache
+                seed = int(data['seed']) if data.get('seed') is not None else None
+            except (TypeError, ValueError):
+                self.send_json({'success': False, 'error': "count e seed devono essere interi"}, 400)
+                return
             
             logger.info(f"Richiesta generazione: {count} articoli, tipo: {generation_type}")
             
-            # Esegui la generazione in background
+            # Esegui la generazione in background sul worker con il modello già caricato
+            worker = self.server.generation_worker
+            job_id = worker.submit(generation_type, count, seed=seed)
+            
             def generate_async():
                 try:
-                    logger.info(f"Avvio generazione {generation_type} di {count} articoli...")
-                    
-                    if generation_type == 'test':
-                        result = subprocess.run(
-                            [sys.executable, 'scheduler.py', 'test'],
-                            capture_output=True,
-                            text=True,
-                            timeout=600  # 10 minuti timeout
-                        )
-                    else:
-                        result = subprocess.run(
-                            [sys.executable, 'scheduler.py', 'manual'],
-                            capture_output=True,
-                            text=True,
-                            timeout=600  # 10 minuti timeout
-                        )
+                    logger.info(f"Avvio generazione {generation_type} di {count} articoli (job {job_id})...")
                     
-                    logger.info(f"Scheduler terminato con codice: {result.returncode}")
-                    if result.stdout:
-                        logger.info(f"Output scheduler: {result.stdout[-500:]}")
-                    if result.stderr:
-                        logger.warning(f"Errori scheduler: {result.stderr[-500:]}")
+                    result = worker.wait(job_id, timeout=600)  # 10 minuti timeout
                     
-                    if result.returncode == 0:
-                        logger.info("Generazione completata con successo, avvio integrazione...")
-                        # Esegui integrazione automatica
-                        integration_result = subprocess.run(
-                            [sys.executable, 'ai_blog_integration.py'],
-                            capture_output=True,
-                            text=True,
-                            timeout=60
-                        )
-                        
-                        logger.info(f"Integrazione terminata con codice: {integration_result.returncode}")
-                        if integration_result.stdout:
-                            logger.info(f"Output integrazione: {integration_result.stdout[-500:]}")
-                        if integration_result.stderr:
-                            logger.warning(f"Errori integrazione: {integration_result.stderr[-500:]}")
-                        
-                        if integration_result.returncode == 0:
-                            logger.info("🎉 Processo completo: generazione e integrazione completate con successo!")
-                        else:
-                            logger.error(f"❌ Errore nell'integrazione: {integration_result.stderr}")
+                    if result is None:
+                        logger.error("⏰ Timeout nella generazione degli articoli")
+                    elif result['success']:
+                        logger.info(f"Generati {len(result['articles'])} articoli in {result['duration']:.1f}s")
+                        logger.info(f"🎉 Processo completo: {result['integrated']} articoli integrati nel blog")
                     else:
-                        logger.error(f"❌ Errore nella generazione: {result.stderr}")
+                        logger.error(f"❌ Errore nella generazione: {result.get('error', 'nessun articolo generato')}")
                         
-                except subprocess.TimeoutExpired:
-                    logger.error("⏰ Timeout nella generazione degli articoli")
                 except Exception as e:
                     logger.error(f"💥 Errore nella generazione asincrona: {e}")
             
@@ -145,19 +246,61 @@ class ETFAPIHandler(BaseHTTPRequestHandler):
                 'success': True,
                 'message': f'Generazione di {count} articoli avviata',
                 'count': count,
+                'job_id': job_id,
                 'timestamp': datetime.now().isoformat()
             }
             
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.send_json(response)
             
         except Exception as e:
             logger.error(f"Errore nella generazione articoli: {e}")
             self.send_error(500, str(e))
     
+    def handle_generate_stream(self, query):
+        """Genera un articolo inviando i token come Server-Sent Events"""
+        title = query.get('title', [None])[0]
+        seed = query.get('seed', [None])[0]
+        seed = int(seed) if seed and seed.lstrip('-').isdigit() else None
+        
+        # Titolo senza lettere o cifre (es. "../") o troppo lungo: rifiutato prima di aprire lo stream
+        if title is not None:
+            title = ' '.join(title.split())
+            if not slugify(title) or len(title) > MAX_TITLE_LENGTH:
+                self.send_json({'success': False, 'error': f"Titolo non valido (max {MAX_TITLE_LENGTH} caratteri, "
+                                                           f"almeno una lettera o cifra)"}, 400)
+                return
+        logger.info(f"Richiesta generazione in streaming: {title or 'titolo casuale'}")
+        
+        # Lo stream non ha lunghezza nota: termina con la chiusura della connessione
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        
+        try:
+            for message in self.server.generation_worker.stream(title, seed=seed):
+                if message['type'] == 'token':
+                    self.send_event('token', {'text': message['text']})
+                else:
+                    self.send_event('done', {
+                        'success': message['success'],
+                        'articles': message.get('articles', []),
+                        'integrated': message.get('integrated', 0),
+                        'duration': message['duration']
+                    })
+        except (BrokenPipeError, ConnectionResetError):
+            # Il client ha chiuso la connessione: la generazione prosegue nel worker
+            logger.info("Client disconnesso durante lo streaming")
+    
+    def send_event(self, event, data):
+        """Scrive un evento SSE e lo invia subito al client"""
+        payload = f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        self.wfile.write(payload.encode('utf-8'))
+        self.wfile.flush()
+    
     def handle_status(self):
         """Restituisce lo status del sistema"""
         try:
@@ -169,64 +312,86 @@ class ETFAPIHandler(BaseHTTPRequestHandler):
                 'blog_data': os.path.exists('js/blog-data.js')
             }
             
-            # Conta gli articoli generati
-            generated_dir = 'generated_articles'
-            generated_count = 0
-            if os.path.exists(generated_dir):
-                generated_count = len([f for f in os.listdir(generated_dir) if f.endswith('.json')])
+            # Contatori dal file materializzato: lettura costante, qualunque sia la dimensione del corpus.
+            # File assente o scritto solo dagli incrementi: generati e corpus si contano qui, una volta
+            stats = BlogStats(stats_path_for('js/blog-data.js'),
+                              seeds={'generated': lambda: count_generated('generated_articles')},
+                              corpus=lambda: read_articles('js/blog-data.js')).complete()
             
             response = {
                 'status': 'online',
                 'timestamp': datetime.now().isoformat(),
                 'files': files_status,
-                'generated_articles': generated_count,
+                'generated_articles': stats.get('generated', 0),
+                'processed_articles': stats.get('processed', 0),
+                'backlog': stats.get('backlog', 0),
+                'published_articles': stats.get('total_articles', 0),
+                'stats_updated': stats.get('last_update'),
+                'worker': {
+                    'alive': self.server.generation_worker.is_alive(),
+                    'model_loaded': self.server.generation_worker.model_loaded
+                },
                 'system_ready': all(files_status.values())
             }
             
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.send_json(response)
             
         except Exception as e:
             logger.error(f"Errore nel controllo status: {e}")
             self.send_error(500, str(e))
     
-    def handle_get_articles(self):
-        """Restituisce la lista degli articoli"""
+    def handle_metrics(self):
+        """Restituisce gli istogrammi di latenza e throughput della generazione"""
+        try:
+            # Le metriche sono scritte dal worker di generazione: si leggono le righe nuove del file
+            metrics = get_metrics()
+            metrics.follow()
+            
+            response = {
+                'timestamp': datetime.now().isoformat(),
+                'metrics_file': metrics.path,
+                **metrics.snapshot()
+            }
+            
+            self.send_json(response)
+            
+        except Exception as e:
+            logger.error(f"Errore nella lettura delle metriche: {e}")
+            self.send_error(500, str(e))
+    
+    def handle_search(self, query):
+        """Cerca negli articoli pubblicati tramite l'indice invertito scritto in integrazione"""
         try:
-            articles = []
+            q = query.get('q', [''])[0]
+            try:
+                limit = max(1, min(100, int(query.get('limit', ['20'])[0])))
+            except ValueError:
+                limit = 20
             
-            # Leggi gli articoli dal blog-data.js se esiste
-            blog_data_path = 'js/blog-data.js'
-            if os.path.exists(blog_data_path):
-                with open(blog_data_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # Estrai il JSON dal file JavaScript (semplificato)
-                    start = content.find('const blogArticles = [')
-                    if start != -1:
-                        start += len('const blogArticles = ')
-                        end = content.find('];', start)
-                        if end != -1:
-                            try:
-                                articles_json = content[start:end+1]
-                                articles = json.loads(articles_json)
-                            except json.JSONDecodeError:
-                                logger.warning("Errore nel parsing del blog-data.js")
+            start = time.perf_counter()
+            index = self.server.search_index.get()
+            results = index.search(q, limit) if index else []
             
             response = {
-                'articles': articles,
-                'count': len(articles),
-                'ai_count': len([a for a in articles if a.get('aiGenerated', False)]),
+                'query': q,
+                'results': results,
+                'count': len(results),
+                'took_ms': round((time.perf_counter() - start) * 1000, 3),
                 'timestamp': datetime.now().isoformat()
             }
             
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.send_json(response)
+            
+        except Exception as e:
+            logger.error(f"Errore nella ricerca: {e}")
+            self.send_error(500, str(e))
+    
+    def handle_get_articles(self):
+        """Restituisce la lista degli articoli"""
+        try:
+            # Parsing e codifica solo quando blog-data.js cambia; le richieste ripetute ricevono una 304
+            _, body, etag = self.server.articles_cache.get()
+            self.send_cached_json(body, etag)
             
         except Exception as e:
             logger.error(f"Errore nel recupero articoli: {e}")
@@ -236,23 +401,70 @@ class ETFAPIHandler(BaseHTTPRequestHandler):
         """Override per logging personalizzato"""
         logger.info(f"{self.address_string()} - {format % args}")
 
-def run_server(port=8001):
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer con un pool limitato di thread: ogni connessione (anche keep-alive) occupa un worker"""
+    
+    # Connessioni in attesa nella coda del kernel quando tutti i worker sono occupati
+    request_queue_size = 128
+    
+    def __init__(self, server_address, handler_class, workers=16):
+        """Server su server_address con al massimo `workers` connessioni servite in parallelo"""
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='etf-http')
+        self.slots = threading.BoundedSemaphore(workers)
+    
+    def process_request(self, request, client_address):
+        """Affida la connessione a un worker; con il pool pieno l'accept attende un worker libero"""
+        self.slots.acquire()
+        self.executor.submit(self.process_request_thread, request, client_address)
+    
+    def process_request_thread(self, request, client_address):
+        """Serve la connessione fino alla sua chiusura (tutte le richieste keep-alive)"""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+    
+    def server_close(self):
+        """Chiude il socket e non attende le connessioni keep-alive ancora aperte"""
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+def run_server(port=8001, workers=16):
     """Avvia il server API"""
     try:
         server_address = ('', port)
-        httpd = HTTPServer(server_address, ETFAPIHandler)
+        httpd = PooledHTTPServer(server_address, ETFAPIHandler, workers)
+        
+        # Il worker carica il modello all'avvio: le richieste pagano solo la generazione
+        httpd.generation_worker = GenerationWorker()
+        httpd.generation_worker.start()
+        
+        # Indice di ricerca dagli shard del blog, ricaricato quando l'integrazione li riscrive
+        httpd.search_index = SearchIndexCache('js/blog-data')
+        
+        # Articoli e risposta di /api/articles in memoria, ricaricati quando l'integrazione riscrive il file
+        httpd.articles_cache = ArticlesCache('js/blog-data.js')
         
-        logger.info(f"🚀 Server API ETF Italia avviato su porta {port}")
+        logger.info(f"🚀 Server API ETF Italia avviato su porta {port} ({workers} worker HTTP, keep-alive)")
         logger.info(f"📡 Endpoints disponibili:")
         logger.info(f"   POST /api/generate-articles - Genera articoli AI")
         logger.info(f"   GET  /api/status - Status del sistema")
-        logger.info(f"   GET  /api/articles - Lista articoli")
+        logger.info(f"   GET  /api/articles - Lista articoli (ETag, 304 se invariata)")
+        logger.info(f"   GET  /api/generate-stream?title= - Genera un articolo in streaming (SSE)")
+        logger.info(f"   GET  /api/metrics - Metriche di generazione (istogrammi)")
+        logger.info(f"   GET  /api/search?q= - Ricerca negli articoli (indice invertito)")
         
         httpd.serve_forever()
         
     except KeyboardInterrupt:
         logger.info("\n🛑 Server fermato dall'utente")
-        httpd.shutdown()
+        httpd.generation_worker.stop()
+        httpd.server_close()
     except Exception as e:
         logger.error(f"Errore nel server: {e}")
 
@@ -261,6 +473,7 @@ if __name__ == '__main__':
     
     parser = argparse.ArgumentParser(description='Server API ETF Italia')
     parser.add_argument('--port', type=int, default=8001, help='Porta del server (default: 8001)')
+    parser.add_argument('--workers', type=int, default=16, help='Connessioni servite in parallelo (default: 16)')
     
     args = parser.parse_args()
     
@@ -268,4 +481,4 @@ if __name__ == '__main__':
     script_dir = os.path.dirname(os.path.abspath(__file__))
     os.chdir(script_dir)
     
-    run_server(args.port)
\ No newline at end of file
+    run_server(args.port, args.workers)
\ No newline at end of file
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generatore di ID Articolo
+ID in stile ULID: ordinati nel tempo, univoci tra thread e processi, senza pause tra le generazioni
+"""
+
+import os
+import re
+import time
+import threading
+import unicodedata
+
+# Alfabeto Crockford base32 (ordinamento ASCII = ordinamento numerico)
+ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+
+RANDOM_BITS = 80
+
+# Lo slug finisce nel nome del file dell'articolo: lunghezza limitata
+MAX_SLUG_LENGTH = 80
+
+_lock = threading.Lock()
+_pid = os.getpid()
+_last_ms = -1
+_last_random = 0
+
+
+def _encode(value: int, length: int) -> str:
+    """Codifica un intero in base32 a lunghezza fissa"""
+    chars = []
+    for _ in range(length):
+        value, index = divmod(value, 32)
+        chars.append(ALPHABET[index])
+    return ''.join(reversed(chars))
+
+
+def new_ulid() -> str:
+    """ULID di 26 caratteri: 48 bit di millisecondi + 80 bit casuali, monotono nel processo"""
+    global _pid, _last_ms, _last_random
+
+    with _lock:
+        # Dopo un fork il figlio riparte con una sequenza casuale propria
+        if os.getpid() != _pid:
+            _pid = os.getpid()
+            _last_ms = -1
+
+        now_ms = int(time.time() * 1000)
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), 'big')
+        else:
+            # Stesso millisecondo (o orologio tornato indietro): incrementa la parte casuale
+            _last_random += 1
+            if _last_random >= 1 << RANDOM_BITS:
+                _last_ms += 1
+                _last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), 'big')
+
+        return _encode(_last_ms, 10) + _encode(_last_random, 16)
+
+
+def slugify(title: str) -> str:
+    """Converte il titolo in slug [a-z0-9-]: accenti rimossi, separatori di percorso e punteggiatura
+    sostituiti da un trattino ("Portafoglio 60/40" -> "portafoglio-60-40")"""
+    slug = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii").lower()
+    slug = re.sub(r"[^a-z0-9]+", "-", slug).strip("-")
+    return slug[:MAX_SLUG_LENGTH].rstrip("-")
+
+
+def new_article_id(title: str = None) -> str:
+    """ID articolo: ULID seguito dallo slug del titolo (ordinabile cronologicamente)"""
+    ulid = new_ulid()
+    slug = slugify(title) if title else ""
+    return f"{ulid}-{slug}" if slug else ulid
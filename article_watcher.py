@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Osservatore della Directory degli Articoli Generati
+inotify tramite ctypes (Linux) con ripiego sul polling degli mtime; i file che arrivano ravvicinati
+vengono raggruppati in un unico lotto
+"""
+
+import os
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+import ctypes
+import ctypes.util
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Costanti da <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_article_file(name: str) -> bool:
+    """File prodotti da ETFArticleGenerator.save_article"""
+    return name.startswith("article_") and name.endswith(".json")
+
+
+class InotifyWatcher:
+    """Eventi del kernel: file chiusi dopo la scrittura o spostati nella directory"""
+
+    def __init__(self, directory: str):
+        """Apre l'istanza inotify; OSError se non disponibile"""
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify non disponibile")
+
+        self.directory = directory
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fallita")
+
+        watch = libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if watch < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch fallita su {directory}")
+
+    def wait(self, timeout: float) -> Optional[List[str]]:
+        """Percorsi degli articoli scritti entro timeout secondi; None se la coda del kernel è traboccata"""
+        readable, _, _ = select.select([self.fd], [], [], max(0, timeout))
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if is_article_file(name):
+                paths.append(os.path.join(self.directory, name))
+        return paths
+
+    def close(self):
+        """Chiude l'istanza inotify"""
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Ripiego portabile: confronta nome e mtime dei file a ogni intervallo"""
+
+    def __init__(self, directory: str, interval: float = 1.0):
+        """Registra lo stato iniziale della directory (i file già presenti non sono novità)"""
+        self.directory = directory
+        self.interval = interval
+        self.mtimes = self.scan()
+
+    def scan(self) -> Dict[str, float]:
+        """mtime di ogni articolo nella directory"""
+        mtimes = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if is_article_file(entry.name):
+                    try:
+                        mtimes[entry.path] = entry.stat().st_mtime_ns
+                    except FileNotFoundError:
+                        continue
+        return mtimes
+
+    def wait(self, timeout: float) -> Optional[List[str]]:
+        """Percorsi nuovi o modificati entro timeout secondi"""
+        time.sleep(max(0, min(timeout, self.interval)))
+        mtimes = self.scan()
+        changed = [path for path, mtime in mtimes.items() if self.mtimes.get(path) != mtime]
+        self.mtimes = mtimes
+        return changed
+
+    def close(self):
+        """Nessuna risorsa da rilasciare"""
+
+
+def open_watcher(directory: str, poll_interval: float = 1.0):
+    """inotify se disponibile, altrimenti polling degli mtime"""
+    try:
+        return InotifyWatcher(directory)
+    except (OSError, AttributeError) as e:
+        logger.info(f"inotify non disponibile ({e}): polling ogni {poll_interval}s")
+        return PollingWatcher(directory, poll_interval)
+
+
+def watch_directory(directory: str, on_batch: Callable[[Optional[List[str]]], None], debounce: float = 2.0,
+                    max_delay: float = 10.0, poll_interval: float = 1.0, stop: threading.Event = None):
+    """Chiama on_batch(percorsi) per ogni lotto: si chiude dopo debounce secondi senza nuovi file
+    o dopo max_delay secondi dal primo. on_batch(None) chiede una scansione completa (eventi persi)"""
+    os.makedirs(directory, exist_ok=True)
+    stop = stop or threading.Event()
+    watcher = open_watcher(directory, poll_interval)
+
+    try:
+        while not stop.is_set():
+            paths = watcher.wait(1.0)
+            if paths == []:
+                continue
+
+            # Primo file del lotto: si attende che la raffica finisca
+            batch = None if paths is None else list(paths)
+            first = last = time.monotonic()
+            while not stop.is_set():
+                now = time.monotonic()
+                remaining = min(last + debounce, first + max_delay) - now
+                if remaining <= 0:
+                    break
+                more = watcher.wait(remaining)
+                if more is None:
+                    batch = None
+                elif more:
+                    last = time.monotonic()
+                    if batch is not None:
+                        batch.extend(more)
+
+            if batch is not None:
+                batch = sorted(set(batch))
+            on_batch(batch)
+    finally:
+        watcher.close()
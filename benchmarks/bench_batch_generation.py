@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark generazione articoli: ciclo sequenziale vs batch
+Misura gli articoli al minuto di generate_daily_articles nelle due modalità
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_article_generator import ETFArticleGenerator
+
+
+def run(generator: ETFArticleGenerator, num_articles: int, batch_size: int) -> float:
+    """Esegue una generazione e restituisce gli articoli al minuto"""
+    start = time.perf_counter()
+    articles = generator.generate_daily_articles(num_articles, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    return len(articles) / elapsed * 60
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark generazione batch')
+    parser.add_argument('--articles', type=int, default=8, help='Articoli per modalità (default: 8)')
+    parser.add_argument('--batch-size', type=int, default=8, help='Dimensione del batch (default: 8)')
+    args = parser.parse_args()
+
+    generator = ETFArticleGenerator()
+    if not generator.load_model():
+        print("❌ Errore nel caricamento del modello")
+        return 1
+
+    # Gli articoli vengono salvati in una directory temporanea
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+
+        # Riscaldamento: la prima chiamata include costi una tantum
+        generator.generate_daily_articles(1, batch_size=1)
+
+        sequential = run(generator, args.articles, 1)
+        batched = run(generator, args.articles, args.batch_size)
+
+    print(f"\n📊 {args.articles} articoli")
+    print(f"   Sequenziale:          {sequential:8.2f} articoli/minuto")
+    print(f"   Batch ({args.batch_size:>3}):          {batched:8.2f} articoli/minuto")
+    print(f"   Speedup:              {batched / sequential:8.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
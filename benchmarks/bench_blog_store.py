@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark scritture concorrenti su blog-data.js
+Confronta la vecchia lettura/riscrittura senza lock con BlogDataStore (lock + group commit)
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blog_store import BlogDataStore, parse_articles_js, render_articles_js
+
+
+def make_article(writer: str, i: int) -> dict:
+    """Articolo sintetico di ~2 KB"""
+    return {"id": f"{writer}-{i}", "title": f"Articolo {i}", "content": "<p>ETF</p>" * 200}
+
+
+def naive_add(path: str, article: dict):
+    """Vecchio percorso: lettura, append e riscrittura con open(..., 'w')"""
+    articles = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                articles = parse_articles_js(f.read())
+            except ValueError:
+                # File letto a metà di una riscrittura
+                articles = []
+    articles.append(article)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_articles_js(articles))
+
+
+def run_writers(mode: str, path: str, threads: int, writes: int, process: int = 0):
+    """`threads` thread che aggiungono `writes` articoli ciascuno"""
+    store = BlogDataStore(path)
+
+    def writer(thread: int):
+        for i in range(writes):
+            article = make_article(f"p{process}t{thread}", i)
+            if mode == "store":
+                store.update(lambda articles: articles.append(article))
+            else:
+                naive_add(path, article)
+
+    workers = [threading.Thread(target=writer, args=(t,)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def measure(mode: str, processes: int, threads: int, writes: int) -> dict:
+    """Scritture al secondo e articoli persi con `processes` processi x `threads` thread"""
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'blog-data.js')
+        context = multiprocessing.get_context('spawn')
+
+        start = time.perf_counter()
+        children = [
+            context.Process(target=run_writers, args=(mode, path, threads, writes, p))
+            for p in range(processes)
+        ]
+        for child in children:
+            child.start()
+        for child in children:
+            child.join()
+        elapsed = time.perf_counter() - start
+
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = len(parse_articles_js(f.read()))
+
+    total = processes * threads * writes
+    return {'writes_per_sec': total / elapsed, 'lost': total - saved, 'total': total}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scritture concorrenti su blog-data.js')
+    parser.add_argument('--processes', type=int, default=2, help='Processi scrittori (default: 2)')
+    parser.add_argument('--threads', type=int, default=8, help='Thread per processo (default: 8)')
+    parser.add_argument('--writes', type=int, default=25, help='Articoli aggiunti per thread (default: 25)')
+    args = parser.parse_args()
+
+    print(f"\n📊 {args.processes} processi x {args.threads} thread x {args.writes} articoli")
+    print(f"   {'Modalità':<10}{'Scritture/s':>13}{'Articoli persi':>17}")
+    for mode in ("naive", "store"):
+        r = measure(mode, args.processes, args.threads, args.writes)
+        print(f"   {mode:<10}{r['writes_per_sec']:>13.0f}{r['lost']:>11}/{r['total']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark analisi del contenuto su articoli grandi
+Confronta i calcoli separati precedenti (regex non compilata, split, content[:200]) con l'analisi in una passata
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_analysis import analyze_content
+
+PARAGRAPH = ("<p>Gli <strong>ETF</strong> replicano l'andamento di un indice con costi contenuti: "
+             "il TER medio degli ETF azionari &egrave; inferiore allo 0,3% annuo.</p>\n")
+
+
+def make_article(size_kb: int) -> str:
+    """Articolo HTML sintetico di circa size_kb KB, con un titolo di sezione ogni 20 paragrafi"""
+    parts = []
+    size = 0
+    section = 0
+    while size < size_kb * 1024:
+        if len(parts) % 21 == 0:
+            section += 1
+            parts.append(f"<h2>Sezione {section}</h2>\n")
+        parts.append(PARAGRAPH)
+        size += len(parts[-1])
+    return "".join(parts)
+
+
+def legacy_fields(content: str) -> dict:
+    """Percorso precedente: solo tempo di lettura ed estratto, senza indice né impronta"""
+    import re as regex
+    text_content = regex.sub(r'<[^>]+>', '', content)
+    word_count = len(text_content.split())
+    return {"readTime": max(1, round(word_count / 200)), "excerpt": content[:200] + "..."}
+
+
+def measure(function, content: str, repeat: int) -> float:
+    """Millisecondi per chiamata (migliore di repeat esecuzioni)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(content)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analisi del contenuto su articoli grandi')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000],
+                        help='Dimensioni degli articoli in KB (default: 10 100 1000 5000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Ripetizioni per misura (default: 5)')
+    args = parser.parse_args()
+
+    print(f"\n📊 Analisi del contenuto (migliore di {args.repeat} esecuzioni)")
+    print(f"   {'KB':>6}{'Precedente ms':>15}{'Una passata ms':>16}{'MB/s':>8}{'Parole':>10}{'Titoli':>8}")
+    for size_kb in args.sizes:
+        content = make_article(size_kb)
+        legacy = measure(legacy_fields, content, args.repeat)
+        single = measure(analyze_content, content, args.repeat)
+        result = analyze_content(content)
+
+        # L'estratto precedente taglia a metà i tag, quello nuovo è solo testo
+        assert '<' in legacy_fields(content)["excerpt"]
+        assert '<' not in result["excerpt"]
+
+        mb_per_sec = len(content.encode('utf-8')) / 1e6 / (single / 1000)
+        print(f"   {size_kb:>6}{legacy:>15.1f}{single:>16.1f}{mb_per_sec:>8.1f}"
+              f"{result['wordCount']:>10}{len(result['outline']):>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
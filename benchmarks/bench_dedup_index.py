@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark indice dei quasi-duplicati
+Misura inserimento e tempo di ricerca al crescere del corpus indicizzato
+"""
+
+import os
+import sys
+import time
+import random
+import string
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_index import DuplicateIndex
+
+
+def random_article(rng: random.Random, words: int) -> str:
+    """Articolo sintetico di parole casuali"""
+    return ' '.join(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(words))
+
+
+def near_copy(text: str, rng: random.Random, changes: int = 3) -> str:
+    """Copia del testo con poche parole sostituite"""
+    words = text.split()
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = 'modificato'
+    return ' '.join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark indice duplicati')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help='Dimensioni del corpus (es. 1000 10000 100000)')
+    parser.add_argument('--words', type=int, default=150, help='Parole per articolo (default: 150)')
+    parser.add_argument('--queries', type=int, default=200, help='Ricerche per misura (default: 200)')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+
+    print(f"\n📊 Articoli da {args.words} parole, {args.queries} ricerche per misura")
+    print(f"   {'Articoli':>9}{'Inserimento (s)':>17}{'Ricerca (ms)':>14}{'Duplicati trovati':>19}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        index = DuplicateIndex(os.path.join(workdir, 'dedup_index.sqlite'))
+        corpus = []
+
+        for size in args.sizes:
+            # Il corpus cresce fino alla dimensione richiesta
+            batch = [(f"article-{i}", random_article(rng, args.words)) for i in range(len(corpus), size)]
+            start = time.perf_counter()
+            index.add_many(batch)
+            insert_time = time.perf_counter() - start
+            corpus.extend(text for _, text in batch)
+
+            # Metà ricerche su quasi-copie, metà su testi nuovi
+            queries = [near_copy(rng.choice(corpus), rng) if i % 2 == 0 else random_article(rng, args.words)
+                       for i in range(args.queries)]
+
+            found = 0
+            start = time.perf_counter()
+            for query in queries:
+                if index.find_duplicate(query):
+                    found += 1
+            query_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+            print(f"   {size:>9}{insert_time:>17.2f}{query_ms:>14.2f}{found:>12}/{len(queries) // 2}")
+
+        index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
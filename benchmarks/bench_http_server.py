@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark di carico del server API in locale
+Confronta il server precedente (HTTPServer a thread singolo, HTTP/1.0, una connessione per richiesta)
+con PooledHTTPServer (pool di worker, keep-alive HTTP/1.1): richieste/s e latenza p50/p99
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import statistics
+import http.client
+from http.server import HTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from blog_store import render_articles_js
+from blog_shards import write_blog_shards
+from content_analysis import analyze_content
+from search_index import SearchIndexCache
+
+PATHS = ["/api/search?q=etf", "/api/search?q=mercati+emer", "/api/articles"]
+
+PARAGRAPH = "<p>Gli ETF azionari sui mercati emergenti replicano l'indice con costi contenuti.</p>"
+
+
+def make_blog(directory: str, count: int):
+    """blog-data.js e shard di ricerca sintetici in directory/js"""
+    articles = []
+    for i in range(count):
+        content = PARAGRAPH * 20
+        articles.append({
+            "id": f"articolo-{i}",
+            "title": f"Guida ETF {i}: mercati emergenti e dividendi",
+            "date": f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "category": "Guide agli Investimenti",
+            "tags": ["ETF Azionari", "Mercati Emergenti"],
+            "content": content,
+            "aiGenerated": i % 2 == 0,
+            **analyze_content(content)
+        })
+
+    os.makedirs(os.path.join(directory, "js"))
+    with open(os.path.join(directory, "js", "blog-data.js"), 'w', encoding='utf-8') as f:
+        f.write(render_articles_js(articles))
+    write_blog_shards(articles, os.path.join(directory, "js", "blog-data"))
+
+
+def start_server(server, articles_cache):
+    """Serve in un thread in background e restituisce la porta"""
+    server.search_index = SearchIndexCache("js/blog-data")
+    server.articles_cache = articles_cache
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+
+def run_load(port: int, clients: int, requests: int, paths, revalidate: bool = False):
+    """clients thread, ognuno con la propria connessione riusata quando il server lo consente;
+    con revalidate i client rimandano l'ETag ricevuto (If-None-Match) come il browser"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client(offset):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        samples = []
+        etags = {}
+        try:
+            for i in range(requests):
+                path = paths[(offset + i) % len(paths)]
+                headers = {"If-None-Match": etags[path]} if revalidate and path in etags else {}
+                start = time.perf_counter()
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                samples.append(time.perf_counter() - start)
+                if response.status not in (200, 304):
+                    errors.append(response.status)
+                if response.getheader("ETag"):
+                    etags[path] = response.getheader("ETag")
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(e)
+        finally:
+            connection.close()
+        with lock:
+            latencies.extend(samples)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0
+    return len(latencies) / elapsed, statistics.median(latencies or [0]) * 1000, p99 * 1000, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark di carico del server API')
+    parser.add_argument('--articles', type=int, default=200, help='Articoli nel blog sintetico (default: 200)')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 8, 32],
+                        help='Client concorrenti (default: 1 8 32)')
+    parser.add_argument('--requests', type=int, default=200, help='Richieste per client (default: 200)')
+    parser.add_argument('--workers', type=int, default=32, help='Worker del server con pool (default: 32)')
+    parser.add_argument('--paths', nargs='+', default=PATHS, help='Endpoint richiesti a rotazione')
+    parser.add_argument('--revalidate', action='store_true', help="Rimanda l'ETag ricevuto (risposte 304)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        make_blog(directory, args.articles)
+        # Il server legge i dati relativi alla directory corrente e vi scrive api_server.log
+        os.chdir(directory)
+        from api_server import ArticlesCache, ETFAPIHandler, PooledHTTPServer
+        logging.getLogger("api_server").setLevel(logging.WARNING)
+
+        class LegacyHandler(ETFAPIHandler):
+            """Handler precedente: HTTP/1.0, la connessione si chiude dopo ogni risposta"""
+            protocol_version = "HTTP/1.0"
+
+        servers = {
+            "HTTPServer HTTP/1.0": HTTPServer(("127.0.0.1", 0), LegacyHandler),
+            f"Pool {args.workers} keep-alive": PooledHTTPServer(("127.0.0.1", 0), ETFAPIHandler, args.workers)
+        }
+
+        print(f"\n📊 {args.articles} articoli, {args.requests} richieste per client su {', '.join(args.paths)}")
+        print(f"   {'Server':<24}{'Client':>8}{'Req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'Errori':>8}")
+        for name, server in servers.items():
+            port = start_server(server, ArticlesCache("js/blog-data.js"))
+            for clients in args.clients:
+                throughput, p50, p99, errors = run_load(port, clients, args.requests, args.paths, args.revalidate)
+                print(f"   {name:<24}{clients:>8}{throughput:>10.0f}{p50:>10.2f}{p99:>10.2f}{errors:>8}")
+            server.shutdown()
+            server.server_close()
+        os.chdir(ROOT)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark tempo di import (python -X importtime)
+Verifica che i moduli di generazione restino sotto il budget di avvio e non importino torch
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Moduli che non devono comparire all'import dei moduli leggeri
+HEAVY_MODULES = ("torch", "transformers")
+
+
+def measure(module: str):
+    """Importa il modulo in un interprete pulito e restituisce (microsecondi, moduli importati)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import di {module} fallito: {result.stderr.strip().splitlines()[-1]}")
+
+    # Formato: "import time:  self [us] | cumulative | imported package"
+    cumulative = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        imported.add(name.split('.')[0])
+        if name == module:
+            cumulative = int(cumulative_us)
+    return cumulative, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tempo di import')
+    parser.add_argument('--budget-ms', type=float, default=150.0, help='Budget di import in ms (default: 150)')
+    parser.add_argument('modules', nargs='*', default=['ai_article_generator'], help='Moduli da misurare')
+    args = parser.parse_args()
+
+    failures = 0
+    for module in args.modules:
+        cumulative_us, imported = measure(module)
+        heavy = sorted(imported.intersection(HEAVY_MODULES))
+        elapsed_ms = cumulative_us / 1000
+        ok = elapsed_ms <= args.budget_ms and not heavy
+
+        print(f"{'✅' if ok else '❌'} {module}: {elapsed_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        if heavy:
+            print(f"   Importati moduli pesanti: {', '.join(heavy)}")
+        if not ok:
+            failures += 1
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark ingestione nel corpus del blog
+Confronta verifica any() + ordinamento completo con indice degli ID + merge lineare
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import datetime
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def make_articles(count: int, start: datetime.datetime, rng: random.Random, prefix: str) -> list:
+    """Articoli sintetici con date casuali nei 5 anni precedenti a start"""
+    articles = []
+    for i in range(count):
+        date = start - datetime.timedelta(seconds=rng.randrange(5 * 365 * 24 * 3600))
+        articles.append({"id": f"{prefix}-{i}", "title": f"Articolo {i}", "date": date.isoformat()})
+    return articles
+
+
+def ingest_baseline(existing: list, new: list) -> list:
+    """Vecchia logica: any() per ogni nuovo articolo e ordinamento dell'intero corpus"""
+    articles = list(existing)
+    for article in new:
+        if any(art['id'] == article['id'] for art in articles):
+            continue
+        articles.append(article)
+    articles.sort(key=lambda x: x['date'], reverse=True)
+    return articles
+
+
+def ingest_merge(integration, existing: list, new: list) -> list:
+    """Nuova logica: indice degli ID e merge lineare (come process_new_articles)"""
+    existing_ids = {art['id'] for art in existing}
+    accepted = []
+    for article in new:
+        if article['id'] in existing_ids:
+            continue
+        existing_ids.add(article['id'])
+        accepted.append(article)
+    return integration.merge_articles(existing, accepted)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ingestione articoli')
+    parser.add_argument('--existing', type=int, default=100000, help='Articoli già pubblicati (default: 100000)')
+    parser.add_argument('--new', type=int, default=1000, help='Nuovi articoli (default: 1000)')
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    now = datetime.datetime.now()
+    existing = make_articles(args.existing, now, rng, "existing")
+    existing.sort(key=lambda x: x['date'], reverse=True)
+    # Qualche nuovo articolo riprende un ID già pubblicato
+    new = make_articles(args.new, now + datetime.timedelta(days=1), rng, "new")
+    for article in rng.sample(new, max(1, args.new // 100)):
+        article['id'] = rng.choice(existing)['id']
+
+    # L'integrazione crea le sue directory di lavoro: si usa una cartella temporanea
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            from ai_blog_integration import AIBlogIntegration
+            integration = AIBlogIntegration()
+
+            start = time.perf_counter()
+            baseline = ingest_baseline(existing, new)
+            baseline_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            merged = ingest_merge(integration, existing, new)
+            merge_time = time.perf_counter() - start
+
+            integration.dedup_index.close()
+        finally:
+            os.chdir(cwd)
+
+    same = [a['id'] for a in baseline] == [a['id'] for a in merged]
+
+    print(f"\n📊 {args.existing} articoli esistenti + {args.new} nuovi")
+    print(f"   any() + sort completo: {baseline_time * 1000:>10.1f} ms")
+    print(f"   indice ID + merge:     {merge_time * 1000:>10.1f} ms")
+    print(f"   Speedup: {baseline_time / merge_time:.1f}x, stesso risultato: {'sì' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
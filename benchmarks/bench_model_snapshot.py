@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark snapshot mappato in memoria vs from_pretrained
+Misura tempo di caricamento e RSS privata per processo con più generatori attivi sullo stesso host
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ("pretrained", "snapshot")
+
+
+def memory_mb(pid: int) -> dict:
+    """RSS, quota privata e quota condivisa del processo (da /proc/<pid>/smaps_rollup)"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {
+        'rss': values.get('Rss', 0),
+        'private': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0),
+        'shared': values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0)
+    }
+
+
+def run_child(mode: str, model_dir: str):
+    """Carica il modello, esegue un forward e resta attivo finché il genitore non chiude stdin"""
+    import torch
+
+    start = time.perf_counter()
+    if mode == "snapshot":
+        from model_snapshot import load_snapshot
+        model, _ = load_snapshot(model_dir)
+    else:
+        from transformers import GPT2LMHeadModel
+        model = GPT2LMHeadModel.from_pretrained(os.path.join(model_dir, "pretrained"))
+        model.eval()
+    load_time = time.perf_counter() - start
+
+    # Un forward tocca tutti i pesi: le pagine mappate diventano residenti
+    with torch.no_grad():
+        model(torch.zeros((1, 16), dtype=torch.long))
+
+    print(json.dumps({'load_time': load_time}), flush=True)
+    sys.stdin.read()
+
+
+def measure(mode: str, model_dir: str, processes: int) -> dict:
+    """Avvia `processes` generatori insieme e misura la memoria quando sono tutti carichi"""
+    children = [
+        subprocess.Popen(
+            [sys.executable, __file__, '--child', mode, '--model-dir', model_dir],
+            cwd=ROOT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        for _ in range(processes)
+    ]
+
+    load_times = [json.loads(child.stdout.readline())['load_time'] for child in children]
+    memory = [memory_mb(child.pid) for child in children]
+
+    for child in children:
+        child.stdin.close()
+        child.wait()
+
+    return {
+        'load_time': sum(load_times) / processes,
+        'rss': sum(m['rss'] for m in memory) / processes,
+        'private': sum(m['private'] for m in memory) / processes,
+        'shared': sum(m['shared'] for m in memory) / processes
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark snapshot del modello')
+    parser.add_argument('--processes', type=int, default=4, help='Generatori attivi insieme (default: 4)')
+    parser.add_argument('--layers', type=int, default=12, help='Layer del GPT-2 casuale (default: 12, come gpt2)')
+    parser.add_argument('--hidden-size', type=int, default=768, help='Dimensione nascosta (default: 768)')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--model-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.model_dir)
+        return 0
+
+    import torch
+    from transformers import GPT2Config, GPT2LMHeadModel
+    from model_snapshot import create_snapshot
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        # GPT-2 inizializzato a caso (nessun download): stessi pesi nei due formati
+        torch.manual_seed(0)
+        model = GPT2LMHeadModel(GPT2Config(n_layer=args.layers, n_embd=args.hidden_size))
+        model.save_pretrained(os.path.join(model_dir, "pretrained"))
+        create_snapshot(model, None, model_dir)
+        del model
+
+        results = {mode: measure(mode, model_dir, args.processes) for mode in MODES}
+
+    print(f"\n📊 GPT-2 casuale ({args.layers} layer, {args.hidden_size} dim), {args.processes} processi attivi")
+    print(f"   {'Formato':<12}{'Caricamento (s)':>18}{'RSS (MB)':>11}{'Privata (MB)':>15}{'Condivisa (MB)':>17}")
+    for mode, r in results.items():
+        print(f"   {mode:<12}{r['load_time']:>18.2f}{r['rss']:>11.0f}{r['private']:>15.0f}{r['shared']:>17.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark PyTorch vs ONNX Runtime
+Confronta latenza, throughput e memoria di picco su un GPT-2 piccolo inizializzato a caso (nessun download)
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ENGINES = ("pipeline", "onnx")
+
+
+def small_config(args):
+    """Configurazione GPT-2 ridotta per il benchmark"""
+    from transformers import GPT2Config
+    return GPT2Config(
+        vocab_size=args.vocab_size,
+        n_positions=512,
+        n_embd=args.hidden_size,
+        n_layer=args.layers,
+        n_head=args.heads,
+        bos_token_id=0,
+        eos_token_id=0
+    )
+
+
+def build_prompts(args):
+    """Prompt di token casuali, identici per entrambi i motori"""
+    import torch
+    generator = torch.Generator().manual_seed(42)
+    return [
+        torch.randint(0, args.vocab_size, (1, args.prompt_tokens), generator=generator)
+        for _ in range(args.prompts)
+    ]
+
+
+def load_engine(engine: str, model_dir: str):
+    """Carica il modello: PyTorch (quello della pipeline text-generation) o la sessione ONNX Runtime"""
+    if engine == "onnx":
+        from onnx_engine import OnnxGPT2LM
+        return OnnxGPT2LM(model_dir)
+
+    from transformers import GPT2LMHeadModel
+    model = GPT2LMHeadModel.from_pretrained(model_dir)
+    model.eval()
+    return model
+
+
+def run_child(engine: str, model_dir: str, args):
+    """Misura un singolo motore (in un processo dedicato, per la memoria di picco)"""
+    import torch
+
+    start = time.perf_counter()
+    model = load_engine(engine, model_dir)
+    load_time = time.perf_counter() - start
+
+    latencies = []
+    tokens = 0
+    for input_ids in build_prompts(args):
+        start = time.perf_counter()
+        with torch.no_grad():
+            # Decodifica greedy a lunghezza fissa: stesso lavoro per entrambi i motori
+            outputs = model.generate(
+                input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                max_new_tokens=args.new_tokens,
+                min_new_tokens=args.new_tokens,
+                do_sample=False,
+                pad_token_id=0
+            )
+        latencies.append(time.perf_counter() - start)
+        tokens += outputs.shape[1] - input_ids.shape[1]
+
+    latencies.sort()
+
+    # ru_maxrss è in KB su Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(json.dumps({
+        'engine': engine,
+        'load_time': load_time,
+        'latency_ms': latencies[len(latencies) // 2] * 1000,
+        'tokens_per_sec': tokens / sum(latencies),
+        'peak_mb': peak_mb
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PyTorch vs ONNX Runtime')
+    parser.add_argument('--prompts', type=int, default=10, help='Numero di prompt (default: 10)')
+    parser.add_argument('--prompt-tokens', type=int, default=32, help='Token per prompt (default: 32)')
+    parser.add_argument('--new-tokens', type=int, default=64, help='Token generati per prompt (default: 64)')
+    parser.add_argument('--layers', type=int, default=4, help='Layer del modello (default: 4)')
+    parser.add_argument('--hidden-size', type=int, default=256, help='Dimensione nascosta (default: 256)')
+    parser.add_argument('--heads', type=int, default=4, help='Teste di attenzione (default: 4)')
+    parser.add_argument('--vocab-size', type=int, default=8000, help='Vocabolario (default: 8000)')
+    parser.add_argument('--child', choices=ENGINES, help=argparse.SUPPRESS)
+    parser.add_argument('--model-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.model_dir, args)
+        return 0
+
+    import torch
+    from transformers import GPT2LMHeadModel
+    from onnx_engine import export_gpt2_onnx
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        # Stessi pesi casuali per entrambi i motori: checkpoint PyTorch e modello ONNX nella stessa cartella
+        torch.manual_seed(0)
+        model = GPT2LMHeadModel(small_config(args))
+        model.save_pretrained(model_dir)
+
+        start = time.perf_counter()
+        export_gpt2_onnx(model, model_dir)
+        export_time = time.perf_counter() - start
+        del model
+
+        results = []
+        for engine in ENGINES:
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', engine, '--model-dir', model_dir] + sys.argv[1:],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    print(f"\n📊 GPT-2 casuale ({args.layers} layer, {args.hidden_size} dim): "
+          f"{args.prompts} prompt x {args.new_tokens} token (export ONNX: {export_time:.1f}s)")
+    print(f"   {'Motore':<10}{'Caricamento (s)':>18}{'Latenza p50 (ms)':>19}{'Token/s':>10}{'Picco RSS (MB)':>18}")
+    for r in results:
+        print(f"   {r['engine']:<10}{r['load_time']:>18.2f}{r['latency_ms']:>19.1f}"
+              f"{r['tokens_per_sec']:>10.1f}{r['peak_mb']:>18.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark scalabilità del pool di processi
+Misura gli articoli al minuto con 1..K processi di generazione
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_article_generator import ETFArticleGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pool di processi')
+    parser.add_argument('--articles', type=int, default=16, help='Articoli per misura (default: 16)')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help='Numero massimo di processi')
+    parser.add_argument('--engine', default=None, help='Motore di generazione (default: ETF_GENERATOR_ENGINE)')
+    args = parser.parse_args()
+
+    results = []
+
+    # Gli articoli vengono salvati in una directory temporanea
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+
+        for workers in range(1, args.max_workers + 1):
+            generator = ETFArticleGenerator(engine=args.engine, workers=workers)
+
+            # Anche con un processo si usa il pool, per una curva omogenea
+            # Riscaldamento: avvio dei processi e caricamento del modello esclusi dalla misura
+            start = time.perf_counter()
+            generator.generate_daily_articles_parallel(workers, workers, 1)
+            startup = time.perf_counter() - start
+
+            start = time.perf_counter()
+            articles = generator.generate_daily_articles_parallel(args.articles, workers, 1)
+            elapsed = time.perf_counter() - start
+            generator.close_pool()
+
+            results.append((workers, startup, len(articles) / elapsed * 60))
+
+    baseline = results[0][2]
+    print(f"\n📊 {args.articles} articoli per misura")
+    print(f"   {'Processi':<10}{'Avvio (s)':>12}{'Articoli/min':>15}{'Speedup':>10}")
+    for workers, startup, rate in results:
+        print(f"   {workers:<10}{startup:>12.2f}{rate:>15.2f}{rate / baseline:>9.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
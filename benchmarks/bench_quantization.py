@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark motori fp32 vs int8
+Confronta tempo di caricamento, token/secondo e memoria di picco sugli stessi prompt
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ENGINES = {"fp32": "pipeline", "int8": "int8"}
+
+
+def build_prompts(generator, count: int):
+    """Costruisce prompt identici per tutti i motori"""
+    random.seed(42)
+    return [generator.create_article_prompt(generator.generate_article_title()) for _ in range(count)]
+
+
+def run_child(engine: str, prompts: int, new_tokens: int):
+    """Misura un singolo motore (in un processo dedicato, per la memoria di picco)"""
+    import torch
+    from ai_article_generator import ETFArticleGenerator
+
+    generator = ETFArticleGenerator(engine=ENGINES[engine])
+
+    start = time.perf_counter()
+    if not generator.load_model():
+        raise RuntimeError(f"Caricamento del motore {engine} fallito")
+    load_time = time.perf_counter() - start
+
+    model = generator.generator.model
+    tokenizer = generator.generator.tokenizer
+
+    tokens = 0
+    start = time.perf_counter()
+    for prompt in build_prompts(generator, prompts):
+        inputs = tokenizer(prompt, return_tensors='pt')
+        with torch.no_grad():
+            # Decodifica greedy a lunghezza fissa: stesso lavoro per entrambi i motori
+            outputs = model.generate(
+                **inputs,
+                max_new_tokens=new_tokens,
+                min_new_tokens=new_tokens,
+                do_sample=False,
+                pad_token_id=tokenizer.eos_token_id
+            )
+        tokens += outputs.shape[1] - inputs['input_ids'].shape[1]
+    generation_time = time.perf_counter() - start
+
+    # ru_maxrss è in KB su Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(json.dumps({
+        'engine': engine,
+        'load_time': load_time,
+        'tokens_per_sec': tokens / generation_time,
+        'peak_mb': peak_mb
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fp32 vs int8')
+    parser.add_argument('--prompts', type=int, default=5, help='Numero di prompt (default: 5)')
+    parser.add_argument('--new-tokens', type=int, default=64, help='Token generati per prompt (default: 64)')
+    parser.add_argument('--child', choices=list(ENGINES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.prompts, args.new_tokens)
+        return 0
+
+    results = []
+    for engine in ENGINES:
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', engine,
+             '--prompts', str(args.prompts), '--new-tokens', str(args.new_tokens)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    print(f"\n📊 {args.prompts} prompt x {args.new_tokens} token")
+    print(f"   {'Motore':<8}{'Caricamento (s)':>18}{'Token/s':>12}{'Picco RSS (MB)':>18}")
+    for r in results:
+        print(f"   {r['engine']:<8}{r['load_time']:>18.2f}{r['tokens_per_sec']:>12.1f}{r['peak_mb']:>18.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark indice di ricerca
+Costruzione, dimensione degli shard e latenza delle query su un corpus sintetico, confrontata con il filtro
+lineare sull'array completo degli articoli (come nel browser)
+"""
+
+import os
+import sys
+import json
+import time
+import bisect
+import random
+import itertools
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex, build_postings, build_search_shards, terms, fold
+
+TITLE_WORDS = ["ETF", "azionari", "obbligazionari", "guida", "migliori", "mercati", "emergenti", "dividendi",
+               "strategia", "portafoglio", "investimenti", "tassi", "inflazione", "oro", "Europa", "America",
+               "tecnologia", "sostenibili", "costi", "confronto", "analisi", "previsioni", "rendimento", "rischio"]
+TAGS = ["ETF Azionari", "ETF Obbligazionari", "ETF ESG", "ETF Tematici", "Dividendi", "Mercati Emergenti"]
+CATEGORIES = ["Analisi di Mercato", "Guide agli Investimenti", "Confronti ETF", "Trend e Previsioni",
+              "Strategie di Investimento", "ETF News"]
+
+QUERIES = ["etf", "obbligazionari", "mercati emergenti", "guida etf azionari", "inv", "tecnologia sost",
+           "dividendi oro", "parola inesistente"]
+
+
+def make_corpus(count: int, vocabulary: int, seed: int = 7):
+    """Articoli sintetici con titolo, tag, categoria e parole chiave da un vocabolario con distribuzione di Zipf"""
+    rng = random.Random(seed)
+    words = [f"{rng.choice(TITLE_WORDS).lower()}{i}" for i in range(vocabulary)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary)))
+    total = cum_weights[-1]
+
+    articles = []
+    for i in range(count):
+        title = " ".join(rng.sample(TITLE_WORDS, 5))
+        body = [words[bisect.bisect(cum_weights, rng.random() * total)] for _ in range(40)]
+        articles.append({
+            "id": f"articolo-{i}",
+            "title": title,
+            "tags": rng.sample(TAGS, 2),
+            "category": rng.choice(CATEGORIES),
+            "keywords": list(dict.fromkeys(terms(" ".join(body))))[:32]
+        })
+    return articles
+
+
+def linear_search(articles, query: str, limit: int = 20):
+    """Filtro nel browser: ogni parola deve comparire in titolo, tag, categoria o parole chiave"""
+    words = fold(query).split()
+    results = []
+    for article in articles:
+        text = fold(" ".join([article["title"], article["category"], *article["tags"], *article["keywords"]]))
+        if all(word in text for word in words):
+            results.append(article)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def time_queries(search, repeat: int):
+    """Millisecondi per query: mediana e massimo su repeat esecuzioni"""
+    timings = {}
+    for query in QUERIES:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            search(query)
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[query] = (statistics.median(samples), max(samples))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark indice di ricerca')
+    parser.add_argument('--articles', type=int, default=100000, help='Articoli nel corpus (default: 100000)')
+    parser.add_argument('--vocabulary', type=int, default=50000, help='Parole distinte nei testi (default: 50000)')
+    parser.add_argument('--repeat', type=int, default=20, help='Ripetizioni per query (default: 20)')
+    args = parser.parse_args()
+
+    articles = make_corpus(args.articles, args.vocabulary)
+
+    start = time.perf_counter()
+    postings = build_postings(articles)
+    build_seconds = time.perf_counter() - start
+
+    shards = build_search_shards(articles)
+    sizes = [len(json.dumps(shard, separators=(',', ':'))) for shard in shards.values()]
+
+    index = SearchIndex(articles, postings)
+    # Prima query di ogni termine: costruisce la cache doc -> punteggio
+    for query in QUERIES:
+        index.search(query)
+
+    print(f"\n📊 {args.articles} articoli, {len(postings)} termini")
+    print(f"   Costruzione indice: {build_seconds:.2f}s")
+    print(f"   Shard: {len(sizes)}, totale {sum(sizes) / 1e6:.1f} MB, il più grande {max(sizes) / 1e6:.2f} MB")
+
+    indexed = time_queries(lambda q: index.search(q), args.repeat)
+    linear = time_queries(lambda q: linear_search(articles, q), max(1, args.repeat // 10))
+
+    print(f"\n   {'Query':<22}{'Indice ms':>11}{'(max)':>9}{'Lineare ms':>13}{'Risultati':>11}")
+    for query in QUERIES:
+        median, worst = indexed[query]
+        print(f"   {query:<22}{median:>11.3f}{worst:>9.3f}{linear[query][0]:>13.1f}{len(index.search(query)):>11}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark tassonomia Aho-Corasick
+Misura il tempo di tagging di un corpus sintetico al crescere della tassonomia
+"""
+
+import os
+import sys
+import time
+import random
+import string
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etf_taxonomy import ETFTaxonomy, TAG_TERMS, CATEGORY_TERMS
+
+
+def random_word(rng: random.Random, min_length: int = 3) -> str:
+    """Parola casuale di min_length-10 lettere"""
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(min_length, 10)))
+
+
+def build_taxonomy(size: int, rng: random.Random) -> ETFTaxonomy:
+    """Tassonomia base estesa con termini sintetici fino a `size` termini"""
+    tag_terms = {tag: list(terms) for tag, terms in TAG_TERMS.items()}
+    tags = list(tag_terms)
+    for i in range(size):
+        # Metà termini singoli, metà composti da due parole (come "msci world")
+        term = random_word(rng, 6) if i % 2 else f"{random_word(rng, 6)} {random_word(rng, 6)}"
+        tag_terms[tags[i % len(tags)]].append(term)
+    return ETFTaxonomy(tag_terms, CATEGORY_TERMS)
+
+
+def build_corpus(articles: int, words: int, vocabulary: list, rng: random.Random) -> list:
+    """Articoli HTML sintetici con parole casuali e termini della tassonomia"""
+    corpus = []
+    for _ in range(articles):
+        body = ' '.join(rng.choice(vocabulary) if rng.random() < 0.05 else random_word(rng) for _ in range(words))
+        corpus.append(f"<p>{body}</p>")
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tassonomia')
+    parser.add_argument('--articles', type=int, default=1000, help='Articoli nel corpus (default: 1000)')
+    parser.add_argument('--words', type=int, default=600, help='Parole per articolo (default: 600)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000],
+                        help='Dimensioni della tassonomia da misurare')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = [term for terms in TAG_TERMS.values() for term in terms]
+    corpus = build_corpus(args.articles, args.words, vocabulary, rng)
+    corpus_mb = sum(len(text) for text in corpus) / 1e6
+
+    print(f"\n📊 Corpus: {args.articles} articoli, {corpus_mb:.1f} MB")
+    print(f"   {'Termini':>9}{'Compilazione (s)':>19}{'Tagging (s)':>14}{'MB/s':>9}")
+
+    for size in args.sizes:
+        start = time.perf_counter()
+        taxonomy = build_taxonomy(size, rng)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in corpus:
+            taxonomy.tags("", text)
+            taxonomy.category("", text)
+        tagging_time = time.perf_counter() - start
+
+        print(f"   {size:>9}{build_time:>19.2f}{tagging_time:>14.2f}{corpus_mb / tagging_time:>9.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shard dei Dati del Blog
+Indice leggero, contenuti per mese, liste per categoria e indice di ricerca in file JSON con hash nel nome,
+più un manifest
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import datetime
+from typing import List, Dict, Any, Tuple
+
+from blog_store import file_lock, parse_articles_js
+from search_index import STOPWORDS, SEARCH_KEY_LENGTH, build_search_shards
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+# Campi dell'indice: quanto serve a elenchi e schede, senza il corpo degli articoli
+INDEX_FIELDS = ("id", "title", "excerpt", "date", "category", "tags", "author", "image",
+                "readTime", "wordCount", "featured", "published", "aiGenerated")
+
+# Corpora mostrati dal blog: blog-data.js (editor di api/storage.py e api/blog-data.py) e js/blog-data.js
+# (integrazione AI). A parità di ID vince il primo
+BLOG_SOURCES = ("blog-data.js", "js/blog-data.js")
+
+SHARD_PATTERN = re.compile(r'^(index|content-[\w-]+|category-[\w-]+|search-[\w-]+)\.[0-9a-f]{12}\.json$')
+
+
+def article_month(article: Dict[str, Any]) -> str:
+    """Mese di pubblicazione (YYYY-MM) usato per lo shard dei contenuti"""
+    date = article.get("date") or ""
+    return date[:7] if re.match(r'^\d{4}-\d{2}', date) else "undated"
+
+
+def category_slug(category: str) -> str:
+    """Slug ASCII della categoria per il nome dello shard"""
+    slug = re.sub(r'[^a-z0-9]+', '-', (category or "senza-categoria").lower()).strip('-')
+    return slug or "senza-categoria"
+
+
+def serialize(data) -> bytes:
+    """JSON compatto e deterministico: stesso contenuto, stesso hash"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_shard(directory: str, name: str, data) -> Tuple[str, bool]:
+    """Scrive <name>.<hash>.json se non esiste già; restituisce (nome file, scritto)"""
+    payload = serialize(data)
+    filename = f"{name}.{hashlib.sha256(payload).hexdigest()[:12]}.json"
+    path = os.path.join(directory, filename)
+
+    # Il nome contiene l'hash del contenuto: se il file c'è, è già aggiornato
+    if os.path.exists(path):
+        return filename, False
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return filename, True
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    """Manifest attuale degli shard (vuoto se non esiste o non è leggibile)"""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def manifest_files(manifest: Dict[str, Any]) -> set:
+    """Nomi degli shard referenziati dal manifest"""
+    files = {manifest.get("index"), *manifest.get("months", {}).values(),
+             *(c["file"] for c in manifest.get("categories", {}).values()),
+             *(manifest.get("search") or {}).get("shards", {}).values()}
+    files.discard(None)
+    return files
+
+
+def write_blog_shards(articles: List[Dict[str, Any]], directory: str = "js/blog-data") -> Dict[str, Any]:
+    """Scrive gli shard degli articoli (già ordinati per data) e il manifest; restituisce il manifest"""
+    os.makedirs(directory, exist_ok=True)
+
+    index = []
+    months = {}
+    categories = {}
+    for article in articles:
+        month = article_month(article)
+        entry = {field: article[field] for field in INDEX_FIELDS if field in article}
+        entry["month"] = month
+        index.append(entry)
+        months.setdefault(month, []).append(article)
+        categories.setdefault(article.get("category") or "Senza Categoria", []).append(article["id"])
+
+    written = 0
+    manifest = {
+        "updated": datetime.datetime.now().isoformat(),
+        "count": len(articles),
+        "index": None,
+        "months": {},
+        "categories": {},
+        # Parametri per normalizzare le query nel browser come in search_index.py
+        "search": {"keyLength": SEARCH_KEY_LENGTH, "stopwords": sorted(STOPWORDS), "shards": {}}
+    }
+
+    manifest["index"], changed = write_shard(directory, "index", index)
+    written += changed
+
+    for month, month_articles in months.items():
+        manifest["months"][month], changed = write_shard(directory, f"content-{month}", month_articles)
+        written += changed
+
+    for category, ids in categories.items():
+        filename, changed = write_shard(directory, f"category-{category_slug(category)}", ids)
+        manifest["categories"][category] = {"file": filename, "count": len(ids)}
+        written += changed
+
+    # Indice invertito, uno shard per iniziale dei termini (la doc di ogni postings è la posizione nell'indice)
+    for key, postings in build_search_shards(articles).items():
+        manifest["search"]["shards"][key], changed = write_shard(directory, f"search-{key}", postings)
+        written += changed
+
+    # Shard della generazione precedente: pagine e processi che hanno letto il vecchio manifest li usano ancora
+    previous = manifest_files(read_manifest(directory))
+
+    # Il manifest si sostituisce per ultimo: i client vedono sempre un insieme di shard completo
+    tmp_path = os.path.join(directory, MANIFEST_FILE + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(serialize(manifest))
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_FILE))
+
+    # Rimuove solo gli shard che non erano referenziati già dal manifest precedente
+    referenced = manifest_files(manifest)
+    removed = 0
+    for filename in os.listdir(directory):
+        if SHARD_PATTERN.match(filename) and filename not in referenced and filename not in previous:
+            os.remove(os.path.join(directory, filename))
+            removed += 1
+
+    logger.info(f"Shard del blog: {written} scritti, {len(referenced) - written} invariati, {removed} rimossi")
+    return manifest
+
+
+def read_source(path: str) -> List[Dict[str, Any]]:
+    """Articoli di un file blog-data.js; file assente o illeggibile: nessun articolo"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return parse_articles_js(f.read())
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        logger.error(f"Corpus {path} non leggibile, escluso dagli shard: {e}")
+        return []
+
+
+def merge_sources(corpora: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Unisce i corpora senza ID ripetuti, più recenti prima"""
+    seen = set()
+    merged = []
+    for articles in corpora:
+        for article in articles:
+            if article.get("id") not in seen:
+                seen.add(article.get("id"))
+                merged.append(article)
+    merged.sort(key=lambda article: article.get("date") or "", reverse=True)
+    return merged
+
+
+def publish_blog_shards(root: str = ".", override: Tuple[str, List[Dict[str, Any]]] = None,
+                        directory: str = None) -> Dict[str, Any]:
+    """Riscrive gli shard da tutti i corpora di BLOG_SOURCES sotto root.
+    override: (percorso, articoli) del file appena aggiornato, usato al posto della sua rilettura"""
+    directory = directory or os.path.join(root, "js", "blog-data")
+    override_path = os.path.abspath(override[0]) if override else None
+
+    os.makedirs(directory, exist_ok=True)
+    # Chiamata sotto il lock del file dati: il lock degli shard si prende sempre per ultimo
+    with file_lock(directory + ".lock"):
+        corpora = []
+        for source in BLOG_SOURCES:
+            path = os.path.join(root, source)
+            corpora.append(override[1] if os.path.abspath(path) == override_path else read_source(path))
+        return write_blog_shards(merge_sources(corpora), directory)
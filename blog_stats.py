@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Statistiche Materializzate del Blog
+Contatori (totali, per categoria, per giorno, AI/manuali, backlog generati/processati) in un piccolo file
+JSON aggiornato nella stessa scrittura dei dati: statistiche e status si leggono in O(1)
+"""
+
+import os
+import json
+import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from blog_store import atomic_write, file_lock
+
+STATS_FILE = "blog-stats.json"
+
+
+def stats_path_for(blog_data_path: str) -> str:
+    """File delle statistiche accanto al file dei dati"""
+    return os.path.join(os.path.dirname(blog_data_path), STATS_FILE)
+
+
+def count_generated(directory: str) -> int:
+    """File degli articoli generati presenti nella directory (0 se non esiste)"""
+    if not os.path.isdir(directory):
+        return 0
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if entry.name.startswith("article_") and entry.name.endswith(".json"))
+
+
+def count_articles(articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Contatori del corpus: totali, AI/manuali, per categoria e per giorno di pubblicazione"""
+    stats = {
+        "total_articles": len(articles),
+        "ai_generated": 0,
+        "human_written": 0,
+        "categories": {},
+        "days": {}
+    }
+
+    for article in articles:
+        ai = bool(article.get('aiGenerated', False))
+        stats["ai_generated" if ai else "human_written"] += 1
+
+        category = stats["categories"].setdefault(article.get('category') or 'Senza Categoria', {'total': 0, 'ai': 0})
+        day = stats["days"].setdefault((article.get('date') or '')[:10] or 'undated', {'total': 0, 'ai': 0})
+        for counter in (category, day):
+            counter['total'] += 1
+            counter['ai'] += ai
+
+    return stats
+
+
+class BlogStats:
+    """File delle statistiche: letto senza lock (rename atomico), modificato sotto il proprio lock"""
+
+    def __init__(self, path: str, counters: Callable[[], Dict[str, int]] = None,
+                 seeds: Dict[str, Callable[[], int]] = None,
+                 corpus: Callable[[], List[Dict[str, Any]]] = None):
+        """Statistiche sul file path; counters() fornisce contatori esterni al corpus (es. processati),
+        seeds[campo]() il valore iniziale di un contatore incrementale assente dal file (es. generati),
+        corpus() gli articoli da contare se il file non ha ancora i contatori del corpus"""
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.counters = counters
+        self.seeds = seeds or {}
+        self.corpus = corpus
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Statistiche salvate, None se il file non esiste ancora"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Il backlog deriva da due contatori mantenuti da processi diversi
+        if "generated" in stats and "processed" in stats:
+            stats["backlog"] = max(0, stats["generated"] - stats["processed"])
+        return stats
+
+    def update(self, mutation: Callable[[Dict[str, Any]], Any]) -> Dict[str, Any]:
+        """Applica mutation(statistiche) sotto lock e riscrive il file atomicamente"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with file_lock(self.lock_path):
+            stats = self.read() or {}
+            stats.pop("backlog", None)
+            mutation(stats)
+            # Contatori incrementali creati alla prima scrittura, sotto lo stesso lock degli incrementi
+            for field, seed in self.seeds.items():
+                if field not in stats:
+                    stats[field] = seed()
+            # File creato da un incremento, prima di qualunque commit dei dati: il corpus si conta una volta
+            if self.corpus and "total_articles" not in stats:
+                stats.update(count_articles(self.corpus()))
+            if self.counters:
+                stats.update(self.counters())
+            stats["last_update"] = datetime.datetime.now().isoformat()
+            atomic_write(self.path, json.dumps(stats, ensure_ascii=False, separators=(',', ':')))
+        return stats
+
+    def complete(self) -> Dict[str, Any]:
+        """Statistiche lette, create o completate (seed e corpus) se il file manca o è parziale"""
+        stats = self.read()
+        if (stats is None or any(field not in stats for field in self.seeds)
+                or (self.corpus and "total_articles" not in stats)):
+            self.update(lambda stats: None)
+            stats = self.read() or {}
+        return stats
+
+    def refresh(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Ricalcola i contatori del corpus (chiamato da BlogDataStore nella stessa commit dei dati)"""
+        return self.update(lambda stats: stats.update(count_articles(articles)))
+
+    def increment(self, field: str, amount: int = 1):
+        """Incrementa un contatore esterno; se assente lo crea il suo seed (che conta già questo incremento)"""
+        def add(stats):
+            if field in stats:
+                stats[field] += amount
+        self.update(add)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Archivio dei Dati del Blog
+Percorso di scrittura unico per i file blog-data.js: lock consultivo tra processi, file temporaneo + rename
+atomico e group commit delle modifiche concorrenti in un'unica riscrittura
+"""
+
+import os
+import copy
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: resta il solo lock tra thread
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ARTICLES_MARKER = "const blogArticles = "
+
+
+def parse_articles_js(content: str) -> List[Dict[str, Any]]:
+    """Estrae l'array degli articoli da un file blog-data.js"""
+    start = content.find(ARTICLES_MARKER)
+    start = content.find('[', start + len(ARTICLES_MARKER) if start != -1 else 0)
+    if start == -1:
+        return []
+    articles, _ = json.JSONDecoder().raw_decode(content, start)
+    return articles
+
+
+def read_articles(path: str) -> List[Dict[str, Any]]:
+    """Articoli salvati in path (lista vuota se il file non esiste)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_articles_js(f.read())
+
+
+def render_articles_js(articles: List[Dict[str, Any]]) -> str:
+    """Formato minimo del file: la sola costante con gli articoli"""
+    return f"{ARTICLES_MARKER}{json.dumps(articles, ensure_ascii=False, indent=2)};"
+
+
+def atomic_write(path: str, content: str):
+    """Scrive su file temporaneo nella stessa directory, fsync e rename: mai un file troncato"""
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Rende persistente anche il rename
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+@contextmanager
+def file_lock(lock_path: str):
+    """Lock esclusivo consultivo (flock) su un file dedicato, stabile anche dopo i rename del file dati"""
+    with open(lock_path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class BlogDataStore:
+    """File blog-data.js modificato solo tramite update(): le modifiche concorrenti condividono una scrittura"""
+
+    def __init__(self, path: str, render: Callable[[List[Dict[str, Any]]], str] = render_articles_js, stats=None,
+                 on_commit: Callable[[List[Dict[str, Any]]], Any] = None):
+        """Archivio sul file path, scritto nel formato prodotto da render; stats (BlogStats) si aggiorna a ogni commit,
+        on_commit(articoli) viene chiamata dopo ogni scrittura, sotto lo stesso lock (es. shard del blog)"""
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.render = render
+        self.stats = stats
+        self.on_commit = on_commit
+        self.condition = threading.Condition()
+        self.pending = []
+        self.committing = False
+
+    def read(self) -> List[Dict[str, Any]]:
+        """Articoli attualmente salvati (lista vuota se il file non esiste)"""
+        return read_articles(self.path)
+
+    def update(self, mutation: Callable[[List[Dict[str, Any]]], Any]) -> Any:
+        """Applica mutation(articoli) sotto lock e salva; restituisce il valore della mutation"""
+        request = {"mutation": mutation, "done": False, "result": None, "error": None}
+
+        with self.condition:
+            self.pending.append(request)
+            while not request["done"]:
+                if self.committing:
+                    # Un altro thread sta scrivendo: la richiesta entrerà nel prossimo commit
+                    self.condition.wait()
+                    continue
+
+                # Questo thread guida il commit di tutte le richieste in attesa
+                self.committing = True
+                batch, self.pending = self.pending, []
+                self.condition.release()
+                try:
+                    self.commit(batch)
+                finally:
+                    self.condition.acquire()
+                    self.committing = False
+                    self.condition.notify_all()
+
+        if request["error"] is not None:
+            raise request["error"]
+        return request["result"]
+
+    def replace(self, articles: List[Dict[str, Any]]):
+        """Sostituisce tutti gli articoli"""
+        def replace_all(current):
+            current[:] = articles
+        self.update(replace_all)
+
+    def commit(self, batch: List[Dict[str, Any]]):
+        """Una lettura, tutte le mutation in ordine, una scrittura atomica.
+        Ogni mutation è applicata per intero o per niente: quella che solleva non lascia modifiche parziali"""
+        try:
+            with file_lock(self.lock_path):
+                articles = self.read()
+                changed = False
+                for request in batch:
+                    # Da sola nel commit, una mutation fallita non fa scrivere nulla: la copia serve solo nei gruppi
+                    working = copy.deepcopy(articles) if len(batch) > 1 else articles
+                    try:
+                        request["result"] = request["mutation"](working)
+                    except Exception as e:
+                        request["error"] = e
+                        continue
+                    articles = working
+                    changed = True
+
+                if changed:
+                    atomic_write(self.path, self.render(articles))
+                    # Statistiche ricalcolate sotto lo stesso lock: sempre allineate al file
+                    if self.stats:
+                        try:
+                            self.stats.refresh(articles)
+                        except Exception as e:
+                            logger.error(f"Statistiche non aggiornate ({self.stats.path}): {e}")
+                    if self.on_commit:
+                        try:
+                            self.on_commit(articles)
+                        except Exception as e:
+                            logger.error(f"Aggiornamento dopo il commit di {self.path} non riuscito: {e}")
+                    if len(batch) > 1:
+                        logger.info(f"Group commit di {len(batch)} modifiche su {self.path}")
+        except Exception as e:
+            for request in batch:
+                if request["error"] is None:
+                    request["error"] = e
+        finally:
+            for request in batch:
+                request["done"] = True
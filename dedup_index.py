@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Indice dei Quasi-Duplicati
+Firme MinHash con bucket LSH salvati in SQLite: ricerca sub-lineare anche su centinaia di migliaia di articoli
+"""
+
+import re
+import struct
+import random
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 64 permutazioni = 8 bande x 8 righe: soglia LSH ~ (1/8)^(1/8) = 0.77 di similarità di Jaccard
+NUM_PERM = 64
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+
+# Primo di Mersenne per l'hashing universale (a*x + b) mod P
+MERSENNE_PRIME = (1 << 61) - 1
+
+SHINGLE_SIZE = 3
+
+TAG_PATTERN = re.compile(r'<[^>]+>')
+WORD_PATTERN = re.compile(r'\w+')
+
+# Coefficienti fissi: le firme salvate restano confrontabili tra esecuzioni
+_rng = random.Random(1)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+
+def shingles(text: str) -> set:
+    """Insieme delle sequenze di SHINGLE_SIZE parole del testo (senza tag HTML)"""
+    words = WORD_PATTERN.findall(TAG_PATTERN.sub(' ', text).lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text: str) -> List[int]:
+    """Firma MinHash del testo"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in shingles(text)
+    ]
+    return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS]
+
+
+def similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Stima della similarità di Jaccard da due firme"""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / NUM_PERM
+
+
+def band_buckets(signature: List[int]) -> List[int]:
+    """Bucket LSH (interi a 64 bit con segno, come li salva SQLite) per ogni banda"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f'>{ROWS}Q', *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+
+class DuplicateIndex:
+    """Indice persistente per trovare articoli quasi identici a un testo"""
+
+    def __init__(self, path: str = "processed_articles/dedup_index.sqlite", threshold: float = 0.8):
+        """Apre (o crea) l'indice su disco"""
+        self.path = path
+        self.threshold = threshold
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (id TEXT PRIMARY KEY, signature BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, bucket INTEGER NOT NULL, id TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS bands_lookup ON bands (band, bucket);
+            CREATE INDEX IF NOT EXISTS bands_id ON bands (id);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+
+    def __len__(self) -> int:
+        """Numero di articoli indicizzati"""
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def find_duplicate(self, text: str, exclude_id: str = None) -> Optional[Tuple[str, float]]:
+        """Restituisce (id, similarità) dell'articolo più simile oltre la soglia, oppure None"""
+        signature = minhash(text)
+
+        with self.lock:
+            # Candidati: articoli che condividono almeno un bucket
+            candidates = set()
+            for band, bucket in enumerate(band_buckets(signature)):
+                rows = self.connection.execute(
+                    "SELECT id FROM bands WHERE band = ? AND bucket = ?", (band, bucket)
+                )
+                candidates.update(row[0] for row in rows)
+            candidates.discard(exclude_id)
+
+            best = None
+            for candidate_id in candidates:
+                row = self.connection.execute(
+                    "SELECT signature FROM signatures WHERE id = ?", (candidate_id,)
+                ).fetchone()
+                score = similarity(signature, struct.unpack(f'>{NUM_PERM}Q', row[0]))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (candidate_id, score)
+
+        return best
+
+    def add(self, article_id: str, text: str):
+        """Aggiunge (o sostituisce) un articolo nell'indice"""
+        self.add_many([(article_id, text)])
+
+    def add_many(self, items: List[Tuple[str, str]]):
+        """Aggiunge più articoli in un'unica transazione"""
+        with self.lock, self.connection:
+            self._insert(items)
+
+    def corpus_indexed(self) -> bool:
+        """Verifica se il corpus pubblicato è già stato indicizzato (l'indice può contenere solo i generati)"""
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'corpus_indexed'").fetchone()
+        return row is not None
+
+    def index_corpus(self, items: List[Tuple[str, str]]):
+        """Indicizza il corpus pubblicato e lo segna come fatto, nella stessa transazione"""
+        with self.lock, self.connection:
+            self._insert(items)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('corpus_indexed', ?)", (str(len(items)),)
+            )
+
+    def _insert(self, items: List[Tuple[str, str]]):
+        """Scrive firme e bucket (chiamato sotto lock, dentro una transazione)"""
+        for article_id, text in items:
+            signature = minhash(text)
+            # Un articolo reindicizzato sostituisce i propri bucket
+            self.connection.execute("DELETE FROM bands WHERE id = ?", (article_id,))
+            self.connection.execute(
+                "INSERT OR REPLACE INTO signatures (id, signature) VALUES (?, ?)",
+                (article_id, struct.pack(f'>{NUM_PERM}Q', *signature))
+            )
+            self.connection.executemany(
+                "INSERT INTO bands (band, bucket, id) VALUES (?, ?, ?)",
+                [(band, bucket, article_id) for band, bucket in enumerate(band_buckets(signature))]
+            )
+
+    def close(self):
+        """Chiude la connessione all'indice"""
+        self.connection.close()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tassonomia ETF per Tag e Categorie
+Termini, ticker e asset class compilati in un automa Aho-Corasick per un'unica scansione del testo
+"""
+
+import os
+import json
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Tag sempre presenti
+BASE_TAGS = ["ETF", "Investimenti", "Finanza"]
+
+# Tag -> termini (parole intere, minuscole). L'ordine dei tag è quello di output
+TAG_TERMS = {
+    "ETF Azionari": [
+        "azionari", "azionario", "azioni", "azionaria", "equity", "stock", "msci world", "ftse all-world",
+        "s&p 500", "sp500", "nasdaq 100", "nasdaq-100", "stoxx 600", "euro stoxx 50", "ftse mib"
+    ],
+    "ETF Obbligazionari": [
+        "obbligazionari", "obbligazionario", "obbligazioni", "obbligazionaria", "bond", "bonds", "btp",
+        "bund", "treasury", "treasuries", "titoli di stato", "corporate bond", "high yield", "duration"
+    ],
+    "Mercati Europei": [
+        "europei", "europeo", "europa", "europe", "eurozona", "euro area", "stoxx", "dax", "cac 40",
+        "ftse mib", "ibex"
+    ],
+    "Mercati Emergenti": [
+        "emergenti", "emergente", "emerging", "emerging markets", "cina", "china", "india", "brasile"
+    ],
+    "ESG": [
+        "esg", "sostenibili", "sostenibile", "sostenibilità", "clima", "climate", "paris aligned",
+        "green bond", "transizione energetica", "sustainable"
+    ],
+    "Tecnologia": [
+        "tecnologia", "tecnologico", "tecnologici", "tech", "technology", "intelligenza artificiale",
+        "semiconduttori", "semiconductor", "cloud", "cybersecurity", "robotica", "nasdaq"
+    ],
+    "Dividendi": [
+        "dividend", "dividendi", "dividendo", "dividend yield", "high dividend", "aristocrats",
+        "cedola", "cedole"
+    ],
+    "Materie Prime": [
+        "commodities", "commodity", "materie prime", "oro", "gold", "argento", "silver", "petrolio",
+        "oil", "metalli"
+    ],
+    "Immobiliare": [
+        "immobiliari", "immobiliare", "reit", "reits", "real estate"
+    ],
+    "Small Cap": [
+        "small cap", "small caps", "piccola capitalizzazione", "russell 2000"
+    ],
+    "Value Investing": [
+        "value investing", "value", "valore intrinseco", "sottovalutati"
+    ]
+}
+
+# Tag -> ticker e sigle: nel corpo contano solo se scritti in maiuscolo ("SEGA", non "sega"), nel titolo sempre
+TAG_TICKERS = {
+    "ETF Azionari": ["vwce", "swda", "iwda", "cspx", "vusa", "sxr8", "eunl", "xdwd", "eqqq", "cndx", "meud", "csemu"],
+    "ETF Obbligazionari": ["aggh", "vagf", "ieac", "iebb", "ibtm", "idtl", "xgle", "emb", "vgea", "sega", "itps"],
+    "Mercati Europei": ["meud", "csemu", "exsa", "vevea"],
+    "Mercati Emergenti": ["eimi", "iema", "vfem", "emim", "xmme", "aeem"],
+    "ESG": ["sri", "susw", "suas", "sawd"],
+    "Tecnologia": ["iitu", "xdwt", "qdve", "sxlk", "smh", "rbot", "wtai"],
+    "Dividendi": ["vhyl", "ispa", "tdiv", "zprg", "fusd", "vhyd", "iuks"],
+    "Materie Prime": ["sgld", "phau", "igln", "4gld", "cmod", "cryu"],
+    "Immobiliare": ["iprp", "iwdp", "eprl", "xrea"],
+    "Small Cap": ["iusn", "zprr", "zprx", "wsml"],
+    "Value Investing": ["iwvl", "zprv", "eudv"]
+}
+
+# Parole inglesi ambigue in un testo italiano ("value", "vs", "oil"): contano solo nel titolo
+TITLE_ONLY_TERMS = frozenset({"value", "vs", "oil"})
+
+# Categoria -> termini, in ordine di priorità (a parità di occorrenze vince la prima)
+CATEGORY_TERMS = {
+    "Analisi di Mercato": ["analisi", "analisi di mercato", "outlook", "rischi"],
+    "Guide agli Investimenti": ["guida", "guide", "come investire", "principianti", "tutorial"],
+    "Confronti ETF": ["confronto", "confronti", "migliori etf", "versus", "vs"],
+    "Trend e Previsioni": ["trend", "previsioni", "previsione", "prospettive", "scenari"],
+    "Strategie di Investimento": ["strategia", "strategie", "asset allocation", "portafoglio modello", "ribilanciamento"]
+}
+
+DEFAULT_CATEGORY = "ETF News"
+
+
+class KeywordMatcher:
+    """Automa Aho-Corasick: trova tutte le parole chiave in una sola passata sul testo"""
+
+    def __init__(self, keywords: Dict[str, Any]):
+        """Compila le parole chiave (termine -> valore associato)"""
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for keyword, value in keywords.items():
+            self._add(keyword.lower(), value)
+        self._build_failure_links()
+
+    def _add(self, keyword: str, value: Any):
+        """Inserisce una parola chiave nel trie"""
+        state = 0
+        for char in keyword:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((len(keyword), value))
+
+    def _build_failure_links(self):
+        """Calcola i link di fallimento in ampiezza"""
+        queue = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Restituisce (inizio, fine, valore) per ogni parola chiave trovata come parola intera"""
+        text = text.lower()
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for length, value in output[state]:
+                start = index - length + 1
+                end = index + 1
+                # Solo parole intere: "azioni" non deve corrispondere dentro "obbligazioni"
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                yield start, end, value
+
+
+class ETFTaxonomy:
+    """Assegna tag e categoria a titolo e corpo dell'articolo"""
+
+    def __init__(self, tag_terms: Dict[str, List[str]] = None, category_terms: Dict[str, List[str]] = None,
+                 tag_tickers: Dict[str, List[str]] = None, title_only_terms: Iterable[str] = None):
+        """Compila i matcher di tag e categorie"""
+        self.tag_terms = tag_terms or TAG_TERMS
+        self.category_terms = category_terms or CATEGORY_TERMS
+        self.tag_tickers = TAG_TICKERS if tag_tickers is None else tag_tickers
+        self.title_only_terms = frozenset(TITLE_ONLY_TERMS if title_only_terms is None else title_only_terms)
+
+        self.tag_order = {tag: i for i, tag in enumerate(self.tag_terms)}
+        for tag in self.tag_tickers:
+            self.tag_order.setdefault(tag, len(self.tag_order))
+        self.category_order = {category: i for i, category in enumerate(self.category_terms)}
+
+        tag_keywords = self._invert(self.tag_terms)
+        tickers = self._invert(self.tag_tickers)
+        self.tickers = frozenset(tickers)
+        for term, labels in tickers.items():
+            merged = tag_keywords.setdefault(term, [])
+            merged.extend([label for label in labels if label not in merged])
+
+        self.tag_matcher = KeywordMatcher(self._with_terms(tag_keywords))
+        self.category_matcher = KeywordMatcher(self._with_terms(self._invert(self.category_terms)))
+
+    @staticmethod
+    def _invert(terms_by_label: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Termine -> etichette (un termine può appartenere a più etichette)"""
+        labels_by_term = {}
+        for label, terms in terms_by_label.items():
+            for term in terms:
+                labels = labels_by_term.setdefault(term.lower(), [])
+                if label not in labels:
+                    labels.append(label)
+        return labels_by_term
+
+    @staticmethod
+    def _with_terms(labels_by_term: Dict[str, List[str]]) -> Dict[str, Tuple[str, List[str]]]:
+        """Valore del matcher: (termine, etichette), per filtrare i termini ambigui nel corpo"""
+        return {term: (term, labels) for term, labels in labels_by_term.items()}
+
+    def _labels(self, matcher: KeywordMatcher, text: str, in_title: bool) -> Iterator[List[str]]:
+        """Etichette dei termini trovati; nel corpo esclude i termini ambigui e i ticker in minuscolo"""
+        for start, end, (term, labels) in matcher.find(text):
+            if not in_title:
+                if term in self.title_only_terms:
+                    continue
+                if term in self.tickers and not text[start:end].isupper():
+                    continue
+            yield labels
+
+    def tags(self, title: str, content: str = None) -> List[str]:
+        """Tag base più i tag trovati in titolo e corpo"""
+        found = set()
+        for text, in_title in ((title, True), (content or "", False)):
+            for labels in self._labels(self.tag_matcher, text, in_title):
+                found.update(labels)
+        return BASE_TAGS + sorted(found, key=self.tag_order.get)
+
+    def category(self, title: str, content: str = None) -> str:
+        """Categoria dal titolo; se il titolo non basta, la più frequente nel corpo"""
+        for text, in_title in ((title, True), (content or "", False)):
+            counts = Counter()
+            for labels in self._labels(self.category_matcher, text, in_title):
+                counts.update(labels)
+            if counts:
+                return min(counts, key=lambda category: (-counts[category], self.category_order[category]))
+        return DEFAULT_CATEGORY
+
+
+def load_taxonomy(path: str) -> ETFTaxonomy:
+    """Carica una tassonomia estesa da JSON ({"tags": {...}, "tickers": {...}, "categories": {...}})
+    unita a quella base: è il modo previsto per arrivare a migliaia di termini e ticker"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    tag_terms = {tag: list(terms) for tag, terms in TAG_TERMS.items()}
+    for tag, terms in data.get("tags", {}).items():
+        tag_terms.setdefault(tag, []).extend(terms)
+
+    tag_tickers = {tag: list(tickers) for tag, tickers in TAG_TICKERS.items()}
+    for tag, tickers in data.get("tickers", {}).items():
+        tag_tickers.setdefault(tag, []).extend(tickers)
+        # Un tag con soli ticker ha comunque la sua posizione nell'output
+        tag_terms.setdefault(tag, [])
+
+    category_terms = {category: list(terms) for category, terms in CATEGORY_TERMS.items()}
+    for category, terms in data.get("categories", {}).items():
+        category_terms.setdefault(category, []).extend(terms)
+
+    return ETFTaxonomy(tag_terms, category_terms, tag_tickers, TITLE_ONLY_TERMS | set(data.get("title_only", [])))
+
+
+_default_taxonomy = None
+
+def get_taxonomy() -> ETFTaxonomy:
+    """Tassonomia compilata una sola volta per processo (estesa da ETF_TAXONOMY_FILE se impostata)"""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        path = os.environ.get("ETF_TAXONOMY_FILE")
+        _default_taxonomy = load_taxonomy(path) if path else ETFTaxonomy()
+    return _default_taxonomy
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache su Disco dei Testi Generati
+Memorizza i risultati deterministici (con seed) con eliminazione LRU basata sulla dimensione
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationCache:
+    """Cache chiave -> testo generato, limitata in byte (LRU sull'mtime dei file)"""
+
+    def __init__(self, directory: str = "generation_cache", max_bytes: int = 50 * 1024 * 1024):
+        """Inizializza la cache e calcola l'occupazione attuale"""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.total_bytes = sum(entry.stat().st_size for entry in self._entries())
+
+    @staticmethod
+    def make_key(model: str, prompt: str, params: Dict[str, Any], seed: int) -> str:
+        """Calcola la chiave da (modello, prompt, parametri di campionamento, seed)"""
+        payload = json.dumps([model, prompt, params, seed], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Restituisce il testo in cache (None se assente)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = json.load(f)['text']
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # Aggiorna l'mtime: l'elemento diventa il più recente per l'LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        logger.info(f"Cache hit: {key[:12]}")
+        return text
+
+    def put(self, key: str, text: str):
+        """Salva un testo in cache ed elimina i più vecchi se si supera il limite"""
+        path = self._path(key)
+        data = json.dumps({'text': text}, ensure_ascii=False).encode('utf-8')
+
+        with self.lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self.total_bytes += len(data) - previous
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Elimina i file meno recenti finché la cache rientra nel limite"""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+
+        removed = 0
+        for entry in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self.total_bytes -= size
+                removed += 1
+            except OSError:
+                continue
+
+        logger.info(f"Cache: eliminati {removed} elementi ({self.total_bytes} byte occupati)")
+
+    def _entries(self):
+        """Elenca i file della cache"""
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+
+    def _path(self, key: str) -> str:
+        """Percorso del file associato alla chiave"""
+        return os.path.join(self.directory, f"{key}.json")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Telemetria della Generazione
+Tempi per fase, conteggi di token e throughput: istogrammi in memoria e file JSONL compatto su disco
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any
+
+# Limiti superiori dei bucket: progressione geometrica (x1.5) da 0.1 a ~10^7
+BUCKET_BOUNDS = [round(0.1 * 1.5 ** i, 3) for i in range(46)]
+
+# Campi degli eventi che non sono misure
+EVENT_FIELDS = ("t", "pid", "type", "engine")
+
+
+class Histogram:
+    """Istogramma a bucket fissi con conteggio, somma, minimo, massimo e percentili approssimati"""
+
+    def __init__(self):
+        """Crea un istogramma vuoto"""
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        """Registra un valore"""
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Limite superiore del bucket che contiene il percentile q (0-100)"""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                # Il bucket di overflow non ha limite: si usa il massimo osservato
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Riepilogo serializzabile (solo i bucket non vuoti)"""
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": {
+                str(BUCKET_BOUNDS[index]) if index < len(BUCKET_BOUNDS) else "+Inf": count
+                for index, count in enumerate(self.counts) if count
+            }
+        }
+
+
+class GenerationMetrics:
+    """Raccoglie gli eventi di generazione: ogni misura numerica finisce nell'istogramma omonimo"""
+
+    def __init__(self, path: str = "generation_metrics.jsonl"):
+        """Prepara gli istogrammi; path=None tiene le metriche solo in memoria"""
+        self.path = path
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.events = {}
+        # Posizione di lettura del file per follow()
+        self.offset = 0
+
+    def record(self, event: Dict[str, Any]):
+        """Registra un evento (es. {"type": "article", "generate_ms": 812.5}) e lo aggiunge al file"""
+        event = {"t": round(time.time(), 3), "pid": os.getpid(), **event}
+
+        with self.lock:
+            self.fold(event)
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(event, separators=(',', ':')) + "\n")
+
+    def fold(self, event: Dict[str, Any]):
+        """Aggiorna contatori e istogrammi con le misure dell'evento"""
+        event_type = event.get("type", "event")
+        self.events[event_type] = self.events.get(event_type, 0) + 1
+
+        for name, value in event.items():
+            if name in EVENT_FIELDS or isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].observe(value)
+
+    def follow(self):
+        """Aggiunge gli eventi scritti sul file da altri processi dall'ultima lettura"""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        with self.lock:
+            # File troncato o ruotato: si riparte dall'inizio
+            if os.path.getsize(self.path) < self.offset:
+                self.offset = 0
+
+            with open(self.path, 'r', encoding='utf-8') as f:
+                f.seek(self.offset)
+                for line in f:
+                    # Riga ancora in scrittura: verrà letta al prossimo giro
+                    if not line.endswith("\n"):
+                        break
+                    self.offset += len(line.encode('utf-8'))
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if event.get("pid") != os.getpid():
+                        self.fold(event)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Stato corrente di contatori e istogrammi"""
+        with self.lock:
+            return {
+                "events": dict(self.events),
+                "histograms": {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())}
+            }
+
+
+@contextmanager
+def timed(event: Dict[str, Any], stage: str):
+    """Misura la durata del blocco in event["<stage>_ms"]"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        event[f"{stage}_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+
+_default_metrics = None
+
+def get_metrics() -> GenerationMetrics:
+    """Metriche condivise dal processo (file da ETF_METRICS_FILE, default generation_metrics.jsonl)"""
+    global _default_metrics
+    if _default_metrics is None:
+        _default_metrics = GenerationMetrics(os.environ.get("ETF_METRICS_FILE", "generation_metrics.jsonl"))
+    return _default_metrics
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Worker di Generazione Articoli ETF
+Processo persistente che carica il modello una sola volta e riceve i job tramite coda
+"""
+
+import time
+import uuid
+import queue
+import logging
+import threading
+import multiprocessing
+from typing import Dict, Any, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+def worker_loop(jobs, results):
+    """Ciclo principale del processo worker: modello caricato una volta, job in coda"""
+    from ai_article_generator import ETFArticleGenerator, TEST_SEED
+    from ai_blog_integration import AIBlogIntegration
+
+    generator = ETFArticleGenerator()
+    model_loaded = generator.load_model()
+    integration = AIBlogIntegration()
+
+    results.put({'type': 'ready', 'model_loaded': model_loaded})
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+
+        start = time.time()
+        try:
+            if job['type'] == 'stream':
+                # I token vengono inoltrati al server man mano che arrivano
+                articles = []
+                title = job.get('title') or generator.generate_article_title()
+                for event in generator.stream_article_content(title, seed=job.get('seed')):
+                    if event['type'] == 'token':
+                        results.put({'type': 'token', 'id': job['id'], 'text': event['text']})
+                    else:
+                        articles.append(event['article'])
+            else:
+                # Il job di test genera sempre un solo articolo, con seed fisso: le ripetizioni sono hit della cache
+                count = 1 if job['type'] == 'test' else job['count']
+                seed = job.get('seed')
+                if seed is None and job['type'] == 'test':
+                    seed = TEST_SEED
+                articles = generator.generate_daily_articles(count, seed=seed)
+
+            integrated = 0
+            if articles and job.get('integrate', True):
+                integrated = integration.process_new_articles()
+
+            results.put({
+                'type': 'result',
+                'id': job['id'],
+                'success': bool(articles),
+                'articles': [{'id': a['id'], 'title': a['title']} for a in articles],
+                'integrated': integrated,
+                'duration': time.time() - start
+            })
+
+        except Exception as e:
+            results.put({
+                'type': 'result',
+                'id': job['id'],
+                'success': False,
+                'error': str(e),
+                'duration': time.time() - start
+            })
+
+
+class GenerationWorker:
+    """Gestisce il processo worker e lo scambio di job e risultati"""
+
+    def __init__(self):
+        """Inizializza le code di comunicazione con il worker"""
+        # spawn: il figlio non eredita thread e socket del server HTTP
+        self.context = multiprocessing.get_context('spawn')
+        self.jobs = None
+        self.results = None
+        self.process = None
+        self.model_loaded = False
+        self.ready = threading.Event()
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Avvia il processo worker e il thread che raccoglie i risultati"""
+        with self.lock:
+            if self.is_alive():
+                return
+
+            self.jobs = self.context.Queue()
+            self.results = self.context.Queue()
+            self.ready.clear()
+
+            self.process = self.context.Process(
+                target=worker_loop,
+                args=(self.jobs, self.results),
+                name='etf-generation-worker',
+                daemon=True
+            )
+            self.process.start()
+
+            collector = threading.Thread(target=self._collect_results, args=(self.results,))
+            collector.daemon = True
+            collector.start()
+
+        logger.info(f"Worker di generazione avviato (PID: {self.process.pid})")
+
+    def is_alive(self) -> bool:
+        """Verifica se il processo worker è attivo"""
+        return self.process is not None and self.process.is_alive()
+
+    def submit(self, job_type: str = 'manual', count: int = 2, integrate: bool = True, title: str = None,
+               seed: int = None) -> str:
+        """Accoda un job di generazione e restituisce il suo ID (con seed il testo è riproducibile e in cache)"""
+        if not self.is_alive():
+            logger.warning("Worker non attivo, riavvio in corso...")
+            self.start()
+
+        job_id = uuid.uuid4().hex
+        with self.lock:
+            self.pending[job_id] = {'event': threading.Event(), 'result': None, 'tokens': queue.Queue()}
+
+        self.jobs.put({'id': job_id, 'type': job_type, 'count': count, 'integrate': integrate, 'title': title,
+                       'seed': seed})
+        return job_id
+
+    def stream(self, title: str = None, timeout: float = 600, seed: int = None) -> Iterator[Dict[str, Any]]:
+        """Genera un articolo in streaming: produce i messaggi 'token' e infine il 'result'"""
+        job_id = self.submit('stream', 1, title=title, seed=seed)
+        with self.lock:
+            tokens = self.pending[job_id]['tokens']
+
+        deadline = time.time() + timeout
+        try:
+            while True:
+                try:
+                    message = tokens.get(timeout=max(0, deadline - time.time()))
+                except queue.Empty:
+                    break
+
+                yield message
+                if message['type'] == 'result':
+                    break
+        finally:
+            # Anche se il client si disconnette a metà streaming
+            with self.lock:
+                self.pending.pop(job_id, None)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Attende il risultato di un job (None in caso di timeout)"""
+        with self.lock:
+            entry = self.pending.get(job_id)
+        if entry is None:
+            return None
+
+        if not entry['event'].wait(timeout):
+            return None
+
+        with self.lock:
+            self.pending.pop(job_id, None)
+        return entry['result']
+
+    def stop(self, timeout: float = 10):
+        """Ferma il worker al termine del job in corso"""
+        if not self.is_alive():
+            return
+
+        self.jobs.put(None)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        logger.info("Worker di generazione fermato")
+
+    def _collect_results(self, results):
+        """Smista i messaggi del worker ai job in attesa"""
+        while True:
+            try:
+                message = results.get()
+            except (EOFError, OSError):
+                break
+
+            if message['type'] == 'ready':
+                self.model_loaded = message['model_loaded']
+                self.ready.set()
+                logger.info(f"Worker pronto (modello caricato: {self.model_loaded})")
+                continue
+
+            with self.lock:
+                entry = self.pending.get(message['id'])
+            if entry is None:
+                continue
+
+            if message['type'] == 'result':
+                entry['result'] = message
+                entry['event'].set()
+            entry['tokens'].put(message)
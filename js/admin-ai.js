@@ -93,6 +93,58 @@ async function generateAIArticles() {
     }, 3000);
 }
 
+/**
+ * Genera un articolo AI in streaming (Server-Sent Events dal server locale)
+ * Mostra il tempo al primo token e l'avanzamento senza attendere l'intero articolo
+ */
+function streamAIArticle(title) {
+    const statusDiv = document.getElementById('aiGenerationStatus');
+    const statusText = document.getElementById('aiStatusText');
+    
+    statusDiv.style.display = 'block';
+    statusDiv.className = 'ai-status';
+    statusText.textContent = 'Avvio generazione in streaming...';
+    
+    const url = new URL('http://localhost:8001/api/generate-stream');
+    if (title) {
+        url.searchParams.set('title', title);
+    }
+    
+    const startTime = performance.now();
+    let firstTokenTime = null;
+    let generatedText = '';
+    const source = new EventSource(url);
+    
+    source.addEventListener('token', (event) => {
+        const data = JSON.parse(event.data);
+        if (firstTokenTime === null) {
+            firstTokenTime = performance.now() - startTime;
+        }
+        generatedText += data.text;
+        statusText.textContent = `✍️ Primo token dopo ${(firstTokenTime / 1000).toFixed(2)}s - ${generatedText.length} caratteri generati`;
+    });
+    
+    source.addEventListener('done', (event) => {
+        const data = JSON.parse(event.data);
+        source.close();
+        
+        statusDiv.className = data.success ? 'ai-status success' : 'ai-status error';
+        statusText.textContent = data.success
+            ? `✅ Articolo generato in ${data.duration.toFixed(1)}s (primo token dopo ${((firstTokenTime || 0) / 1000).toFixed(2)}s)`
+            : '❌ Errore nella generazione in streaming';
+        
+        if (data.success && typeof loadBlogArticles === 'function') {
+            loadBlogArticles();
+        }
+    });
+    
+    source.onerror = () => {
+        source.close();
+        statusDiv.className = 'ai-status error';
+        statusText.textContent = '❌ Server locale non raggiungibile per lo streaming';
+    };
+}
+
 /**
  * Simula l'esecuzione dello script Python locale
  * In un ambiente reale, questo dovrebbe chiamare un endpoint del server
@@ -241,5 +293,6 @@ if (document.readyState === 'loading') {
 // Esporta le funzioni per uso globale
 if (typeof window !== 'undefined') {
     window.generateAIArticles = generateAIArticles;
+    window.streamAIArticle = streamAIArticle;
     window.updateAIStats = updateAIStats;
 }
\ No newline at end of file
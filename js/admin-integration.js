@@ -319,15 +319,21 @@ class AdminIntegration {
         card.innerHTML = `
             <div class="blog-image">${emoji}</div>
             <div class="blog-content">
-                <h3 class="blog-title">${article.title}</h3>
-                <p class="blog-excerpt">${article.excerpt}</p>
+                <h3 class="blog-title"></h3>
+                <p class="blog-excerpt"></p>
                 <div class="blog-meta">
-                    <span class="blog-category">${article.category || 'Articolo'}</span>
-                    <span class="blog-date">${article.date}</span>
+                    <span class="blog-category"></span>
+                    <span class="blog-date"></span>
                 </div>
             </div>
         `;
         
+        // Article fields as text: an excerpt with decoded entities (e.g. "<img onerror=...>") must not become markup
+        card.querySelector('.blog-title').textContent = article.title || '';
+        card.querySelector('.blog-excerpt').textContent = article.excerpt || '';
+        card.querySelector('.blog-category').textContent = article.category || 'Articolo';
+        card.querySelector('.blog-date').textContent = article.date || '';
+        
         card.addEventListener('click', () => {
             // Create URL-friendly slug from title
             const slug = this.createSlug(article.title);
@@ -1,12 +1,12 @@
 // Dati degli articoli del blog - ETF Italia
-// Aggiornato automaticamente: 2025-09-03T17:34:45.303930
+// Aggiornato automaticamente: 2026-10-18T14:45:21.733461
 
 const blogArticles = [
   {
     "id": "analisi-etf-obbligazionari-opportunità-e-rischi-nel-2025-1756913682",
     "title": "Analisi ETF obbligazionari: Opportunità e Rischi nel 2025",
     "content": "Investire in ETF può essere una strategia efficace per costruire un portafoglio diversificato. È importante comprendere i rischi e le opportunità di ogni tipologia di ETF. Gli ETF obbligazionari possono fornire stabilità e reddito al portafoglio.\n\nQuesto articolo fornisce informazioni generali sugli ETF e non costituisce consulenza finanziaria. È sempre consigliabile consultare un consulente finanziario qualificato prima di prendere decisioni di investimento.",
-    "excerpt": "Investire in ETF può essere una strategia efficace per costruire un portafoglio diversificato. È importante comprendere i rischi e le opportunità di ogni tipologia di ETF. Gli ETF obbligazionari posso...",
+    "excerpt": "Investire in ETF può essere una strategia efficace per costruire un portafoglio diversificato. È importante comprendere i rischi e le opportunità di ogni tipologia di ETF. Gli ETF obbligazionari...",
     "author": "ETF Italia AI",
     "date": "2025-09-03T17:34:42.279492",
     "category": "Analisi di Mercato",
@@ -23,13 +23,50 @@ const blogArticles = [
     "readTime": 1,
     "views": 0,
     "likes": 0,
-    "aiGenerated": true
+    "aiGenerated": true,
+    "wordCount": 62,
+    "outline": [],
+    "fingerprint": "083fb6ffa43ebd6c",
+    "keywords": [
+      "etf",
+      "portafogl",
+      "investir",
+      "strategi",
+      "efficac",
+      "costruir",
+      "diversificat",
+      "important",
+      "comprender",
+      "risc",
+      "opportunit",
+      "tipologi",
+      "obbligazionar",
+      "posson",
+      "fornir",
+      "stabilit",
+      "reddit",
+      "articol",
+      "fornisc",
+      "informazion",
+      "general",
+      "costituisc",
+      "consulenz",
+      "finanziari",
+      "consigliabil",
+      "consultar",
+      "consulent",
+      "finanziar",
+      "qualificat",
+      "prender",
+      "decision",
+      "investiment"
+    ]
   },
   {
     "id": "analisi-etf-settoriali-tecnologia-opportunità-e-rischi-nel-2025-1756913681",
     "title": "Analisi ETF settoriali tecnologia: Opportunità e Rischi nel 2025",
     "content": "Il mercato degli ETF continua a crescere, offrendo agli investitori nuove opportunità di investimento in diversi settori e asset class. Il settore tecnologico offre opportunità di crescita interessanti per gli investitori.\n\nQuesto articolo fornisce informazioni generali sugli ETF e non costituisce consulenza finanziaria. È sempre consigliabile consultare un consulente finanziario qualificato prima di prendere decisioni di investimento.",
-    "excerpt": "Il mercato degli ETF continua a crescere, offrendo agli investitori nuove opportunità di investimento in diversi settori e asset class. Il settore tecnologico offre opportunità di crescita interessant...",
+    "excerpt": "Il mercato degli ETF continua a crescere, offrendo agli investitori nuove opportunità di investimento in diversi settori e asset class. Il settore tecnologico offre opportunità di crescita...",
     "author": "ETF Italia AI",
     "date": "2025-09-03T17:34:41.549587",
     "category": "Analisi di Mercato",
@@ -45,13 +82,49 @@ const blogArticles = [
     "readTime": 1,
     "views": 0,
     "likes": 0,
-    "aiGenerated": true
+    "aiGenerated": true,
+    "wordCount": 57,
+    "outline": [],
+    "fingerprint": "4ad809154fe3e322",
+    "keywords": [
+      "etf",
+      "investitor",
+      "opportunit",
+      "investiment",
+      "settor",
+      "mercat",
+      "continu",
+      "crescer",
+      "offrend",
+      "nuov",
+      "divers",
+      "asset",
+      "class",
+      "tecnologic",
+      "offr",
+      "crescit",
+      "interessant",
+      "articol",
+      "fornisc",
+      "informazion",
+      "general",
+      "costituisc",
+      "consulenz",
+      "finanziari",
+      "consigliabil",
+      "consultar",
+      "consulent",
+      "finanziar",
+      "qualificat",
+      "prender",
+      "decision"
+    ]
   },
   {
     "id": "guida-completa-agli-etf-azionari-europei-come-investire-nel-2025-1756911212",
     "title": "Guida Completa agli ETF azionari europei: Come Investire nel 2025",
     "content": "Gli ETF rappresentano uno strumento di investimento sempre più popolare tra gli investitori italiani. Questi fondi offrono diversificazione, bassi costi e facilità di accesso ai mercati finanziari.\n\nQuesto articolo fornisce informazioni generali sugli ETF e non costituisce consulenza finanziaria. È sempre consigliabile consultare un consulente finanziario qualificato prima di prendere decisioni di investimento.",
-    "excerpt": "Gli ETF rappresentano uno strumento di investimento sempre più popolare tra gli investitori italiani. Questi fondi offrono diversificazione, bassi costi e facilità di accesso ai mercati finanziari.\n\nQ...",
+    "excerpt": "Gli ETF rappresentano uno strumento di investimento sempre più popolare tra gli investitori italiani. Questi fondi offrono diversificazione, bassi costi e facilità di accesso ai mercati finanziari...",
     "author": "ETF Italia AI",
     "date": "2025-09-03T16:53:32.912171",
     "category": "Guide agli Investimenti",
@@ -68,13 +141,47 @@ const blogArticles = [
     "readTime": 1,
     "views": 0,
     "likes": 0,
-    "aiGenerated": true
+    "aiGenerated": true,
+    "wordCount": 53,
+    "outline": [],
+    "fingerprint": "7122bf9279e69c80",
+    "keywords": [
+      "etf",
+      "investiment",
+      "finanziar",
+      "rappresentan",
+      "strument",
+      "popolar",
+      "investitor",
+      "italian",
+      "fond",
+      "offron",
+      "diversificazion",
+      "bass",
+      "cost",
+      "facilit",
+      "access",
+      "mercat",
+      "articol",
+      "fornisc",
+      "informazion",
+      "general",
+      "costituisc",
+      "consulenz",
+      "finanziari",
+      "consigliabil",
+      "consultar",
+      "consulent",
+      "qualificat",
+      "prender",
+      "decision"
+    ]
   },
   {
     "id": "confronto-etf-sostenibili-esg-i-migliori-etf-del-2025-1756908436",
     "title": "Confronto ETF sostenibili ESG: I Migliori ETF del 2025",
     "content": "Investire in ETF può essere una strategia efficace per costruire un portafoglio diversificato. È importante comprendere i rischi e le opportunità di ogni tipologia di ETF.\n\nQuesto articolo fornisce informazioni generali sugli ETF e non costituisce consulenza finanziaria. È sempre consigliabile consultare un consulente finanziario qualificato prima di prendere decisioni di investimento.",
-    "excerpt": "Investire in ETF può essere una strategia efficace per costruire un portafoglio diversificato. È importante comprendere i rischi e le opportunità di ogni tipologia di ETF.\n\nQuesto articolo fornisce in...",
+    "excerpt": "Investire in ETF può essere una strategia efficace per costruire un portafoglio diversificato. È importante comprendere i rischi e le opportunità di ogni tipologia di ETF. Questo articolo fornisce...",
     "author": "ETF Italia AI",
     "date": "2025-09-03T16:07:16.068908",
     "category": "Confronti ETF",
@@ -90,7 +197,39 @@ const blogArticles = [
     "readTime": 1,
     "views": 0,
     "likes": 0,
-    "aiGenerated": true
+    "aiGenerated": true,
+    "wordCount": 52,
+    "outline": [],
+    "fingerprint": "6c608e94dfefd541",
+    "keywords": [
+      "etf",
+      "investir",
+      "strategi",
+      "efficac",
+      "costruir",
+      "portafogl",
+      "diversificat",
+      "important",
+      "comprender",
+      "risc",
+      "opportunit",
+      "tipologi",
+      "articol",
+      "fornisc",
+      "informazion",
+      "general",
+      "costituisc",
+      "consulenz",
+      "finanziari",
+      "consigliabil",
+      "consultar",
+      "consulent",
+      "finanziar",
+      "qualificat",
+      "prender",
+      "decision",
+      "investiment"
+    ]
   }
 ];
 
@@ -0,0 +1,205 @@
+// Caricamento degli shard del blog - ETF Italia
+// Il manifest indica indice, contenuti per mese e liste per categoria: ogni pagina scarica solo ciò che usa
+
+// Corpora del blog: blog-data.js degli editor e js/blog-data.js dell'integrazione AI (a parità di ID vince il primo)
+const BLOG_SOURCES = ['blog-data.js', 'js/blog-data.js'];
+
+// Array blogArticles di un file blog-data.js (JSON indentato: la chiusura è l'unico "]" a inizio riga)
+function parseBlogDataJs(text) {
+    const start = text.indexOf('[', text.indexOf('const blogArticles = '));
+    const end = text.indexOf('\n];', start);
+    if (start === -1 || end === -1) {
+        return [];
+    }
+    return JSON.parse(text.slice(start, end + 2));
+}
+
+class BlogShards {
+    constructor(baseUrl = 'js/blog-data/') {
+        this.baseUrl = baseUrl;
+        this.requests = new Map();
+        this.manifest = null;
+    }
+
+    // Gli shard hanno l'hash nel nome: si scaricano una volta sola
+    fetchShard(file) {
+        if (!this.requests.has(file)) {
+            const request = fetch(this.baseUrl + file).then(response => {
+                if (!response.ok) {
+                    throw new Error(`Shard non disponibile: ${file}`);
+                }
+                return response.json();
+            });
+            // Una richiesta fallita potrà essere ritentata
+            request.catch(() => this.requests.delete(file));
+            this.requests.set(file, request);
+        }
+        return this.requests.get(file);
+    }
+
+    // Il manifest non ha hash nel nome: va sempre rivalidato
+    async loadManifest() {
+        if (!this.manifest) {
+            this.manifest = fetch(this.baseUrl + 'manifest.json', { cache: 'no-cache' }).then(response => {
+                if (!response.ok) {
+                    throw new Error('Manifest degli shard non disponibile');
+                }
+                return response.json();
+            });
+            this.manifest.catch(() => { this.manifest = null; });
+        }
+        return this.manifest;
+    }
+
+    // Indice leggero: id, titolo, estratto, data, categoria, tag (senza contenuti)
+    async loadIndex() {
+        try {
+            const manifest = await this.loadManifest();
+            return await this.fetchShard(manifest.index);
+        } catch (error) {
+            console.warn('BlogShards: uso blog-data.js completo', error);
+            return this.loadLegacyArticles();
+        }
+    }
+
+    // Articolo completo: indice + shard del solo mese di pubblicazione
+    async loadArticle(id) {
+        const index = await this.loadIndex();
+        const entry = index.find(article => article.id === id);
+        if (!entry) {
+            return null;
+        }
+        if (entry.content !== undefined) {
+            return entry;
+        }
+
+        let articles;
+        try {
+            const manifest = await this.loadManifest();
+            articles = await this.fetchShard(manifest.months[entry.month]);
+        } catch (error) {
+            // Shard rimosso da due pubblicazioni successive: si rilegge il manifest e si riprova una volta
+            this.manifest = null;
+            const manifest = await this.loadManifest();
+            articles = await this.fetchShard(manifest.months[entry.month]);
+        }
+        return articles.find(article => article.id === id) || null;
+    }
+
+    // Voci dell'indice di una categoria, nell'ordine del corpus
+    async loadCategory(category) {
+        const manifest = await this.loadManifest();
+        const shard = manifest.categories[category];
+        if (!shard) {
+            return [];
+        }
+
+        const [ids, index] = await Promise.all([this.fetchShard(shard.file), this.loadIndex()]);
+        const byId = new Map(index.map(article => [article.id, article]));
+        return ids.map(id => byId.get(id)).filter(Boolean);
+    }
+
+    // Ricerca sull'indice invertito: scarica solo gli shard delle iniziali dei termini cercati
+    async search(query, limit = 20) {
+        const manifest = await this.loadManifest();
+        const search = manifest.search;
+        if (!search) {
+            return [];
+        }
+
+        const terms = parseSearchQuery(query, new Set(search.stopwords));
+        if (terms.length === 0) {
+            return [];
+        }
+
+        const [index, ...shards] = await Promise.all([
+            this.loadIndex(),
+            ...terms.map(({ term }) => {
+                const file = search.shards[term.slice(0, search.keyLength)];
+                return file ? this.fetchShard(file) : Promise.resolve({});
+            })
+        ]);
+
+        // Per ogni parola: doc -> punteggio migliore tra i termini corrispondenti (più termini se prefisso)
+        let candidates = null;
+        terms.forEach(({ term, prefix }, i) => {
+            const matching = prefix
+                ? Object.keys(shards[i]).filter(key => key.startsWith(term)).slice(0, 64)
+                : (term in shards[i] ? [term] : []);
+
+            const scores = new Map();
+            matching.forEach(key => {
+                const postings = shards[i][key];
+                for (let p = 0; p < postings.length; p += 2) {
+                    scores.set(postings[p], Math.max(scores.get(postings[p]) || 0, postings[p + 1]));
+                }
+            });
+
+            if (candidates === null) {
+                candidates = scores;
+                return;
+            }
+            const next = new Map();
+            candidates.forEach((score, doc) => {
+                if (scores.has(doc)) {
+                    next.set(doc, score + scores.get(doc));
+                }
+            });
+            candidates = next;
+        });
+
+        return [...candidates.entries()]
+            .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+            .slice(0, limit)
+            .map(([doc, score]) => ({ ...index[doc], score }));
+    }
+
+    // Fallback: file monolitici (prima della generazione degli shard), uniti come in blog_shards.py
+    async loadLegacyArticles() {
+        if (typeof blogArticles !== 'undefined') {
+            return blogArticles;
+        }
+
+        // Entrambi i file dichiarano blogArticles: si leggono come testo invece di caricarli come script
+        const corpora = await Promise.all(BLOG_SOURCES.map(source => fetch(source)
+            .then(response => response.ok ? response.text() : '')
+            .then(parseBlogDataJs)
+            .catch(() => [])));
+
+        const seen = new Set();
+        return corpora.flat()
+            .filter(article => !seen.has(article.id) && seen.add(article.id))
+            .sort((a, b) => (b.date || '').localeCompare(a.date || ''));
+    }
+}
+
+// Stessa normalizzazione di search_index.py: minuscole senza accenti, parole vuote, singolare/plurale
+function stemSearchWord(word) {
+    if (word.length < 5 || /^\d+$/.test(word)) {
+        return word;
+    }
+    if ((word.endsWith('he') || word.endsWith('hi')) && 'cg'.includes(word[word.length - 3])) {
+        return word.slice(0, -2);
+    }
+    if (word.endsWith('io')) {
+        return word.slice(0, -2);
+    }
+    return 'aeio'.includes(word[word.length - 1]) ? word.slice(0, -1) : word;
+}
+
+function parseSearchQuery(query, stopwords) {
+    const folded = (query || '').toLowerCase().normalize('NFKD').replace(/[^\x00-\x7f]/g, '');
+    const words = folded.match(/[a-z0-9]+/g) || [];
+    const terms = words
+        .filter(word => word.length > 1 && !stopwords.has(word))
+        .map(word => ({ term: stemSearchWord(word), prefix: false }));
+
+    // L'ultima parola è un prefisso finché non segue uno spazio
+    const last = words[words.length - 1];
+    if (terms.length && /[a-z0-9]$/.test(folded) && last.length > 1 && !stopwords.has(last)) {
+        terms[terms.length - 1].prefix = true;
+    }
+    return terms;
+}
+
+window.blogShards = new BlogShards();
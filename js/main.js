@@ -295,15 +295,21 @@ function createBlogCard(post) {
     card.innerHTML = `
         <div class="blog-image">📊</div>
         <div class="blog-content">
-            <h3 class="blog-title">${post.title}</h3>
-            <p class="blog-excerpt">${post.excerpt}</p>
+            <h3 class="blog-title"></h3>
+            <p class="blog-excerpt"></p>
             <div class="blog-meta">
-                <span class="blog-category">${post.category}</span>
-                <span class="blog-date">${post.date} • ${post.readTime}</span>
+                <span class="blog-category"></span>
+                <span class="blog-date"></span>
             </div>
         </div>
     `;
     
+    // Post fields as text, never as markup
+    card.querySelector('.blog-title').textContent = post.title || '';
+    card.querySelector('.blog-excerpt').textContent = post.excerpt || '';
+    card.querySelector('.blog-category').textContent = post.category || '';
+    card.querySelector('.blog-date').textContent = `${post.date} • ${post.readTime}`;
+    
     card.addEventListener('click', () => {
         // Navigate to article page
         const articleId = post.title.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/(^-|-$)/g, '');
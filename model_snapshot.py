@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snapshot Locale del Modello
+Pesi in safetensors mappati in memoria (zero-copy, pagine condivise tra processi) e tokenizer pre-compilato
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import logging
+import argparse
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS_FILE = "model.safetensors"
+TOKENIZER_FILE = "tokenizer.json"
+
+# Tipi safetensors -> nomi dei dtype torch
+DTYPES = {
+    "F64": "float64",
+    "F32": "float32",
+    "F16": "float16",
+    "BF16": "bfloat16",
+    "I64": "int64",
+    "I32": "int32",
+    "I16": "int16",
+    "I8": "int8",
+    "U8": "uint8",
+    "BOOL": "bool"
+}
+
+
+def create_snapshot(model, tokenizer, directory: str):
+    """Salva pesi (safetensors), buffer, configurazione e tokenizer veloce in directory"""
+    from safetensors.torch import save_file
+
+    os.makedirs(directory, exist_ok=True)
+
+    # Pesi legati (lm_head = wte) salvati una volta sola: tie_weights li ricollega al caricamento
+    tied = {"lm_head.weight"} if model.config.tie_word_embeddings else set()
+    tensors = {name: tensor.contiguous() for name, tensor in model.state_dict().items() if name not in tied}
+    # Anche i buffer non persistenti (es. maschere causali): sul device meta non verrebbero inizializzati
+    tensors.update({name: buffer.contiguous() for name, buffer in model.named_buffers() if name not in tensors})
+
+    tmp_path = os.path.join(directory, WEIGHTS_FILE + ".tmp")
+    save_file(tensors, tmp_path, metadata={"format": "pt"})
+    os.replace(tmp_path, os.path.join(directory, WEIGHTS_FILE))
+    model.config.save_pretrained(directory)
+
+    if tokenizer is not None:
+        # tokenizer.json si carica senza ricostruire vocabolario e merge BPE in Python
+        from transformers import GPT2TokenizerFast
+        if not isinstance(tokenizer, GPT2TokenizerFast):
+            tokenizer = GPT2TokenizerFast.from_pretrained(tokenizer.name_or_path)
+        tokenizer.save_pretrained(directory)
+
+    logger.info(f"Snapshot del modello creato in {directory}")
+
+
+def map_safetensors(path: str):
+    """Tensori del file safetensors come viste su un mmap copy-on-write (nessuna copia dei pesi)"""
+    import torch
+
+    with open(path, 'rb') as f:
+        header_size = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_size))
+        # ACCESS_COPY: mappa scrivibile per torch.frombuffer, le scritture non toccano il file
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    data_start = 8 + header_size
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = getattr(torch, DTYPES[info["dtype"]])
+        begin, end = info["data_offsets"]
+        if begin == end:
+            tensors[name] = torch.empty(info["shape"], dtype=dtype)
+            continue
+        count = (end - begin) // torch.tensor([], dtype=dtype).element_size()
+        tensor = torch.frombuffer(mapped, dtype=dtype, count=count, offset=data_start + begin)
+        tensors[name] = tensor.view(info["shape"])
+
+    return tensors, mapped
+
+
+def load_snapshot(directory: str):
+    """Modello GPT-2 in eval con i pesi mappati dallo snapshot, e tokenizer (None se assente)"""
+    import torch
+    from transformers import GPT2Config, GPT2LMHeadModel, GPT2TokenizerFast
+
+    config = GPT2Config.from_pretrained(directory)
+    tensors, mapped = map_safetensors(os.path.join(directory, WEIGHTS_FILE))
+
+    # Modello sul device meta: nessuna allocazione né inizializzazione casuale dei pesi
+    with torch.device("meta"):
+        model = GPT2LMHeadModel(config)
+    # strict=False solo per la testa legata a wte: ogni altro peso mancante resterebbe sul meta
+    missing = model.load_state_dict(tensors, strict=False, assign=True).missing_keys
+    tied = {"lm_head.weight"} if config.tie_word_embeddings else set()
+    if set(missing) - tied:
+        raise ValueError(f"Snapshot incompleto, pesi mancanti: {sorted(set(missing) - tied)}")
+
+    # I buffer non persistenti restano sul meta: si assegnano dalle viste dello snapshot
+    for name, buffer in list(model.named_buffers()):
+        if buffer.is_meta and name in tensors:
+            module_name, _, buffer_name = name.rpartition(".")
+            model.get_submodule(module_name)._buffers[buffer_name] = tensors[name]
+
+    model.tie_weights()
+    # Un tensore rimasto sul meta farebbe fallire ogni generazione: meglio ripiegare su from_pretrained
+    meta = [name for name, tensor in (*model.named_parameters(), *model.named_buffers()) if tensor.is_meta]
+    if meta:
+        raise ValueError(f"Snapshot incompleto, tensori non inizializzati: {meta}")
+    model.eval()
+    # Il mapping resta vivo finché vive il modello
+    model.snapshot_mmap = mapped
+
+    tokenizer = None
+    if os.path.exists(os.path.join(directory, TOKENIZER_FILE)):
+        tokenizer = GPT2TokenizerFast.from_pretrained(directory)
+
+    return model, tokenizer
+
+
+def snapshot_exists(directory: str) -> bool:
+    """Verifica che lo snapshot sia completo"""
+    return all(os.path.exists(os.path.join(directory, name)) for name in (WEIGHTS_FILE, "config.json", TOKENIZER_FILE))
+
+
+def build_snapshot(directory: str, model_name: str = "gpt2"):
+    """Crea lo snapshot dal modello Hugging Face (download/deserializzazione una volta sola)"""
+    from transformers import GPT2LMHeadModel, GPT2TokenizerFast
+
+    model = GPT2LMHeadModel.from_pretrained(model_name)
+    tokenizer = GPT2TokenizerFast.from_pretrained(model_name)
+    create_snapshot(model, tokenizer, directory)
+
+
+def main():
+    """Crea lo snapshot da riga di comando (es. in fase di deploy)"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Snapshot locale del modello')
+    parser.add_argument('--model', default='gpt2', help='Modello Hugging Face (default: gpt2)')
+    parser.add_argument('--output', default=os.path.join('model_snapshots', 'gpt2'), help='Cartella dello snapshot')
+    args = parser.parse_args()
+
+    build_snapshot(args.output, args.model)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motore ONNX Runtime per GPT-2
+Esporta GPT-2 in ONNX con ingressi/uscite per la KV-cache e lo esegue su CPU con ONNX Runtime
+"""
+
+import os
+import time
+import inspect
+import logging
+from types import SimpleNamespace
+
+logger = logging.getLogger(__name__)
+
+# Lunghezza della cache fittizia usata durante l'export (gli assi restano dinamici)
+EXPORT_PAST_LENGTH = 2
+
+
+def past_names(prefix: str, num_layers: int) -> list:
+    """Nomi degli ingressi/uscite della KV-cache: <prefix>_key_<i>, <prefix>_value_<i>"""
+    return [f"{prefix}_{kind}_{layer}" for layer in range(num_layers) for kind in ("key", "value")]
+
+
+def export_gpt2_onnx(model, directory: str) -> str:
+    """Esporta un GPT2LMHeadModel in directory/model.onnx (con config.json) e restituisce il percorso"""
+    import torch
+
+    class GPT2WithPast(torch.nn.Module):
+        """GPT-2 con la KV-cache passata come tensori piatti (key, value per layer)"""
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, position_ids, *past):
+            past_key_values = tuple((past[2 * i], past[2 * i + 1]) for i in range(len(past) // 2))
+            try:
+                from transformers import DynamicCache
+                past_key_values = DynamicCache.from_legacy_cache(past_key_values)
+            except ImportError:
+                pass
+
+            outputs = self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                position_ids=position_ids,
+                past_key_values=past_key_values,
+                use_cache=True,
+                return_dict=True
+            )
+            present = outputs.past_key_values
+            if hasattr(present, "to_legacy_cache"):
+                present = present.to_legacy_cache()
+            return (outputs.logits,) + tuple(tensor for layer in present for tensor in layer)
+
+    config = model.config
+    head_dim = config.n_embd // config.n_head
+    model.eval()
+
+    # Ingressi fittizi: 1 sequenza, 3 token nuovi dopo EXPORT_PAST_LENGTH token in cache
+    input_ids = torch.zeros((1, 3), dtype=torch.long)
+    attention_mask = torch.ones((1, EXPORT_PAST_LENGTH + 3), dtype=torch.long)
+    position_ids = torch.arange(EXPORT_PAST_LENGTH, EXPORT_PAST_LENGTH + 3).unsqueeze(0)
+    past = [torch.zeros((1, config.n_head, EXPORT_PAST_LENGTH, head_dim)) for _ in range(2 * config.n_layer)]
+
+    input_names = ["input_ids", "attention_mask", "position_ids"] + past_names("past", config.n_layer)
+    output_names = ["logits"] + past_names("present", config.n_layer)
+
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "sequence"},
+        "attention_mask": {0: "batch", 1: "total_sequence"},
+        "position_ids": {0: "batch", 1: "sequence"},
+        "logits": {0: "batch", 1: "sequence"}
+    }
+    dynamic_axes.update({name: {0: "batch", 2: "past_sequence"} for name in past_names("past", config.n_layer)})
+    dynamic_axes.update({name: {0: "batch", 2: "total_sequence"} for name in past_names("present", config.n_layer)})
+
+    # Export TorchScript: l'exporter dynamo (default nelle versioni recenti) non gestisce gli assi dinamici allo stesso modo
+    export_options = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_options["dynamo"] = False
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "model.onnx")
+
+    with torch.no_grad():
+        torch.onnx.export(
+            GPT2WithPast(model),
+            (input_ids, attention_mask, position_ids, *past),
+            path,
+            input_names=input_names,
+            output_names=output_names,
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            do_constant_folding=True,
+            **export_options
+        )
+    config.save_pretrained(directory)
+
+    logger.info(f"Modello esportato in ONNX: {path}")
+    return path
+
+
+class OnnxGPT2LM:
+    """GPT-2 eseguito da ONNX Runtime con la stessa interfaccia di generate usata per il modello PyTorch"""
+
+    def __init__(self, directory: str, num_threads: int = None):
+        """Apre la sessione ONNX Runtime sul modello esportato in directory"""
+        import onnxruntime as ort
+        from transformers import GPT2Config
+
+        self.config = GPT2Config.from_pretrained(directory)
+        self.head_dim = self.config.n_embd // self.config.n_head
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(
+            os.path.join(directory, "model.onnx"),
+            options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.past_names = past_names("past", self.config.n_layer)
+
+    def empty_past(self, batch_size: int) -> tuple:
+        """KV-cache vuota (lunghezza 0) per ogni layer"""
+        import numpy as np
+        shape = (batch_size, self.config.n_head, 0, self.head_dim)
+        return tuple(np.zeros(shape, dtype=np.float32) for _ in self.past_names)
+
+    def forward(self, input_ids, attention_mask, position_ids, past: tuple):
+        """Un passo del modello: restituisce (logits torch, nuova KV-cache come array numpy)"""
+        import torch
+
+        feed = {
+            "input_ids": input_ids.numpy(),
+            "attention_mask": attention_mask.numpy(),
+            "position_ids": position_ids.numpy()
+        }
+        feed.update(zip(self.past_names, past))
+
+        outputs = self.session.run(None, feed)
+        return torch.from_numpy(outputs[0]), tuple(outputs[1:])
+
+    def __call__(self, input_ids, use_cache: bool = True, **kwargs):
+        """Forward completo su una sequenza (usato per la KV-cache dei prefissi dei prompt)"""
+        import torch
+
+        attention_mask = torch.ones_like(input_ids)
+        position_ids = torch.arange(input_ids.shape[1]).unsqueeze(0).expand_as(input_ids)
+        logits, past = self.forward(input_ids, attention_mask, position_ids, self.empty_past(input_ids.shape[0]))
+        return SimpleNamespace(logits=logits, past_key_values=past)
+
+    def generate(self, input_ids, attention_mask=None, past_key_values=None, max_length: int = None,
+                 max_new_tokens: int = None, min_new_tokens: int = 0, temperature: float = 1.0,
+                 do_sample: bool = False, stopping_criteria=None, max_time: float = None,
+                 pad_token_id: int = None, streamer=None, num_return_sequences: int = 1, **kwargs):
+        """Decodifica autoregressiva con KV-cache; restituisce prompt + token generati come model.generate"""
+        import torch
+
+        sequences = input_ids.clone()
+        batch_size, length = sequences.shape
+        if attention_mask is None:
+            attention_mask = torch.ones_like(sequences)
+
+        if max_new_tokens is None:
+            max_new_tokens = (max_length or self.config.n_positions) - length
+        max_new_tokens = min(max_new_tokens, self.config.n_positions - length)
+
+        eos_token_id = self.config.eos_token_id
+        if pad_token_id is None:
+            pad_token_id = eos_token_id
+
+        # Con la cache di un prefisso si passano al modello solo i token non ancora in cache
+        past = past_key_values if past_key_values is not None else self.empty_past(batch_size)
+        past_length = past[0].shape[2]
+
+        # Posizioni calcolate dalla maschera: con il padding a sinistra ogni riga parte da 0
+        positions = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+        step_ids = sequences[:, past_length:]
+        step_positions = positions[:, past_length:]
+
+        finished = torch.zeros(batch_size, dtype=torch.bool)
+        if streamer is not None:
+            streamer.put(sequences)
+
+        start = time.time()
+        for step in range(max_new_tokens):
+            logits, past = self.forward(step_ids, attention_mask, step_positions, past)
+            next_logits = logits[:, -1, :]
+            if step < min_new_tokens:
+                next_logits[:, eos_token_id] = float("-inf")
+
+            if do_sample:
+                probs = torch.softmax(next_logits / temperature, dim=-1)
+                next_tokens = torch.multinomial(probs, num_samples=1).squeeze(1)
+            else:
+                next_tokens = next_logits.argmax(dim=-1)
+
+            # Le righe già concluse ricevono solo padding
+            next_tokens = torch.where(finished, torch.full_like(next_tokens, pad_token_id), next_tokens)
+            sequences = torch.cat([sequences, next_tokens[:, None]], dim=1)
+            attention_mask = torch.cat([attention_mask, torch.ones((batch_size, 1), dtype=attention_mask.dtype)], dim=1)
+
+            if streamer is not None:
+                streamer.put(next_tokens)
+
+            finished = finished | (next_tokens == eos_token_id)
+            if stopping_criteria is not None:
+                finished = finished | torch.as_tensor(stopping_criteria(sequences, None), dtype=torch.bool)
+
+            if finished.all() or (max_time is not None and time.time() - start >= max_time):
+                break
+
+            step_ids = next_tokens[:, None]
+            step_positions = step_positions[:, -1:] + 1
+
+        if streamer is not None:
+            streamer.end()
+        return sequences
+
+
+def load_onnx_generator(directory: str, num_threads: int = None):
+    """Modello ONNX e tokenizer GPT-2 (esporta gpt2 alla prima esecuzione)"""
+    from transformers import GPT2Tokenizer
+
+    if not os.path.exists(os.path.join(directory, "model.onnx")):
+        from transformers import GPT2LMHeadModel
+        logger.info("Export ONNX di gpt2 (solo alla prima esecuzione)")
+        export_gpt2_onnx(GPT2LMHeadModel.from_pretrained('gpt2'), directory)
+
+    # Stessa forma dell'oggetto pipeline: il generatore usa .model e .tokenizer
+    return SimpleNamespace(
+        model=OnnxGPT2LM(directory, num_threads),
+        tokenizer=GPT2Tokenizer.from_pretrained('gpt2')
+    )
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro degli Articoli Processati
+Log append-only (JSONL) di file, ID e hash del contenuto: tenuto in memoria e seguito per le righe aggiunte
+da altri processi, nessuna copia dei file
+"""
+
+import os
+import json
+import hashlib
+import logging
+import datetime
+import threading
+from typing import Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path: str) -> str:
+    """Hash SHA-256 del contenuto del file"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ProcessedLedger:
+    """Insieme dei file già processati, persistito come log append-only"""
+
+    def __init__(self, path: str = "processed_articles/processed.jsonl"):
+        """Carica il registro (una riga per articolo processato)"""
+        self.path = path
+        self.lock = threading.Lock()
+        # nome file -> hash del contenuto al momento del processamento
+        self.entries = {}
+        # Byte del file già letti: refresh() legge solo le righe aggiunte dopo
+        self.offset = 0
+
+        with self.lock:
+            self._read(complete_lines_only=False)
+
+    def _read(self, complete_lines_only: bool):
+        """Legge il file dalla posizione corrente (chiamato con self.lock)"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Un'ultima riga senza a capo può essere ancora in scrittura da un altro processo
+        end = data.rfind(b"\n") + 1 if complete_lines_only else len(data)
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line.decode('utf-8', errors='replace'))
+            except json.JSONDecodeError:
+                # Ultima riga troncata da un'interruzione: il file verrà riprocessato e
+                # append chiude la riga con un a capo prima di scrivere la successiva
+                continue
+            self.entries[entry["file"]] = entry.get("sha256")
+        self.offset += end
+
+    def refresh(self) -> int:
+        """Aggiunge le voci scritte da altri processi (worker e watch condividono il file); restituisce il totale"""
+        with self.lock:
+            self._read(complete_lines_only=True)
+            return len(self.entries)
+
+    def __contains__(self, filename: str) -> bool:
+        """Verifica se il file è già stato processato"""
+        return filename in self.entries
+
+    def __len__(self) -> int:
+        """Numero di file registrati"""
+        return len(self.entries)
+
+    def add(self, file_path: str, article_id: str = None):
+        """Registra un file come processato"""
+        self.add_many([(file_path, article_id)])
+
+    def add_many(self, items: List[Tuple[str, str]]):
+        """Registra più file (percorso, ID articolo) con una sola scrittura"""
+        now = datetime.datetime.now().isoformat()
+        entries = [
+            {"file": os.path.basename(path), "id": article_id, "sha256": file_sha256(path), "at": now}
+            for path, article_id in items
+        ]
+        self.append(entries)
+
+    def append(self, entries: List[Dict[str, Any]]):
+        """Aggiunge le righe al log e le rende persistenti prima di aggiornare l'insieme in memoria"""
+        if not entries:
+            return
+
+        data = ''.join(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n" for entry in entries)
+        data = data.encode('utf-8')
+        with self.lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'ab+') as f:
+                # Una riga troncata non deve assorbire la prima voce nuova
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        data = b"\n" + data
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            for entry in entries:
+                self.entries[entry["file"]] = entry["sha256"]
+
+    def migrate_directory(self, directory: str) -> int:
+        """Importa una volta le copie article_*.json della vecchia directory dei processati"""
+        if os.path.exists(self.path) or not os.path.isdir(directory):
+            return 0
+
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not (entry.name.startswith("article_") and entry.name.endswith(".json")):
+                    continue
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        article_id = json.load(f).get("id")
+                except (OSError, ValueError):
+                    article_id = None
+                entries.append({
+                    "file": entry.name,
+                    "id": article_id,
+                    "sha256": file_sha256(entry.path),
+                    "at": datetime.datetime.fromtimestamp(entry.stat().st_mtime).isoformat()
+                })
+
+        # Il registro viene creato anche vuoto: la migrazione non si ripete
+        entries.sort(key=lambda e: e["file"])
+        self.append(entries)
+        if not entries:
+            with self.lock:
+                open(self.path, 'a', encoding='utf-8').close()
+
+        logger.info(f"Registro dei processati creato da {directory}: {len(entries)} articoli")
+        return len(entries)
@@ -11,7 +11,7 @@ import logging
 import datetime
 import os
 import sys
-from ai_article_generator import ETFArticleGenerator
+from ai_article_generator import ETFArticleGenerator, TEST_SEED
 
 # Configurazione logging
 logging.basicConfig(
@@ -87,7 +87,7 @@ class ArticleScheduler:
         """Generazione di test (per debugging)"""
         logger.info("🧪 Test generazione articolo")
         try:
-            articles = self.generator.generate_daily_articles(1)
+            articles = self.generator.generate_daily_articles(1, seed=TEST_SEED)
             if articles:
                 logger.info(f"✅ Test completato: {articles[0]['title']}")
             else:
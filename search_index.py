@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Indice di Ricerca degli Articoli
+Indice invertito su titolo, tag, categoria e parole chiave del testo, con normalizzazione per l'italiano
+(accenti, elisioni, parole vuote, singolare/plurale) e ricerca per prefisso. Scritto come shard JSON
+accanto a quelli del blog e caricato da api_server.py per /api/search
+"""
+
+import os
+import re
+import json
+import heapq
+import bisect
+import logging
+import threading
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Articoli, preposizioni (anche articolate ed elise), congiunzioni e forme verbali più frequenti
+STOPWORDS = frozenset("""
+a ad agli ai al all alla alle allo anche ancora c che chi ci coi col come con contro cosi cui d da dagli dai
+dal dall dalla dalle dallo degli dei del dell della delle dello di dov dove e ed era essere fra gia gli ha
+hanno i il in l la le lo loro ma mi molto ne negli nei nel nell nella nelle nello no noi non o ogni per
+perche piu po poi prima puo quale quali quando quanto quel quell quella quelle quelli quello quest questa
+queste questi questo se sempre senza si sia sono su sua sue sugli sui sul sull sulla sulle sullo suo suoi t
+tra tu tutti tutto un una uno vi
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Peso di ogni campo nel punteggio di un termine
+FIELD_WEIGHTS = {"title": 8, "tags": 4, "category": 4}
+
+# Parole chiave del testo salvate sull'articolo (le più frequenti)
+MAX_KEYWORDS = 32
+
+# Lettere iniziali che identificano lo shard di un termine
+SEARCH_KEY_LENGTH = 1
+
+# Termini al massimo considerati per un prefisso
+MAX_EXPANSIONS = 64
+
+
+def fold(text: str) -> str:
+    """Minuscole senza accenti ("Città" -> "citta"); gli apostrofi separano le elisioni ("dell'indice")"""
+    return unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode("ascii")
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Riduzione leggera: singolare e plurale, maschile e femminile ("fondi", "fondo" -> "fond")"""
+    if len(word) < 5 or word.isdigit():
+        return word
+    # "banche" / "banca" -> "banc", "larghi" / "largo" -> "larg"
+    if word[-2:] in ("he", "hi") and word[-3] in "cg":
+        return word[:-2]
+    # "portafoglio" / "portafogli" -> "portafogl"
+    if word.endswith("io"):
+        return word[:-2]
+    if word[-1] in "aeio":
+        return word[:-1]
+    return word
+
+
+def terms(text: str) -> List[str]:
+    """Termini indicizzabili di un testo, nell'ordine in cui compaiono"""
+    return [stem(word) for word in TOKEN_PATTERN.findall(fold(text or "")) if len(word) > 1 and word not in STOPWORDS]
+
+
+def top_keywords(counts: Counter, limit: int = MAX_KEYWORDS) -> List[str]:
+    """Termini più frequenti del testo (a parità di frequenza, il primo incontrato)"""
+    return [term for term, _ in counts.most_common(limit)]
+
+
+def article_scores(article: Dict[str, Any]) -> Dict[str, int]:
+    """Punteggio di ogni termine dell'articolo: titolo, tag e categoria pesano più del testo"""
+    scores = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        value = article.get(field) or ""
+        text = " ".join(value) if isinstance(value, list) else value
+        for term in set(terms(text)):
+            scores[term] = scores.get(term, 0) + weight
+
+    # Parole chiave in ordine di frequenza: le prime pesano di più
+    for rank, term in enumerate(article.get("keywords") or []):
+        scores[term] = scores.get(term, 0) + (3 if rank < 5 else 2 if rank < 15 else 1)
+    return scores
+
+
+def shard_key(term: str) -> str:
+    """Shard del termine (iniziali)"""
+    return term[:SEARCH_KEY_LENGTH]
+
+
+def build_postings(articles: Iterable[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """termine -> [doc, punteggio, doc, punteggio, ...] per punteggio decrescente; doc è la posizione nell'indice"""
+    postings = {}
+    for doc, article in enumerate(articles):
+        for term, score in article_scores(article).items():
+            postings.setdefault(term, []).append((score, doc))
+
+    flat = {}
+    for term, entries in postings.items():
+        # Ordinamento stabile: a parità di punteggio resta l'ordine del corpus (più recenti prima)
+        entries.sort(key=lambda entry: -entry[0])
+        flat[term] = [value for score, doc in entries for value in (doc, score)]
+    return flat
+
+
+def build_search_shards(articles: List[Dict[str, Any]]) -> Dict[str, Dict[str, List[int]]]:
+    """Postings raggruppati per shard: {chiave: {termine: postings}}"""
+    shards = {}
+    for term, postings in sorted(build_postings(articles).items()):
+        shards.setdefault(shard_key(term), {})[term] = postings
+    return shards
+
+
+def parse_query(query: str) -> List[Tuple[str, bool]]:
+    """(termine, prefisso) per ogni parola: l'ultima è un prefisso finché non segue uno spazio"""
+    folded = fold(query or "")
+    words = TOKEN_PATTERN.findall(folded)
+    parsed = [(stem(word), False) for word in words if len(word) > 1 and word not in STOPWORDS]
+    # Prefisso solo se l'ultima parola digitata è stata tenuta e non è seguita da spazio o punteggiatura
+    if parsed and folded[-1].isalnum() and len(words[-1]) > 1 and words[-1] not in STOPWORDS:
+        parsed[-1] = (parsed[-1][0], True)
+    return parsed
+
+
+class SearchIndex:
+    """Indice in memoria: postings ordinati per punteggio, dizionari doc -> punteggio costruiti su richiesta"""
+
+    def __init__(self, entries: List[Dict[str, Any]], postings: Dict[str, List[int]]):
+        """entries: voci dell'indice del blog (stesso ordine dei doc); postings: da build_postings"""
+        self.entries = entries
+        self.postings = postings
+        self.sorted_terms = sorted(postings)
+        self.doc_scores = lru_cache(maxsize=1024)(self._doc_scores)
+        self.group_scores = lru_cache(maxsize=256)(self._group_scores)
+
+    @classmethod
+    def from_articles(cls, articles: List[Dict[str, Any]]) -> "SearchIndex":
+        """Indice costruito direttamente dagli articoli"""
+        return cls(articles, build_postings(articles))
+
+    @classmethod
+    def load(cls, directory: str) -> "SearchIndex":
+        """Indice caricato dagli shard scritti da write_blog_shards"""
+        with open(os.path.join(directory, "manifest.json"), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        with open(os.path.join(directory, manifest["index"]), 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+
+        postings = {}
+        for filename in (manifest.get("search") or {}).get("shards", {}).values():
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                postings.update(json.load(f))
+        return cls(entries, postings)
+
+    def _doc_scores(self, term: str) -> Dict[int, int]:
+        """doc -> punteggio di un termine (in cache per i termini interrogati di recente)"""
+        postings = self.postings[term]
+        return dict(zip(postings[0::2], postings[1::2]))
+
+    def _group_scores(self, group: Tuple[str, ...]) -> Dict[int, int]:
+        """doc -> punteggio migliore tra i termini di un prefisso (un solo dizionario da interrogare)"""
+        if len(group) == 1:
+            return self.doc_scores(group[0])
+        merged = {}
+        for term in group:
+            for doc, score in self.doc_scores(term).items():
+                if score > merged.get(doc, 0):
+                    merged[doc] = score
+        return merged
+
+    def expand(self, term: str, prefix: bool) -> List[str]:
+        """Termini dell'indice corrispondenti a una parola della query"""
+        if not prefix:
+            return [term] if term in self.postings else []
+
+        expansions = []
+        start = bisect.bisect_left(self.sorted_terms, term)
+        for position in range(start, min(start + MAX_EXPANSIONS, len(self.sorted_terms))):
+            if not self.sorted_terms[position].startswith(term):
+                break
+            expansions.append(self.sorted_terms[position])
+        return expansions
+
+    def ranked(self, term_list: List[str]):
+        """(-punteggio, doc) di uno o più termini per punteggio decrescente; per ogni doc vale il massimo"""
+        def pairs(term):
+            postings = self.postings[term]
+            return ((-postings[i + 1], postings[i]) for i in range(0, len(postings), 2))
+
+        if len(term_list) == 1:
+            return pairs(term_list[0])
+        return self.merged(pairs(term) for term in term_list)
+
+    @staticmethod
+    def merged(streams):
+        """Fusione di più liste ordinate tenendo solo la prima occorrenza (il punteggio migliore) di ogni doc"""
+        seen = set()
+        for negative_score, doc in heapq.merge(*streams):
+            if doc not in seen:
+                seen.add(doc)
+                yield negative_score, doc
+
+    def top_matching_all(self, groups: List[List[str]], limit: int) -> List[Tuple[int, int]]:
+        """(punteggio, doc) migliori tra i doc presenti in tutti i gruppi (algoritmo a soglia di Fagin):
+        le liste si scorrono in parallelo per punteggio decrescente, ogni doc nuovo si valuta per lookup
+        e ci si ferma quando nessun doc non ancora visto può superare il `limit`-esimo"""
+        streams = [self.ranked(group) for group in groups]
+        # Verifica di appartenenza: prima i gruppi con meno documenti (escludono prima)
+        lookups = sorted((self.group_scores(tuple(group)) for group in groups), key=len)
+        bounds = [float("inf")] * len(groups)
+        seen = set()
+        best = []  # min-heap di (punteggio, -doc)
+
+        exhausted = False
+        while not exhausted and (len(best) < limit or best[0][0] < sum(bounds)):
+            for i, stream in enumerate(streams):
+                item = next(stream, None)
+                if item is None:
+                    # Lista esaurita: ogni doc presente in tutti i gruppi è già stato visto
+                    exhausted = True
+                    break
+
+                negative_score, doc = item
+                bounds[i] = -negative_score
+                if doc in seen:
+                    continue
+                seen.add(doc)
+
+                total = 0
+                for scores in lookups:
+                    score = scores.get(doc)
+                    if score is None:
+                        break
+                    total += score
+                else:
+                    heapq.heappush(best, (total, -doc))
+                    if len(best) > limit:
+                        heapq.heappop(best)
+
+        return sorted(((score, -negative_doc) for score, negative_doc in best), key=lambda result: (-result[0], result[1]))
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Articoli che contengono tutte le parole della query, per punteggio e poi per data"""
+        groups = [self.expand(term, prefix) for term, prefix in parse_query(query)]
+        if not groups or not all(groups):
+            return []
+
+        if len(groups) == 1:
+            # Una sola parola: i postings sono già in ordine, bastano i primi `limit`
+            results = []
+            for negative_score, doc in self.ranked(groups[0]):
+                results.append((-negative_score, doc))
+                if len(results) >= limit:
+                    break
+        else:
+            results = self.top_matching_all(groups, limit)
+
+        return [{**self.entries[doc], "score": score} for score, doc in results]
+
+
+class SearchIndexCache:
+    """Indice caricato dagli shard e ricaricato quando cambia il manifest"""
+
+    def __init__(self, directory: str = "js/blog-data"):
+        """Cache sugli shard in directory"""
+        self.directory = directory
+        self.index = None
+        self.version = None
+        self.lock = threading.Lock()
+
+    def get(self) -> Optional[SearchIndex]:
+        """Indice aggiornato (None se gli shard non esistono ancora)"""
+        with self.lock:
+            # Shard mancante: manifest sostituito (due volte) durante la lettura, si riprova una volta sul nuovo
+            for attempt in range(2):
+                try:
+                    stat = os.stat(os.path.join(self.directory, "manifest.json"))
+                except FileNotFoundError:
+                    return None
+
+                version = (stat.st_mtime_ns, stat.st_size)
+                if version == self.version:
+                    return self.index
+                try:
+                    self.index = SearchIndex.load(self.directory)
+                except FileNotFoundError:
+                    if attempt:
+                        raise
+                    continue
+                self.version = version
+                logger.info(f"Indice di ricerca caricato: {len(self.index.entries)} articoli, {len(self.index.postings)} termini")
+                return self.index
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Criteri di Arresto della Generazione
+Interrompono la decodifica quando GPT-2 entra in cicli di ripetizione o non produce più contenuto nuovo
+"""
+
+from collections import Counter
+
+import torch
+from transformers import StoppingCriteria
+
+
+class DegenerationStoppingCriteria(StoppingCriteria):
+    """Ferma ogni sequenza quando la finestra finale è ripetitiva o povera di token distinti"""
+
+    def __init__(self, prompt_length: int, ngram_size: int = 4, max_repeats: int = 3,
+                 window: int = 64, min_unique_ratio: float = 0.3):
+        """Configura le soglie di degenerazione"""
+        self.prompt_length = prompt_length
+        self.ngram_size = ngram_size
+        self.max_repeats = max_repeats
+        self.window = window
+        self.min_unique_ratio = min_unique_ratio
+        # Motivo dell'arresto per riga del batch (assente se la riga non è stata interrotta)
+        self.reasons = {}
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        """Valuta ogni sequenza del batch sugli ultimi `window` token generati"""
+        done = torch.zeros(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+
+        for row, sequence in enumerate(input_ids):
+            if row in self.reasons:
+                done[row] = True
+                continue
+
+            generated = sequence[self.prompt_length:][-self.window:].tolist()
+            if len(generated) < self.window // 2:
+                continue
+
+            reason = self.degeneration_reason(generated)
+            if reason:
+                done[row] = True
+                self.reasons[row] = reason
+
+        return done
+
+    def degeneration_reason(self, tokens: list) -> str:
+        """Restituisce il motivo della degenerazione, oppure None"""
+        ngrams = Counter(tuple(tokens[i:i + self.ngram_size]) for i in range(len(tokens) - self.ngram_size + 1))
+        if ngrams and max(ngrams.values()) >= self.max_repeats:
+            return "ripetizione"
+
+        if len(set(tokens)) / len(tokens) < self.min_unique_ratio:
+            return "contenuto insufficiente"
+
+        return None
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shard del blog: la generazione precedente resta leggibile finché il manifest successivo non la sostituisce
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def article(i):
+    return {"id": f"articolo-{i}", "title": f"Articolo numero {i}", "content": f"<p>Testo {i}</p>",
+            "date": f"2025-0{i}-01", "category": "ETF News", "keywords": [f"parola{i}"]}
+
+
+class BlogShardsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_previous_generation_kept_until_next_write(self):
+        from blog_shards import manifest_files, write_blog_shards
+
+        first = manifest_files(write_blog_shards([article(1)], self.directory))
+        second = manifest_files(write_blog_shards([article(2), article(1)], self.directory))
+
+        # Un client con il primo manifest trova ancora tutti i suoi shard
+        for filename in first | second:
+            self.assertTrue(os.path.exists(os.path.join(self.directory, filename)), filename)
+
+        third = manifest_files(write_blog_shards([article(3), article(2), article(1)], self.directory))
+        for filename in first - second - third:
+            self.assertFalse(os.path.exists(os.path.join(self.directory, filename)), filename)
+
+    def test_search_cache_retries_missing_shard(self):
+        from blog_shards import write_blog_shards
+        from search_index import SearchIndex, SearchIndexCache
+
+        write_blog_shards([article(1)], self.directory)
+        load = SearchIndex.load
+        calls = []
+
+        def racing_load(directory):
+            # Primo tentativo: manifest già sostituito e shard appena rimosso
+            calls.append(directory)
+            if len(calls) == 1:
+                raise FileNotFoundError("search-p.000000000000.json")
+            return load(directory)
+
+        with mock.patch.object(SearchIndex, "load", side_effect=racing_load):
+            index = SearchIndexCache(self.directory).get()
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual([entry["id"] for entry in index.search("articolo")], ["articolo-1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
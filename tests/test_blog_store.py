@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Group commit di BlogDataStore: ogni modifica del gruppo è applicata per intero o rifiutata
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class GroupCommitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "blog-data.js")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_failed_mutation_leaves_no_partial_changes(self):
+        from blog_store import BlogDataStore
+
+        store = BlogDataStore(self.path)
+        release = threading.Event()
+        errors = {}
+        results = {}
+
+        def run(name, mutation):
+            try:
+                results[name] = store.update(mutation)
+            except Exception as e:
+                errors[name] = e
+
+        def blocking(articles):
+            # Tiene occupato il commit finché le altre due richieste non sono in coda
+            articles.append({"id": "primo"})
+            release.wait(10)
+
+        def failing(articles):
+            articles.append({"id": "parziale"})
+            articles[0]["title"] = "modificato"
+            raise ValueError("mutation fallita a metà")
+
+        def succeeding(articles):
+            articles.append({"id": "secondo"})
+            return len(articles)
+
+        first = threading.Thread(target=run, args=("primo", blocking))
+        first.start()
+        while not store.committing:
+            time.sleep(0.01)
+
+        others = [threading.Thread(target=run, args=("fallita", failing)),
+                  threading.Thread(target=run, args=("riuscita", succeeding))]
+        for thread in others:
+            thread.start()
+            # Ordine fisso nella coda: prima la mutation che fallisce
+            while len(store.pending) < others.index(thread) + 1:
+                time.sleep(0.01)
+        release.set()
+        for thread in [first] + others:
+            thread.join(10)
+
+        # Le due richieste in coda sono entrate nello stesso commit
+        self.assertIsInstance(errors.get("fallita"), ValueError)
+        self.assertEqual(results.get("riuscita"), 2)
+        self.assertEqual(store.read(), [{"id": "primo"}, {"id": "secondo"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Contatori di /api/status lungo il percorso del server: generazione, integrazione, status
+Motore "template" (nessun modello), in una directory temporanea
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import http.client
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class IdleWorker:
+    """Solo gli attributi letti da handle_status: la generazione passa dal generatore del test"""
+    model_loaded = False
+
+    def is_alive(self):
+        return True
+
+
+class StatusBacklogTest(unittest.TestCase):
+
+    def setUp(self):
+        """Directory di lavoro vuota: i moduli scrivono log, metriche e dati in percorsi relativi"""
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        os.environ["ETF_METRICS_FILE"] = os.path.join(self.directory, "generation_metrics.jsonl")
+        # Metriche condivise dal processo: si ricreano sul file di questa directory
+        import generation_metrics
+        generation_metrics._default_metrics = None
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def get_status(self):
+        """Risposta di GET /api/status da un server reale"""
+        from api_server import ETFAPIHandler, PooledHTTPServer
+
+        server = PooledHTTPServer(("127.0.0.1", 0), ETFAPIHandler, 2)
+        server.generation_worker = IdleWorker()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+            connection.request("GET", "/api/status")
+            response = connection.getresponse()
+            self.assertEqual(response.status, 200)
+            return json.loads(response.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_generate_ingest_status(self):
+        from ai_article_generator import ETFArticleGenerator
+        from ai_blog_integration import AIBlogIntegration
+
+        generator = ETFArticleGenerator(engine="template", cache_dir=None)
+        self.assertEqual(len(generator.generate_daily_articles(3)), 3)
+
+        # I testi dei template si somigliano: "flag" li pubblica tutti
+        integration = AIBlogIntegration(duplicate_policy="flag")
+        self.assertEqual(integration.process_new_articles(), 3)
+
+        # Generati dopo l'integrazione: restano nel backlog
+        self.assertEqual(len(generator.generate_daily_articles(2)), 2)
+
+        status = self.get_status()
+        self.assertEqual(status["generated_articles"], 5)
+        self.assertEqual(status["processed_articles"], 3)
+        self.assertEqual(status["backlog"], 2)
+        self.assertEqual(status["published_articles"], 3)
+
+    def test_status_creates_missing_generated_counter(self):
+        from blog_stats import BlogStats, stats_path_for
+
+        # File delle statistiche scritto senza il contatore dei generati (es. da api/storage.py)
+        os.makedirs("js")
+        os.makedirs("generated_articles")
+        for i in range(2):
+            with open(os.path.join("generated_articles", f"article_{i}.json"), 'w', encoding='utf-8') as f:
+                json.dump({"id": str(i)}, f)
+        BlogStats(stats_path_for("js/blog-data.js")).refresh([])
+
+        status = self.get_status()
+        self.assertEqual(status["generated_articles"], 2)
+
+    def write_corpus(self, count):
+        """js/blog-data.js con count articoli già pubblicati"""
+        from blog_store import render_articles_js
+
+        os.makedirs("js", exist_ok=True)
+        articles = [{"id": f"articolo-{i}", "title": f"Articolo {i}", "date": "2025-09-01",
+                     "category": "ETF News", "aiGenerated": True} for i in range(count)]
+        with open("js/blog-data.js", 'w', encoding='utf-8') as f:
+            f.write(render_articles_js(articles))
+
+    def test_status_fresh_checkout(self):
+        # Corpus pubblicato, nessun file delle statistiche
+        self.write_corpus(4)
+
+        status = self.get_status()
+        self.assertEqual(status["published_articles"], 4)
+        self.assertEqual(status["generated_articles"], 0)
+
+    def test_status_counters_only_stats_file(self):
+        from blog_stats import stats_path_for
+
+        # File creato dagli incrementi di generatore e integrazione, senza i contatori del corpus
+        self.write_corpus(4)
+        with open(stats_path_for("js/blog-data.js"), 'w', encoding='utf-8') as f:
+            json.dump({"generated": 4, "processed": 4, "last_update": "2025-09-01T00:00:00"}, f)
+
+        status = self.get_status()
+        self.assertEqual(status["published_articles"], 4)
+        self.assertEqual(status["generated_articles"], 4)
+        self.assertEqual(status["backlog"], 0)
+
+    def test_generator_increment_counts_corpus(self):
+        from ai_article_generator import ETFArticleGenerator
+        from blog_stats import BlogStats, stats_path_for
+
+        # Primo file delle statistiche scritto da save_article
+        self.write_corpus(4)
+        generator = ETFArticleGenerator(engine="template", cache_dir=None)
+        self.assertEqual(len(generator.generate_daily_articles(1)), 1)
+
+        stats = BlogStats(stats_path_for("js/blog-data.js")).read()
+        self.assertEqual(stats["generated"], 1)
+        self.assertEqual(stats["total_articles"], 4)
+    def test_two_integrations_share_processed_count(self):
+        from ai_article_generator import ETFArticleGenerator
+        from ai_blog_integration import AIBlogIntegration
+
+        # Worker di generazione e demone watch: due registri in memoria sullo stesso file
+        worker = AIBlogIntegration(duplicate_policy="flag")
+        watcher = AIBlogIntegration(duplicate_policy="flag")
+        generator = ETFArticleGenerator(engine="template", cache_dir=None)
+
+        generator.generate_daily_articles(2)
+        self.assertEqual(worker.process_new_articles(), 2)
+
+        # Il demone riceve dal watcher solo il file nuovo: il suo conteggio non deve ignorare quelli del worker
+        path = os.path.join("generated_articles", f"article_{generator.generate_daily_articles(1)[0]['id']}.json")
+        self.assertEqual(watcher.process_new_articles([path]), 1)
+        self.assertEqual(watcher.blog_stats.read()["processed"], 3)
+
+        status = self.get_status()
+        self.assertEqual(status["processed_articles"], 3)
+        self.assertEqual(status["backlog"], 0)
+
+if __name__ == '__main__':
+    unittest.main()